@@ -0,0 +1,71 @@
+"""Compara el bucle original de calculate_amortization con el motor vectorizado.
+
+Uso: python benchmarks/bench_amortizacion.py
+"""
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import (
+    SCHEDULE_COLUMNS, amortization_schedule, fixed_payment, payment_terms, schedule_arrays,
+)
+
+
+def legacy_schedule(principal, annual_interest_rate, loan_term_months):
+    """Copia del bucle por filas que usaba la página (frecuencia mensual)."""
+    num_payments = loan_term_months
+    periodic_interest_rate = (annual_interest_rate / 100) / 12
+    denominator = 1 - (1 + periodic_interest_rate)**(-num_payments)
+    payment_amount = (principal * periodic_interest_rate) / denominator
+
+    amortization_data = []
+    remaining_principal = principal
+    for i in range(1, int(num_payments) + 1):
+        current_period_initial_principal = remaining_principal
+        interest_payment = current_period_initial_principal * periodic_interest_rate
+        principal_payment = payment_amount - interest_payment
+        if i == num_payments:
+            principal_payment = current_period_initial_principal
+            payment_amount = principal_payment + interest_payment
+            remaining_principal = 0.0
+        else:
+            remaining_principal -= principal_payment
+        amortization_data.append({
+            "Período": i,
+            "Capital Inicial del Período": f"{round(current_period_initial_principal):,}",
+            "Cuota Fija": f"{round(payment_amount):,}",
+            "Intereses": f"{round(interest_payment):,}",
+            "Capital Amortizado": f"{round(principal_payment):,}",
+            "Capital Pendiente": f"{round(remaining_principal):,}"
+        })
+    return pd.DataFrame(amortization_data)
+
+
+def main():
+    args = (250000.0, 9.5, 600)
+    number = 200
+
+    # La columna de la cuota ahora se llama "Cuota" (no todos los sistemas tienen cuota fija)
+    legacy = legacy_schedule(*args).rename(columns={"Cuota Fija": "Cuota"})
+    _, numeric = amortization_schedule(*args, "Mensual")
+    legacy_values = legacy[SCHEDULE_COLUMNS[1:]].apply(lambda col: col.str.replace(',', '').astype(float))
+    mismatches = (legacy_values != numeric[SCHEDULE_COLUMNS[1:]].round()).to_numpy().sum()
+    print(f"montos distintos tras redondear: {mismatches} de {legacy_values.size}")
+
+    t_legacy = timeit.timeit(lambda: legacy_schedule(*args), number=number) / number
+    t_numeric = timeit.timeit(lambda: amortization_schedule(*args, "Mensual"), number=number) / number
+    n, r = payment_terms(args[1], args[2], "Mensual")
+    payment = fixed_payment(args[0], r, n)
+    t_arrays = timeit.timeit(lambda: schedule_arrays(args[0], r, n, payment), number=number) / number
+
+    print(f"bucle original (600 períodos):   {t_legacy * 1e3:8.3f} ms")
+    print(f"motor vectorizado (numérico):    {t_numeric * 1e3:8.3f} ms  ({t_legacy / t_numeric:5.1f}x)")
+    print(f"solo arreglos NumPy:             {t_arrays * 1e3:8.3f} ms  ({t_legacy / t_arrays:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Caché compartida: 500 usuarios piden el mismo préstamo (los valores por defecto de la página).
+
+Uso: python benchmarks/bench_cache.py [usuarios] [hilos]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas import amortizacion
+from finanzas.cache import amortization_schedule
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    request = (50000.0, 5.0, 60, "Mensual")
+
+    start = time.perf_counter()
+    for _ in range(users):
+        amortizacion.amortization_schedule(*request)
+    t_plain = time.perf_counter() - start
+
+    amortization_schedule.cache_clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: amortization_schedule(*request), range(users)))
+    t_cached = time.perf_counter() - start
+
+    info = amortization_schedule.cache_info()
+    print(f"sin caché: {t_plain * 1000:8.1f} ms  ({t_plain / users * 1e6:6.0f} µs por usuario)")
+    print(f"con caché: {t_cached * 1000:8.1f} ms  ({t_cached / users * 1e6:6.0f} µs por usuario)  "
+          f"{t_plain / t_cached:5.1f}x  aciertos {info['Aciertos']}, fallos {info['Fallos']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Reinicio con almacén en disco: primera solicitud de un resultado popular con y sin precarga.
+
+Simula un pod que se reinicia: un primer proceso calcula y guarda los
+resultados; luego procesos nuevos los piden con el almacén desactivado (todo
+se recalcula) y activado (se sirven desde la precarga).
+
+Uso: python benchmarks/bench_cache_disco.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POPULAR = """
+import time
+start = time.perf_counter()
+from finanzas import cache
+ready = time.perf_counter() - start
+start = time.perf_counter()
+_, df = cache.amortization_schedule(50000.0, 5.0, 360, "Mensual")
+cache.export_table(df, "Excel", "Amortizacion")
+df, _ = cache.compound_interest_projection(10000.0, 100.0, 7.0, 100, "Diario", "Mensual")
+cache.export_table(df, "Excel", "Interes_Compuesto")
+elapsed = time.perf_counter() - start
+hits = sum(info["Aciertos"] for info in cache.cache_stats())
+disk = sum(info["Aciertos en Disco"] for info in cache.cache_stats())
+print(f"arranque {ready * 1000:7.1f} ms  solicitudes {elapsed * 1000:7.1f} ms  "
+      f"aciertos en memoria {hits}, en disco {disk}")
+"""
+
+
+def run(label, path):
+    env = dict(os.environ)
+    env.pop("FINANZAS_CACHE_PATH", None)
+    if path:
+        env["FINANZAS_CACHE_PATH"] = path
+    result = subprocess.run([sys.executable, "-c", POPULAR], cwd=ROOT, env=env, capture_output=True, text=True)
+    print(f"{label:28s} {result.stdout.strip() or result.stderr.strip()}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        run("sin almacén", None)
+        run("almacén vacío (llenado)", path)
+        run("reinicio con precarga", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Cuotas y flujo agregado para una cartera sintética de préstamos.
+
+Uso: python benchmarks/bench_cartera.py [número de préstamos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import (
+    PAYMENT_FREQUENCIES, amortization_schedule, portfolio_cash_flows, portfolio_payments,
+)
+
+
+def synthetic_portfolio(size, seed=7):
+    rng = np.random.default_rng(seed)
+    principals = rng.uniform(1_000, 500_000, size).round(2)
+    rates = rng.uniform(0.1, 30, size).round(2)
+    terms = rng.integers(1, 601, size)
+    frequencies = rng.choice(list(PAYMENT_FREQUENCIES), size)
+    return principals, rates, terms, frequencies
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    principals, rates, terms, frequencies = synthetic_portfolio(size)
+
+    start = time.perf_counter()
+    payments = portfolio_payments(principals, rates, terms, frequencies)["payments"]
+    elapsed = time.perf_counter() - start
+    print(f"cuotas de {size:,} préstamos: {elapsed:.3f} s ({size / elapsed:,.0f} préstamos/s)")
+
+    # Las cuotas por lote coinciden con las de la calculadora préstamo a préstamo
+    for i in range(50):
+        expected, _ = amortization_schedule(principals[i], rates[i], terms[i], frequencies[i])
+        assert expected == payments[i], (i, expected, payments[i])
+
+    start = time.perf_counter()
+    _, cash_flows = portfolio_cash_flows(principals, rates, terms, frequencies)
+    elapsed = time.perf_counter() - start
+    print(f"flujo agregado por mes ({len(cash_flows)} meses): {elapsed:.3f} s ({size / elapsed:,.0f} préstamos/s)")
+    print(f"capital amortizado total / capital prestado: {cash_flows['Capital Amortizado'].sum() / principals.sum():.12f}")
+
+
+if __name__ == "__main__":
+    main()
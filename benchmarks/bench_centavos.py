@@ -0,0 +1,103 @@
+"""Modo exacto en centavos contra el motor en punto flotante y una referencia con ``Decimal``.
+
+Mide la tabla de la página (600 meses) y una cartera completa, y verifica
+que las tablas en centavos coinciden centavo a centavo con una
+implementación independiente, período a período, en ``Decimal``.
+
+Uso: python benchmarks/bench_centavos.py [préstamos]
+"""
+import os
+import sys
+import time
+from decimal import Decimal, localcontext
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import PAYMENT_FREQUENCIES, amortization_schedule, iter_schedule_chunks
+from finanzas.centavos import RATE_SCALE, ROUNDING_MODES, cents_portfolio_payments
+
+CENT = Decimal("0.01")
+
+
+def decimal_schedule(principal, annual_interest_rate, loan_term_months, payment_frequency, rounding):
+    """Referencia: la misma tabla con ``Decimal``, período a período."""
+    mode = ROUNDING_MODES[rounding]
+    months = PAYMENT_FREQUENCIES[payment_frequency]
+    num_payments = -(-int(loan_term_months) // int(months))
+    with localcontext() as context:
+        context.prec = 50
+        balance = Decimal(str(float(principal))).quantize(CENT, rounding=mode)
+        annual_rate = Decimal(str(float(annual_interest_rate))).quantize(Decimal(1) / (RATE_SCALE // 100), rounding=mode)
+        # La división va al final para que los empates (x,xx5) sean exactos y no dependan de la precisión
+        scale = 100 * (12 // int(months))
+        rate = annual_rate / scale
+        if rate == 0:
+            payment = (balance / num_payments).quantize(CENT, rounding=mode)
+        else:
+            payment = (balance * rate / (1 - (1 + rate) ** -num_payments)).quantize(CENT, rounding=mode)
+        rows = []
+        for period in range(1, num_payments + 1):
+            interest = (balance * annual_rate / scale).quantize(CENT, rounding=mode)
+            amortized = balance if period == num_payments else min(payment - interest, balance)
+            rows.append((balance, amortized + interest, interest, amortized, balance - amortized))
+            balance -= amortized
+    return rows
+
+
+def main():
+    loans = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeats = 20
+    amortization_schedule(50000, 5, 600, "Mensual")  # importa pandas fuera de la medición
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        amortization_schedule(50000, 5, 600, "Mensual")
+    t_float = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _, exact = amortization_schedule(50000, 5, 600, "Mensual", rounding="Bancario")
+    t_cents = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    reference = decimal_schedule(50000.0, 5.0, 600, "Mensual", "Bancario")
+    t_decimal = time.perf_counter() - start
+    matches = np.array_equal(np.round(exact.to_numpy()[:, 1:] * 100), np.round(np.array(reference, dtype=float) * 100))
+    print(f"página (600 pagos)      flotante {t_float * 1000:7.2f} ms  centavos {t_cents * 1000:7.2f} ms  "
+          f"Decimal {t_decimal * 1000:7.2f} ms  coincide con Decimal: {matches}")
+
+    rng = np.random.default_rng(7)
+    principals = np.round(rng.uniform(1_000, 500_000, loans), 2)
+    rates = np.round(rng.uniform(0.5, 40, loans), 2)
+    terms = rng.integers(6, 361, loans)
+    frequencies = rng.choice(list(PAYMENT_FREQUENCIES), loans)
+
+    for label, rounding in (("flotante", None), ("centavos", "Bancario"), ("centavos", "Mitad hacia arriba")):
+        start = time.perf_counter()
+        rows = sum(len(chunk["Período"]) for chunk in
+                   iter_schedule_chunks(principals, rates, terms, frequencies, rounding=rounding))
+        elapsed = time.perf_counter() - start
+        print(f"cartera ({loans:,} préstamos, {rows:,} filas) {label:9s} {rounding or '':19s} "
+              f"{elapsed * 1000:9.1f} ms  ({rows / elapsed / 1e6:5.2f} M filas/s)")
+
+    # Muestra de préstamos verificada contra la referencia en Decimal
+    sample = rng.choice(loans, 200, replace=False)
+    for rounding in ROUNDING_MODES:
+        chunk = next(iter_schedule_chunks(principals[sample], rates[sample], terms[sample], frequencies[sample],
+                                          rounding=rounding, chunk_rows=10**9))
+        expected = np.concatenate([
+            np.array(decimal_schedule(principals[i], rates[i], terms[i], frequencies[i], rounding), dtype=float)
+            for i in sample
+        ])
+        produced = np.column_stack([chunk[col] for col in list(chunk)[2:]])
+        payments = cents_portfolio_payments(principals[sample], rates[sample], terms[sample], frequencies[sample],
+                                            rounding)["payments"]
+        print(f"muestra de 200 préstamos ({rounding}): coincide con Decimal: "
+              f"{np.array_equal(np.round(produced * 100), np.round(expected * 100))}, "
+              f"suma de capital amortizado = capital: "
+              f"{np.isclose(chunk['Capital Amortizado'].sum(), principals[sample].sum())}, "
+              f"cuota media {payments.mean() / 100:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Exportación a Excel: pandas.ExcelWriter (anterior) contra escritura por bloques en constant_memory.
+
+Mide tiempo y pico de memoria de Python para una tabla de la página (600
+filas) y para una cartera grande, y el costo por rerun de la página antes
+(el Excel se armaba en cada rerun) y después (solo al pedir la descarga).
+
+Uso: python benchmarks/bench_excel.py [filas_cartera]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, amortization_schedule, iter_schedule_chunks
+from finanzas.exportacion import dataframe_to_xlsx
+
+# Mismo formato de montos que aplicaba la versión anterior
+AMOUNT_FORMATS = {col: "#,##0" for col in SCHEDULE_COLUMNS[1:]}
+
+
+def legacy_dataframe_to_xlsx(df, sheet_name, number_format="#,##0"):
+    """Copia de la versión anterior: pandas.ExcelWriter sobre la tabla completa."""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+        amount_format = writer.book.add_format({"num_format": number_format})
+        worksheet = writer.sheets[sheet_name]
+        for position, col in enumerate(df.columns):
+            if pd.api.types.is_float_dtype(df[col]):
+                worksheet.set_column(position, position, 18, amount_format)
+    return output.getvalue()
+
+
+def chunked_dataframe_to_xlsx(df, sheet_name):
+    return dataframe_to_xlsx(df, sheet_name, AMOUNT_FORMATS)
+
+
+def measure(func, df):
+    start = time.perf_counter()
+    func(df, "Amortizacion")
+    elapsed = time.perf_counter() - start
+    # La memoria se mide en una segunda corrida: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    func(df, "Amortizacion")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    portfolio_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    _, page_table = amortization_schedule(50000, 5, 600, "Mensual")
+    loans = int(np.ceil(portfolio_rows / 360))
+    chunks = list(iter_schedule_chunks(np.full(loans, 1e6), np.full(loans, 12.0), np.full(loans, 360)))
+    portfolio = pd.DataFrame({col: np.concatenate([chunk[col] for chunk in chunks]) for col in chunks[0]})
+    portfolio = portfolio.iloc[:portfolio_rows]
+
+    for label, df in (("página (600 filas)", page_table), (f"cartera ({len(portfolio):,} filas)", portfolio)):
+        for name, func in (("pandas.ExcelWriter", legacy_dataframe_to_xlsx), ("constant_memory", chunked_dataframe_to_xlsx)):
+            elapsed, peak = measure(func, df)
+            print(f"{label:24s} {name:20s} {elapsed * 1000:10.1f} ms  pico {peak / 1e6:8.1f} MB")
+
+    reruns = 20
+    start = time.perf_counter()
+    for _ in range(reruns):
+        legacy_dataframe_to_xlsx(page_table, "Amortizacion")
+    eager = (time.perf_counter() - start) / reruns
+    print(f"costo por rerun con tabla en pantalla: antes {eager * 1000:.1f} ms (Excel en cada rerun), "
+          f"ahora 0 ms hasta pedir la descarga")
+
+
+if __name__ == "__main__":
+    main()
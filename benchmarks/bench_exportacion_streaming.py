@@ -0,0 +1,48 @@
+"""Exporta tablas de amortización de una cartera por bloques y mide memoria.
+
+Uso: python benchmarks/bench_exportacion_streaming.py [csv|parquet|xlsx] [filas]
+
+Cada formato se ejecuta en un proceso propio para que el pico de memoria
+(ru_maxrss) refleje solo esa exportación.
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import iter_schedule_chunks
+from finanzas.exportacion import write_csv, write_parquet, write_xlsx
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def main():
+    fmt = sys.argv[1] if len(sys.argv) > 1 else "parquet"
+    target_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+
+    # Préstamos mensuales a 360 meses: 360 filas por préstamo
+    loans = target_rows // 360
+    rng = np.random.default_rng(3)
+    principals = rng.uniform(10_000, 500_000, loans)
+    rates = rng.uniform(1, 25, loans)
+
+    chunks = iter_schedule_chunks(principals, rates, 360, "Mensual")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"tabla.{fmt}")
+        start = time.perf_counter()
+        rows = WRITERS[fmt](chunks, path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{fmt:8s} {rows:>12,} filas  {elapsed:8.2f} s  {rows / elapsed:>12,.0f} filas/s  "
+          f"{size / 1e6:9.1f} MB en disco  pico RSS {peak_mb:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
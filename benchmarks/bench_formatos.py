@@ -0,0 +1,50 @@
+"""Exportación por formato: tamaño del archivo y tiempo de escritura con ``export_table``.
+
+Compara Excel, Parquet, Arrow IPC y CSV para una tabla de la página (600
+filas) y una cartera grande, partiendo de un DataFrame con columnas de NumPy
+y del mismo DataFrame respaldado por Arrow (``dtype_backend="pyarrow"``).
+
+Uso: python benchmarks/bench_formatos.py [filas_cartera]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import amortization_schedule, iter_schedule_chunks
+from finanzas.exportacion import EXPORT_FORMATS, export_table
+
+
+def measure(df, export_format, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        data = export_table(df, export_format, sheet_name="Amortizacion")
+        best = min(best, time.perf_counter() - start)
+    return best, len(data)
+
+
+def main():
+    portfolio_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    _, page_table = amortization_schedule(50000, 5, 600, "Mensual")
+    loans = int(np.ceil(portfolio_rows / 360))
+    chunks = list(iter_schedule_chunks(np.full(loans, 1e6), np.full(loans, 12.0), np.full(loans, 360)))
+    portfolio = pd.DataFrame({col: np.concatenate([chunk[col] for chunk in chunks]) for col in chunks[0]})
+    portfolio = portfolio.iloc[:portfolio_rows]
+
+    for label, df, repeats in (("página (600 filas)", page_table, 5), (f"cartera ({len(portfolio):,} filas)", portfolio, 1)):
+        print(label)
+        arrow_df = df.convert_dtypes(dtype_backend="pyarrow")
+        for export_format in EXPORT_FORMATS:
+            elapsed, size = measure(df, export_format, repeats)
+            elapsed_arrow, _ = measure(arrow_df, export_format, repeats)
+            print(f"  {export_format:10s} {size / 1e6:9.3f} MB  {elapsed * 1000:9.1f} ms (NumPy)  "
+                  f"{elapsed_arrow * 1000:9.1f} ms (Arrow)")
+
+
+if __name__ == "__main__":
+    main()
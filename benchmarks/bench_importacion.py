@@ -0,0 +1,70 @@
+"""Tiempo de arranque: importar los motores de ``finanzas`` en un proceso nuevo.
+
+Cada caso corre en un intérprete limpio (``python -X importtime``) varias
+veces y se informa la mediana del tiempo acumulado de importación, además de
+si quedaron cargados pandas o Streamlit. El caso "intérprete vacío" mide lo
+que el propio Python importa al arrancar y es la base de comparación.
+
+Uso: python benchmarks/bench_importacion.py [repeticiones]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("intérprete vacío", "pass"),
+    ("import finanzas", "import finanzas"),
+    ("finanzas.tasas", "import finanzas.tasas"),
+    ("finanzas.tir", "import finanzas.tir"),
+    ("finanzas.amortizacion", "import finanzas.amortizacion"),
+    ("finanzas.interes_compuesto", "import finanzas.interes_compuesto"),
+    ("finanzas.servicio", "import finanzas.servicio"),
+    ("cuota (uso real)", "from finanzas.amortizacion import portfolio_payments; portfolio_payments(1e6, 12, 60)"),
+    ("tabla (usa pandas)", "from finanzas import amortization_schedule; amortization_schedule(1e6, 12, 60, 'Mensual')"),
+    ("referencia: numpy", "import numpy"),
+    ("referencia: pandas", "import pandas"),
+    ("referencia: numpy_financial", "import numpy_financial"),
+    ("referencia: streamlit", "import streamlit"),
+]
+
+PROBE = "; import sys; print('PANDAS' if 'pandas' in sys.modules else '', 'STREAMLIT' if 'streamlit' in sys.modules else '')"
+
+
+def import_time(code):
+    """Microsegundos acumulados de todas las importaciones de nivel superior, y los módulos pesados cargados."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + PROBE],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    total = 0
+    for line in result.stderr.splitlines():
+        # Solo los módulos de primer nivel (sin sangría) para no contar dos veces
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| \S", line)
+        if match:
+            total += int(match.group(1))
+    return total, result.stdout.split()
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, code in CASES:
+        times, loaded = [], []
+        for _ in range(repeats):
+            total, loaded = import_time(code)
+            if total is None:
+                break
+            times.append(total)
+        if not times:
+            print(f"{name:30s} no disponible ({loaded})")
+            continue
+        print(f"{name:30s} {statistics.median(times) / 1000:8.1f} ms  {' '.join(loaded).lower()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Contrasta la proyección en forma cerrada con el bucle año x período original.
+
+Uso: python benchmarks/bench_interes_compuesto.py
+
+Primero verifica, para todas las combinaciones de frecuencia de
+capitalización y de aporte, que ambos métodos coinciden; luego mide el caso
+más costoso del bucle (capitalización diaria a 100 años).
+"""
+import itertools
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.interes_compuesto import (
+    COMPOUNDING_FREQUENCIES, CONTRIBUTION_FREQUENCIES, compound_interest_projection,
+)
+
+
+def legacy_projection(initial_investment, annual_contribution, annual_interest_rate, investment_term_years,
+                      compounding_frequency, contribution_frequency):
+    """Copia del bucle anidado que usaba calculate_compound_interest."""
+    m = COMPOUNDING_FREQUENCIES[compounding_frequency]
+    contribution_multiplier = CONTRIBUTION_FREQUENCIES[contribution_frequency]
+    periodic_rate = (annual_interest_rate / 100) / m
+    periodic_contribution_amount = 0
+    if contribution_multiplier > 0:
+        periodic_contribution_amount = annual_contribution / contribution_multiplier
+
+    rows = []
+    current_balance = initial_investment
+    total_additional_contributions = 0
+    for year in range(1, investment_term_years + 1):
+        balance_start_of_year = current_balance
+        interests_this_year = 0
+        contributions_this_year = 0
+        for period_in_year in range(1, m + 1):
+            interest_for_period = current_balance * periodic_rate
+            interests_this_year += interest_for_period
+            current_balance += interest_for_period
+            if contribution_multiplier > 0 and (period_in_year % (m / contribution_multiplier) == 0):
+                current_balance += periodic_contribution_amount
+                contributions_this_year += periodic_contribution_amount
+                total_additional_contributions += periodic_contribution_amount
+        rows.append((year, balance_start_of_year, contributions_this_year, interests_this_year, current_balance))
+    return np.array(rows, dtype=float), initial_investment + total_additional_contributions
+
+
+def check_all_combinations():
+    cases = [(10000.0, 100.0, 7.0, 10), (0.0, 1200.0, 0.1, 100), (250000.0, 50000.0, 35.0, 40)]
+    worst = 0.0
+    for (compounding, contribution), case in itertools.product(
+            itertools.product(COMPOUNDING_FREQUENCIES, CONTRIBUTION_FREQUENCIES), cases):
+        expected, expected_invested = legacy_projection(*case, compounding, contribution)
+        df, summary = compound_interest_projection(*case, compounding, contribution)
+        got = df.to_numpy(dtype=float)
+        np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-6, err_msg=f"{compounding}/{contribution} {case}")
+        np.testing.assert_allclose(summary["total_invested"], expected_invested, rtol=1e-12)
+        scale = np.maximum(np.abs(expected), 1.0)
+        worst = max(worst, float((np.abs(got - expected) / scale).max()))
+    combos = len(COMPOUNDING_FREQUENCIES) * len(CONTRIBUTION_FREQUENCIES)
+    print(f"{combos} combinaciones x {len(cases)} casos coinciden (error relativo máximo {worst:.2e})")
+
+
+def main():
+    check_all_combinations()
+
+    args = (10000.0, 1200.0, 7.0, 100, "Diario", "Mensual")
+    number = 5
+    t_legacy = timeit.timeit(lambda: legacy_projection(*args), number=number) / number
+    t_closed = timeit.timeit(lambda: compound_interest_projection(*args), number=number * 100) / (number * 100)
+    print(f"bucle original (Diario, 100 años): {t_legacy * 1e3:8.3f} ms")
+    print(f"forma cerrada:                      {t_closed * 1e3:8.3f} ms  ({t_legacy / t_closed:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
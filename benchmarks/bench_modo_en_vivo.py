@@ -0,0 +1,94 @@
+"""Latencia del modo en vivo de cada página contra su presupuesto (50 ms por recálculo).
+
+Ejecuta cada página con ``streamlit.testing`` en modo en vivo y cambia un
+dato muchas veces, como lo haría un usuario (cada valor es nuevo, así que el
+motor calcula sin la caché). Para cada cambio registra el tiempo que la
+propia página informa para el fragmento (datos, cálculo y resultados) y el
+de la ejecución completa de la página, que es lo que cuesta cada
+interacción sin modo en vivo. Los casos son los más pesados de cada página:
+tabla de 600 pagos, proyección diaria a 100 años, perfil del VAN con 40
+flujos y la tabla de equivalencias.
+
+Uso: python benchmarks/bench_modo_en_vivo.py [cambios]
+"""
+import os
+import re
+import sys
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LIVE_CAPTION = re.compile(r"Modo en vivo: recalculado en ([\d.]+) ms \(presupuesto: (\d+) ms\)")
+
+
+def amortization(at, step):
+    if step == 0:
+        at.number_input(key="loan_term_input_amort").set_value(600)
+    at.number_input(key="principal_input_amort").set_value(50_000.0 + 137 * step)
+
+
+def compound_interest(at, step):
+    if step == 0:
+        at.number_input(key="investment_term_input").set_value(100)
+        at.selectbox(key="compounding_freq_ic").set_value("Diario")
+    at.number_input(key="initial_investment_input").set_value(10_000.0 + 37 * step)
+
+
+def irr(at, step):
+    if step == 0:
+        flows = np.random.default_rng(24).uniform(500, 3_000, 40).round(2)
+        at.session_state["cash_flows_tir"] = flows.tolist()
+    # Alterna cambios de la inversión (TIR nueva) y de la tasa de descuento (TIR en caché)
+    if step % 2:
+        at.slider(key="discount_rate_input_tir").set_value(round(5 + (step % 400) * 0.1, 1))
+    else:
+        at.number_input(key="initial_investment_input_tir").set_value(-40_000.0 - 11 * step)
+
+
+def rates(at, step):
+    at.number_input(key="tea_table_tasas").set_value(round(5 + step * 0.01, 2))
+
+
+PAGES = {
+    "AMORTIZACION": ("pages/AMORTIZACION.py", "live_mode_amort", amortization),
+    "INTERES_COMPUESTO": ("pages/INTERES_COMPUESTO.py", "live_mode_ic", compound_interest),
+    "TIR": ("pages/TIR.py", "live_mode_tir", irr),
+    "TASAS": ("pages/TASAS.py", "live_mode_tasas", rates),
+}
+
+
+def measure(path, toggle_key, change, steps):
+    at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=60).run()
+    at.toggle(key=toggle_key).set_value(True).run()
+    fragment_ms, page_ms = [], []
+    for step in range(steps):
+        change(at, step)
+        start = time.perf_counter()
+        at.run()
+        page_ms.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        reported = [LIVE_CAPTION.search(caption.value) for caption in at.caption]
+        match = next(found for found in reported if found)
+        fragment_ms.append(float(match.group(1)))
+        budget_ms = int(match.group(2))
+    return np.array(fragment_ms[1:]), np.array(page_ms[1:]), budget_ms
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{steps} cambios por página; fragmento = tiempo informado por la página, página = ejecución completa")
+    for name, (path, toggle_key, change) in PAGES.items():
+        fragment_ms, page_ms, budget_ms = measure(path, toggle_key, change, steps)
+        p50, p95 = np.percentile(fragment_ms, [50, 95])
+        within = "dentro" if p95 <= budget_ms else "FUERA"
+        print(f"{name:18s} fragmento p50 {p50:5.1f} ms  p95 {p95:5.1f} ms  máx {fragment_ms.max():5.1f} ms  "
+              f"({within} de {budget_ms} ms)  |  página completa p50 {np.median(page_ms):6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
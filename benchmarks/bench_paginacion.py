@@ -0,0 +1,79 @@
+"""Tamaño y tiempo de serialización de las tablas grandes, completas y por página.
+
+``st.dataframe`` convierte a Arrow todas las filas que recibe y las envía
+al navegador en cada ejecución. Se compara la tabla completa (como se
+mostraba antes) con una página de 100 filas y con la vista por año: bytes
+de Arrow enviados, tiempo de conversión (la misma función que usa
+Streamlit) y tiempo de armar la vista en el servidor. Los casos son la
+tabla de amortización más larga que permite la página (600 pagos) y la
+evaluación masiva de la página TIR.
+
+El tiempo de dibujo en el navegador no se puede medir desde aquí; como la
+grilla del navegador ya dibuja solo las filas visibles, lo que cambia con
+las páginas es sobre todo el envío y la decodificación de los datos.
+
+Uso: python benchmarks/bench_paginacion.py [proyectos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import amortization_schedule
+from finanzas.paginacion import table_page, yearly_schedule
+from finanzas.tir import evaluate_projects
+
+PAGE_SIZE = 100
+
+
+def best_ms(function, repeats=20):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, min(times) * 1000
+
+
+def report(label, build):
+    table, build_ms = best_ms(build)
+    payload, arrow_ms = best_ms(lambda: convert_pandas_df_to_arrow_bytes(table))
+    print(f"  {label:16s} {len(table):>9,} filas  {len(payload) / 1024:10,.1f} KiB  "
+          f"Arrow {arrow_ms:7.2f} ms  vista {build_ms:6.2f} ms")
+    return len(payload), arrow_ms + build_ms
+
+
+def compare(name, views):
+    print(name)
+    results = {label: report(label, build) for label, build in views.items()}
+    full_bytes, full_ms = results["completa"]
+    for label, (size, ms) in results.items():
+        if label != "completa":
+            print(f"  {label}: {full_bytes / size:6.1f}x menos datos, {full_ms / ms:6.1f}x menos tiempo que la completa")
+
+
+def main():
+    size = int(float(sys.argv[1])) if len(sys.argv) > 1 else 200_000
+    _, schedule = amortization_schedule(250_000.0, 9.5, 600, "Mensual")
+    compare("Tabla de amortización (600 pagos mensuales)", {
+        "completa": lambda: schedule,
+        "página": lambda: table_page(schedule, 4, PAGE_SIZE),
+        "por año": lambda: yearly_schedule(schedule, 12),
+    })
+
+    rng = np.random.default_rng(25)
+    flows = rng.uniform(500, 3_000, (size, 11))
+    flows[:, 0] = -rng.uniform(5_000, 15_000, size)
+    evaluation = evaluate_projects(flows, 0.10)
+    compare(f"Evaluación masiva de TIR ({size:,} proyectos de 10 flujos)", {
+        "completa": lambda: evaluation,
+        "página": lambda: table_page(evaluation, 1_000, PAGE_SIZE),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Perfil del VAN: barrido de tasas por producto matricial contra npv_batch tasa por tasa.
+
+Uso: python benchmarks/bench_perfil_van.py [proyectos] [períodos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.tir import discount_factor_matrix, npv_batch, npv_profile
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    periods = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    rng = np.random.default_rng(11)
+    flows = rng.normal(150, 60, (count, periods + 1))
+    flows[:, 0] = -rng.uniform(5_000, 15_000, count)
+
+    start = time.perf_counter()
+    rates, profile = npv_profile(flows)
+    t_cold = time.perf_counter() - start
+    start = time.perf_counter()
+    rates, profile = npv_profile(flows)
+    t_warm = time.perf_counter() - start
+    print(f"{count:,} proyectos x {rates.size:,} tasas: primera {t_cold:.3f} s, con caché {t_warm:.3f} s "
+          f"({discount_factor_matrix.cache_info().hits} aciertos de caché)")
+
+    sample = np.arange(0, rates.size, 50)
+    start = time.perf_counter()
+    loop = np.column_stack([npv_batch(rates[i], flows) for i in sample])
+    t_loop = (time.perf_counter() - start) * rates.size / sample.size
+    error = np.abs(loop - profile[:, sample]).max() / np.abs(flows).sum(axis=1).max()
+    print(f"tasa por tasa (estimado): {t_loop:.3f} s  ->  {t_loop / t_warm:,.0f}x  error relativo máx {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Pagos extraordinarios: recálculo completo contra recálculo incremental desde el período editado.
+
+Parte de un préstamo a 600 meses con un pago extra recurrente, edita un pago
+extra en distintos períodos ``k`` y mide cuánto tarda rehacer la tabla
+completa frente a reutilizar las filas anteriores a ``k`` del resultado
+previo. Como referencia incluye un recorrido período a período en Python y
+verifica que las tres tablas coinciden.
+
+Uso: python benchmarks/bench_prepagos.py [repeticiones]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import fixed_payment, payment_terms
+from finanzas.prepagos import PREPAYMENT_COLUMNS, PREPAYMENT_MODES, extra_payments, prepayment_schedule
+
+LOAN = (250_000.0, 9.0, 600, "Mensual")
+
+
+def loop_schedule(principal, annual_interest_rate, loan_term_months, payment_frequency, extras, mode):
+    """Referencia: la tabla con pagos extra recorriendo los períodos de a uno."""
+    num_payments, rate = payment_terms(annual_interest_rate, loan_term_months, payment_frequency)
+    payment = fixed_payment(principal, rate, num_payments)
+    balance = principal
+    rows = []
+    for period in range(1, num_payments + 1):
+        interest = balance * rate
+        extra = extras[period - 1]
+        closing = balance + interest - payment - extra
+        if period == num_payments or closing <= 1e-9 * principal:
+            extra = min(extra, balance)
+            rows.append((period, balance, balance + interest - extra, extra, interest, balance, 0.0))
+            break
+        rows.append((period, balance, payment, extra, interest, payment - interest + extra, closing))
+        balance = closing
+        if mode == "Reducir cuota" and extra:
+            payment = fixed_payment(balance, rate, num_payments - period)
+    return np.array(rows)
+
+
+def timed(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return (time.perf_counter() - start) / repeats * 1e6, result
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    num_payments, _ = payment_terms(*LOAN[1:])
+    base_extras = extra_payments(num_payments, recurring_amount=200.0, every=12, start=12)
+
+    for mode in PREPAYMENT_MODES:
+        base = prepayment_schedule(*LOAN, base_extras, mode)
+        print(f"{mode} (la tabla base termina en el período {base['arrays']['Período'].size})")
+        for k in (12, num_payments // 4, num_payments // 2, 3 * num_payments // 4):
+            if k > base["arrays"]["Período"].size:
+                continue
+            extras = base_extras.copy()
+            extras[k - 1] += 5_000.0
+            t_loop, looped = timed(lambda: loop_schedule(*LOAN, extras, mode), max(repeats // 20, 1))
+            t_full, full = timed(lambda: prepayment_schedule(*LOAN, extras, mode), repeats)
+            t_incremental, incremental = timed(lambda: prepayment_schedule(*LOAN, extras, mode, previous=base),
+                                               repeats)
+            produced = np.column_stack([incremental["arrays"][col] for col in PREPAYMENT_COLUMNS])
+            matches = (np.allclose(produced, looped, atol=1e-6)
+                       and np.allclose(produced, np.column_stack([full["arrays"][col] for col in PREPAYMENT_COLUMNS]),
+                                       atol=1e-6))
+            print(f"  extra de 5.000 en el período {k:3d}: bucle {t_loop:8.1f} µs  completo {t_full:7.1f} µs  "
+                  f"incremental {t_incremental:7.1f} µs  ({incremental['arrays']['Período'].size - k + 1:3d} "
+                  f"períodos recalculados)  coincide: {matches}")
+
+
+if __name__ == "__main__":
+    main()
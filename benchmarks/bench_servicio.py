@@ -0,0 +1,119 @@
+"""Prueba de carga del servicio JSON: latencia p50/p99 y rendimiento por endpoint.
+
+Levanta ``python -m finanzas.servicio`` en un subproceso (o usa ``--host`` y
+``--port`` de un servidor ya en marcha con ``--externo``) y lo ataca con
+conexiones keep-alive concurrentes.
+
+Uso: python benchmarks/bench_servicio.py [--solicitudes N] [--conexiones C] [--lote B]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLES = {
+    "/amortizacion": {"capital": 100_000_000, "tasa_anual": 12.0, "plazo_meses": 60, "frecuencia": "Mensual"},
+    "/tir": {"flujos": [-10_000, 3_000, 4_000, 5_000, 6_000], "tasa_descuento": 10.0},
+    "/interes-compuesto": {"inversion_inicial": 10_000, "aporte_anual": 100, "tasa_anual": 7.0, "plazo_anios": 10},
+    "/tasas": {"conversion": "nominal_a_tea", "tasa": 5.0, "frecuencia": "Mensual"},
+}
+
+
+def build_request(host, path, payload):
+    body = json.dumps(payload).encode()
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode() + body
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    body = await reader.readexactly(length)
+    return int(head.split(b" ", 2)[1]), body
+
+
+async def worker(host, port, request, count, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Respuesta {status}")
+    finally:
+        writer.close()
+
+
+async def load(host, port, path, payload, requests, connections):
+    request = build_request(host, path, payload)
+    latencies = []
+    per_connection = max(1, requests // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, request, per_connection, latencies) for _ in range(connections)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+async def wait_until_ready(host, port, timeout=15.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(args):
+    await wait_until_ready(args.host, args.port)
+    for path, sample in SAMPLES.items():
+        for batch in (1, args.lote):
+            payload = sample if batch == 1 else [sample] * batch
+            latencies, elapsed = await load(args.host, args.port, path, payload, args.solicitudes, args.conexiones)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{path:19s} lote {batch:5d}: p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  "
+                  f"{latencies.size / elapsed:8,.0f} sol/s  {latencies.size * batch / elapsed:10,.0f} cálculos/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solicitudes", type=int, default=5_000)
+    parser.add_argument("--conexiones", type=int, default=32)
+    parser.add_argument("--lote", type=int, default=100)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--externo", action="store_true", help="No levantar el servidor; usar uno ya en marcha.")
+    args = parser.parse_args()
+
+    server = None
+    if not args.externo:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "finanzas.servicio", "--host", args.host, "--port", str(args.port)],
+            cwd=ROOT, stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
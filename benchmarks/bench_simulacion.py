@@ -0,0 +1,24 @@
+"""Trayectorias por segundo de la simulación Monte Carlo, en serie y en paralelo.
+
+Uso: python benchmarks/bench_simulacion.py [trayectorias]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.simulacion import monte_carlo_projection
+
+
+def main():
+    n_paths = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    args = (10000.0, 1200.0, 7.0, 30, "Diario", "Mensual")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        result = monte_carlo_projection(*args, volatility=15.0, n_paths=n_paths, workers=workers, seed=42)
+        median = result["percentiles"]["P50"].iloc[-1]
+        print(f"{workers:2d} proceso(s): {result['paths_per_second']:>12,.0f} trayectorias/s  "
+              f"({result['elapsed']:.2f} s, mediana final {median:,.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Escalamiento de los sistemas de amortización: tiempo por fila al crecer la cartera.
+
+Genera con ``iter_schedule_chunks`` las tablas completas de carteras cada vez
+más grandes (préstamos a 360 meses) para cada sistema y reporta el tiempo
+total y por fila; si el escalamiento es lineal, el tiempo por fila se
+mantiene constante.
+
+Uso: python benchmarks/bench_sistemas.py [máximo_de_filas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import AMORTIZATION_SYSTEMS, iter_schedule_chunks
+
+
+def main():
+    max_rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 4_000_000
+    sizes = [max_rows // 8, max_rows // 4, max_rows // 2, max_rows]
+    rng = np.random.default_rng(11)
+
+    print(f"{'sistema':12s}" + "".join(f"{size:>22,}" for size in sizes))
+    for system in AMORTIZATION_SYSTEMS:
+        cells = []
+        for size in sizes:
+            loans = size // 360
+            principals = rng.uniform(1_000, 500_000, loans)
+            rates = rng.uniform(0.5, 40, loans)
+            start = time.perf_counter()
+            rows = sum(len(chunk["Período"]) for chunk in iter_schedule_chunks(
+                principals, rates, 360, "Mensual", system=system, step_up_rates=5.0
+            ))
+            elapsed = time.perf_counter() - start
+            cells.append(f"{elapsed * 1000:9.0f} ms {elapsed / rows * 1e9:5.0f} ns/f")
+        print(f"{system:12s}" + "".join(f"{cell:>22s}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
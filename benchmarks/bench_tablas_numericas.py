@@ -0,0 +1,68 @@
+"""Exportación a Excel: tabla de texto re-convertida vs. tabla numérica.
+
+Uso: python benchmarks/bench_tablas_numericas.py [filas]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, iter_schedule_chunks
+from finanzas.exportacion import dataframe_to_xlsx
+
+
+def format_as_text(df):
+    """Lo que hacían las páginas al calcular: guardar cada monto como texto."""
+    as_text = df.copy()
+    for col in SCHEDULE_COLUMNS[1:]:
+        as_text[col] = [f"{round(value):,}" for value in df[col]]
+    return as_text
+
+
+def legacy_to_excel(df):
+    """Exportación anterior: quitar comas y volver a float en cada columna."""
+    output = BytesIO()
+    df_for_excel = df.copy()
+    for col in SCHEDULE_COLUMNS[1:]:
+        df_for_excel[col] = df_for_excel[col].str.replace(',', '').astype(float)
+    writer = pd.ExcelWriter(output, engine='xlsxwriter')
+    df_for_excel.to_excel(writer, index=False, sheet_name='Amortizacion')
+    writer.close()
+    return output.getvalue()
+
+
+def measure(label, func, df):
+    start = time.perf_counter()
+    func(df)
+    elapsed = time.perf_counter() - start
+    # La memoria se mide en una segunda corrida: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28s} {elapsed * 1e3:10.1f} ms  pico {peak / 1e6:8.1f} MB")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 60_000
+    loans = max(1, rows // 600)
+    rng = np.random.default_rng(11)
+    chunk = next(iter_schedule_chunks(rng.uniform(1e4, 1e6, loans), 12.0, 600, chunk_rows=loans * 600))
+    numeric = pd.DataFrame({col: chunk[col] for col in SCHEDULE_COLUMNS})
+
+    print(f"{len(numeric):,} filas")
+    measure("texto -> float -> Excel", lambda df: legacy_to_excel(format_as_text(df)), numeric)
+    measure("numérica -> Excel", lambda df: dataframe_to_xlsx(df, 'Amortizacion'), numeric)
+
+    text_bytes = format_as_text(numeric).memory_usage(deep=True).sum()
+    print(f"tabla en session_state: texto {text_bytes / 1e6:.2f} MB, numérica {numeric.memory_usage(deep=True).sum() / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Tasa variable: forma cerrada contra un recorrido por período, y una cartera indexada.
+
+Un préstamo a 360 meses con 30 ajustes anuales del índice se calcula con
+``variable_rate_schedule`` (un producto acumulado, sin bucles) y con un bucle
+período a período en Python, verificando que coinciden. Luego genera las
+tablas de una cartera indexada a la misma curva, con frecuencias mezcladas.
+
+Uso: python benchmarks/bench_tasa_variable.py [préstamos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.amortizacion import PAYMENT_FREQUENCIES, fixed_payment
+from finanzas.tasa_variable import iter_variable_rate_chunks, variable_rate_schedule
+
+
+def loop_schedule(principal, spread, loan_term_months, payment_frequency, curve_months, curve_rates):
+    """Referencia: la cuota se recalcula en cada ajuste recorriendo los períodos de a uno."""
+    months = PAYMENT_FREQUENCIES[payment_frequency]
+    num_payments = -(-loan_term_months // months)
+    balance = principal
+    rows = []
+    current = None
+    for period in range(1, num_payments + 1):
+        position = np.searchsorted(curve_months, (period - 1) * months, side="right") - 1
+        annual_rate = max(curve_rates[position] + spread, 0.0)
+        rate = annual_rate / 100 / (12 / months)
+        if position != current:
+            payment = fixed_payment(balance, rate, num_payments - period + 1)
+            current = position
+        interest = balance * rate
+        amortized = balance if period == num_payments else payment - interest
+        rows.append((period, annual_rate, balance, amortized + interest, interest, amortized, balance - amortized))
+        balance -= amortized
+    return np.array(rows)
+
+
+def main():
+    loans = int(float(sys.argv[1])) if len(sys.argv) > 1 else 20_000
+    rng = np.random.default_rng(5)
+    curve_months = np.arange(0, 360, 12)
+    curve_rates = np.round(rng.uniform(2, 9, curve_months.size), 2)
+    repeats = 50
+    variable_rate_schedule(250_000, 1.5, 360, "Mensual", curve_months, curve_rates)  # importa pandas antes de medir
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        _, table = variable_rate_schedule(250_000, 1.5, 360, "Mensual", curve_months, curve_rates)
+    t_closed = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats // 5):
+        reference = loop_schedule(250_000, 1.5, 360, "Mensual", curve_months, curve_rates)
+    t_loop = (time.perf_counter() - start) / (repeats // 5)
+    print(f"préstamo a 360 meses, {curve_months.size} ajustes: forma cerrada {t_closed * 1000:6.2f} ms  "
+          f"bucle {t_loop * 1000:6.2f} ms  ({t_loop / t_closed:4.1f}x)  "
+          f"coincide: {np.allclose(table.to_numpy(), reference, atol=1e-6)}")
+
+    principals = rng.uniform(1_000, 500_000, loans)
+    spreads = np.round(rng.uniform(0.5, 4, loans), 2)
+    terms = rng.integers(12, 361, loans)
+    for label, frequencies in (("mensual", "Mensual"), ("mixta", rng.choice(list(PAYMENT_FREQUENCIES), loans))):
+        start = time.perf_counter()
+        rows = sum(len(chunk["Período"]) for chunk in iter_variable_rate_chunks(
+            principals, spreads, terms, frequencies, curve_months, curve_rates
+        ))
+        elapsed = time.perf_counter() - start
+        print(f"cartera {label:8s} ({loans:,} préstamos, {rows:,} filas): {elapsed * 1000:8.1f} ms  "
+              f"({elapsed / rows * 1e9:5.1f} ns/fila)")
+
+
+if __name__ == "__main__":
+    main()
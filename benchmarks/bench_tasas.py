@@ -0,0 +1,83 @@
+"""Conversión de curvas de tasas: finanzas.tasas contra las funciones originales de la página.
+
+Uso: python benchmarks/bench_tasas.py [cotizaciones]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.tasas import (
+    FREQUENCY_OPTIONS,
+    effective_annual_to_effective_periodic,
+    effective_annual_to_nominal,
+    effective_periodic_to_effective_annual,
+    frequency_lookup,
+    nominal_to_effective_annual,
+)
+
+
+# Copia de la escalera de frecuencias que repetían las cuatro funciones de pages/TASAS.py
+def legacy_periods_per_year(frequency):
+    if frequency == "Anual":
+        periods_per_year = 1
+    elif frequency == "Semestral":
+        periods_per_year = 2
+    elif frequency == "Cuatrimestral":
+        periods_per_year = 3
+    elif frequency == "Trimestral":
+        periods_per_year = 4
+    elif frequency == "Bimestral":
+        periods_per_year = 6
+    elif frequency == "Mensual":
+        periods_per_year = 12
+    elif frequency == "Quincenal":
+        periods_per_year = 24
+    elif frequency == "Diario":
+        periods_per_year = 365
+    return periods_per_year
+
+
+LEGACY = {
+    "nominal -> TEA": lambda r, f: (1 + r / legacy_periods_per_year(f)) ** legacy_periods_per_year(f) - 1,
+    "TEA -> nominal": lambda r, f: legacy_periods_per_year(f) * ((1 + r) ** (1 / legacy_periods_per_year(f)) - 1),
+    "periódica -> TEA": lambda r, f: (1 + r) ** legacy_periods_per_year(f) - 1,
+    "TEA -> periódica": lambda r, f: (1 + r) ** (1 / legacy_periods_per_year(f)) - 1,
+}
+
+VECTORIZED = {
+    "nominal -> TEA": nominal_to_effective_annual,
+    "TEA -> nominal": effective_annual_to_nominal,
+    "periódica -> TEA": effective_periodic_to_effective_annual,
+    "TEA -> periódica": effective_annual_to_effective_periodic,
+}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(10)
+    rates = rng.uniform(0.0, 0.6, count)
+    frequencies = rng.choice(FREQUENCY_OPTIONS, count)
+    periods = frequency_lookup(frequencies)
+    rate_list, frequency_list = rates.tolist(), frequencies.tolist()
+
+    for name, function in VECTORIZED.items():
+        start = time.perf_counter()
+        expected = np.array([LEGACY[name](r, f) for r, f in zip(rate_list, frequency_list)])
+        t_legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        result = function(rates, frequencies)
+        t_vector = time.perf_counter() - start
+        start = time.perf_counter()
+        function(rates, periods)
+        t_numeric = time.perf_counter() - start
+        error = (np.abs(result - expected) / np.maximum(np.abs(expected), 1e-12)).max()
+        print(f"{name:17s} original {t_legacy:6.3f} s  por nombre {t_vector:6.3f} s ({t_legacy / t_vector:4.0f}x)  "
+              f"por período {t_numeric:6.3f} s ({t_legacy / t_numeric:4.0f}x)  error relativo máx {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""TIR vectorizada frente a ``npf.irr`` proyecto por proyecto.
+
+Uso: python benchmarks/bench_tir.py [proyectos] [períodos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import numpy_financial as npf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.tir import CONVERGED, irr_batch
+
+
+def synthetic_projects(count, periods, seed=5):
+    rng = np.random.default_rng(seed)
+    flows = rng.normal(1_000, 800, (count, periods + 1))
+    flows[:, 0] = -rng.uniform(2_000, 10_000, count) * periods / 5
+    # Un 10% de proyectos no convencionales, con un egreso grande a mitad de vida
+    unconventional = rng.random(count) < 0.1
+    flows[unconventional, periods // 2] -= rng.uniform(1_000, 20_000, unconventional.sum())
+    return flows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    periods = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    flows = synthetic_projects(count, periods)
+
+    start = time.perf_counter()
+    expected = np.array([npf.irr(row) for row in flows])
+    t_npf = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rates, status = irr_batch(flows)
+    t_batch = time.perf_counter() - start
+
+    both = np.isfinite(expected) & (status == CONVERGED)
+    npv_residual = np.abs([npf.npv(rate, row) for rate, row in zip(rates[both], flows[both])])
+    print(f"{count:,} proyectos x {periods + 1} flujos")
+    print(f"npf.irr por fila:  {t_npf:8.3f} s")
+    print(f"irr_batch:         {t_batch:8.3f} s  ({t_npf / t_batch:5.1f}x)")
+    print(f"con TIR en ambos: {both.sum():,}; |diferencia| máxima {np.abs(rates[both] - expected[both]).max():.2e}; "
+          f"|VAN| residual máximo {npv_residual.max():.2e}")
+    print(f"solo irr_batch encontró TIR: {(~np.isfinite(expected) & (status == CONVERGED)).sum()}; "
+          f"solo npf.irr: {(np.isfinite(expected) & (status != CONVERGED)).sum()}")
+
+
+if __name__ == "__main__":
+    main()
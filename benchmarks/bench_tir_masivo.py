@@ -0,0 +1,47 @@
+"""Lectura y evaluación masiva de proyectos desde CSV y Parquet.
+
+Uso: python benchmarks/bench_tir_masivo.py [proyectos] [períodos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finanzas.lectura import read_cash_flows
+from finanzas.tir import evaluate_projects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    periods = int(sys.argv[2]) if len(sys.argv) > 2 else 480
+    rng = np.random.default_rng(9)
+    flows = rng.normal(100, 60, (count, periods + 1))
+    flows[:, 0] = -rng.uniform(5_000, 30_000, count)
+
+    columns = {"proyecto": [f"P{i:06d}" for i in range(count)]}
+    columns.update({f"f{t}": flows[:, t] for t in range(periods + 1)})
+    table = pa.table(columns)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in (("csv", pv.write_csv), ("parquet", pq.write_table)):
+            path = os.path.join(tmp, f"proyectos.{name}")
+            write(table, path)
+            start = time.perf_counter()
+            ids, matrix = read_cash_flows(path)
+            t_read = time.perf_counter() - start
+            start = time.perf_counter()
+            result = evaluate_projects(matrix, 0.01, ids)
+            t_eval = time.perf_counter() - start
+            print(f"{name:8s} lectura {t_read:6.2f} s  evaluación {t_eval:6.2f} s  "
+                  f"({count / (t_read + t_eval):,.0f} proyectos/s, {(result['Estado'] == 'Convergió').sum():,} con TIR)")
+
+
+if __name__ == "__main__":
+    main()
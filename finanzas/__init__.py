@@ -0,0 +1,51 @@
+"""Motores de cálculo financiero independientes de Streamlit.
+
+Las páginas en ``pages/`` son vistas sobre estos módulos; aquí solo vive la
+matemática, de modo que puede reutilizarse desde procesos por lotes.
+"""
+import importlib
+
+# Funciones principales disponibles como ``finanzas.<nombre>``. El módulo que
+# las define (y NumPy) se importa recién cuando se usan por primera vez.
+_LAZY_EXPORTS = {
+    "amortization_schedule": "finanzas.amortizacion",
+    "portfolio_payments": "finanzas.amortizacion",
+    "portfolio_cash_flows": "finanzas.amortizacion",
+    "amortization_schedule_cents": "finanzas.centavos",
+    "cents_portfolio_payments": "finanzas.centavos",
+    "extra_payments": "finanzas.prepagos",
+    "prepayment_schedule": "finanzas.prepagos",
+    "variable_rate_schedule": "finanzas.tasa_variable",
+    "iter_variable_rate_chunks": "finanzas.tasa_variable",
+    "dated_schedule": "finanzas.calendario",
+    "iter_dated_schedule_chunks": "finanzas.calendario",
+    "solve_principal": "finanzas.cuotas",
+    "solve_rate": "finanzas.cuotas",
+    "solve_term": "finanzas.cuotas",
+    "solve_quotes": "finanzas.cuotas",
+    "compound_interest_projection": "finanzas.interes_compuesto",
+    "monte_carlo_projection": "finanzas.simulacion",
+    "irr": "finanzas.tir",
+    "irr_batch": "finanzas.tir",
+    "npv_batch": "finanzas.tir",
+    "evaluate_projects": "finanzas.tir",
+    "yearly_schedule": "finanzas.paginacion",
+    "nominal_to_effective_annual": "finanzas.tasas",
+    "effective_annual_to_nominal": "finanzas.tasas",
+    "effective_periodic_to_effective_annual": "finanzas.tasas",
+    "effective_annual_to_effective_periodic": "finanzas.tasas",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module 'finanzas' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
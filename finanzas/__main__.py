@@ -0,0 +1,418 @@
+"""Calculadora por lotes desde la línea de comandos.
+
+::
+
+    python -m finanzas amortize prestamos.csv cuotas.parquet [--tabla] [--redondeo Bancario]
+    python -m finanzas amortize prestamos.csv tablas.parquet --tabla --curva indice.csv
+    python -m finanzas amortize prestamos.csv tablas.parquet --tabla --base ACT/360 --feriados feriados.csv
+    python -m finanzas irr proyectos.parquet resultados.csv [--tasa-descuento 10]
+    python -m finanzas compound inversiones.csv proyecciones.parquet
+    python -m finanzas convert tasas.csv convertidas.csv --conversion nominal_a_tea
+    python -m finanzas solve cotizaciones.parquet tasas.parquet --incognita tasa
+
+La entrada es un CSV o Parquet con las mismas columnas que los campos del
+servicio JSON (``capital``, ``tasa_anual``, ``plazo_meses``, ``frecuencia``,
+...); las tasas van en porcentaje, igual que en las páginas. Las filas se
+reparten en lotes entre un pool de procesos y los resultados se escriben a
+medida que llegan, en el formato que indique la extensión de la salida
+(``.csv``, ``.parquet``, ``.arrow`` o ``.xlsx``).
+
+Cada lote genera sus resultados por bloques: sin pool van directo al
+escritor; con pool cada proceso los vuelca a un archivo Arrow temporal que
+el proceso principal lee en orden y borra. Como mucho hay dos lotes por
+proceso en curso, así que la memoria no crece con el tamaño de la entrada.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from finanzas.amortizacion import AMORTIZATION_SYSTEMS, iter_schedule_chunks, portfolio_payments
+from finanzas.calendario import BUSINESS_DAY_CONVENTIONS, DAY_COUNTS, iter_dated_schedule_chunks
+from finanzas.centavos import RATE_SCALE, ROUNDING_MODES, cents_portfolio_payments
+from finanzas.cuotas import SOLVERS, solve_quotes
+from finanzas.exportacion import arrow_chunks, write_csv, write_ipc, write_parquet, write_xlsx
+from finanzas.interes_compuesto import compound_interest_arrays
+from finanzas.lectura import cash_flows_from_table, read_table
+from finanzas.tasa_variable import index_curve, iter_variable_rate_chunks, variable_rate_payments
+from finanzas.tasas import CONVERSIONS
+from finanzas.tir import evaluation_arrays
+
+# Filas por bloque de las tablas completas: bloques más chicos multiplican los row groups de Parquet y
+# escriben más lento; con medio millón de filas cada bloque ocupa unos 30 MB
+CHUNK_ROWS = 500_000
+
+WRITERS = {
+    ".csv": write_csv, ".parquet": write_parquet, ".pq": write_parquet,
+    ".arrow": write_ipc, ".feather": write_ipc, ".xlsx": write_xlsx,
+}
+
+
+def _column(table, name, default=None):
+    """Columna de la tabla como arreglo NumPy, o ``default`` repetido si no existe."""
+    if name in table.column_names:
+        return table.column(name).to_numpy(zero_copy_only=False)
+    if default is None:
+        raise ValueError(f"Falta la columna '{name}' en el archivo de entrada.")
+    return np.full(table.num_rows, default)
+
+
+def _ids(table, name):
+    if name in table.column_names:
+        return table.column(name).to_numpy(zero_copy_only=False)
+    return np.arange(1, table.num_rows + 1)
+
+
+# --- Trabajo de cada lote (funciones de módulo para poder enviarlas a otros procesos) ---
+# Cada una genera los bloques de resultados del lote, sin reunirlos.
+
+def amortize_shard(ids, principals, rates, terms, frequencies, full_schedule, rounding=None, system="Francés",
+                   step_up_rates=0.0):
+    if full_schedule:
+        yield from iter_schedule_chunks(principals, rates, terms, frequencies, loan_ids=ids, chunk_rows=CHUNK_ROWS,
+                                        rounding=rounding, system=system, step_up_rates=step_up_rates)
+        return
+    if rounding is not None:
+        portfolio = cents_portfolio_payments(principals, rates, terms, frequencies, rounding)
+        yield {
+            "Préstamo": ids,
+            "Cuota": portfolio["payments"].astype(np.float64) / 100,
+            "Número de Pagos": portfolio["num_payments"],
+            "Tasa Periódica (%)": portfolio["rate_units"] / (RATE_SCALE // 100) / portfolio["periods_per_year"],
+        }
+        return
+    portfolio = portfolio_payments(principals, rates, terms, frequencies, system, step_up_rates)
+    yield {
+        "Préstamo": ids,
+        "Cuota": portfolio["payments"],
+        "Número de Pagos": portfolio["num_payments"],
+        "Tasa Periódica (%)": portfolio["periodic_interest_rates"] * 100,
+    }
+
+
+def amortize_variable_shard(ids, principals, spreads, terms, frequencies, full_schedule, curve_months, curve_rates):
+    if full_schedule:
+        yield from iter_variable_rate_chunks(principals, spreads, terms, frequencies, curve_months, curve_rates,
+                                             loan_ids=ids, chunk_rows=CHUNK_ROWS)
+        return
+    portfolio = variable_rate_payments(principals, spreads, terms, frequencies, curve_months, curve_rates)
+    yield {
+        "Préstamo": ids,
+        "Cuota Inicial": portfolio["payments"],
+        "Número de Pagos": portfolio["num_payments"],
+        "Tasa Anual Inicial (%)": portfolio["initial_rates"],
+    }
+
+
+def amortize_dated_shard(ids, principals, rates, terms, frequencies, start_dates, day_count, business_day,
+                         holidays):
+    yield from iter_dated_schedule_chunks(principals, rates, terms, frequencies, start_dates, day_count,
+                                          business_day, holidays, loan_ids=ids, chunk_rows=CHUNK_ROWS)
+
+
+def irr_shard(ids, cash_flows, discount_rate):
+    yield evaluation_arrays(cash_flows, discount_rate / 100, ids)
+
+
+def compound_shard(ids, initial, contributions, rates, years, compounding, contribution_frequencies):
+    final_value = np.empty(ids.size)
+    total_invested = np.empty(ids.size)
+    for row in range(ids.size):
+        _, summary = compound_interest_arrays(
+            float(initial[row]), float(contributions[row]), float(rates[row]), int(years[row]),
+            str(compounding[row]), str(contribution_frequencies[row])
+        )
+        final_value[row] = summary["final_value"]
+        total_invested[row] = summary["total_invested"]
+    yield {
+        "Inversión": ids,
+        "Valor Final": final_value,
+        "Capital Aportado": total_invested,
+        "Intereses Ganados": final_value - total_invested,
+    }
+
+
+def convert_shard(ids, rates, frequencies, conversion):
+    yield {
+        "Tasa": ids,
+        "Tasa Original (%)": rates,
+        "Frecuencia": frequencies,
+        "Tasa Convertida (%)": CONVERSIONS[conversion](rates / 100, frequencies) * 100,
+    }
+
+
+def solve_shard(ids, frequencies, quotes, unknown):
+    yield solve_quotes(unknown, quotes, frequencies, ids)
+
+
+def _shard_to_file(path, function, *arguments):
+    """Vuelca los bloques de un lote a un archivo Arrow a medida que se generan (en el proceso del pool)."""
+    write_ipc(function(*arguments), path)
+    return path
+
+
+def _file_chunks(path):
+    """Bloques de un archivo de ``_shard_to_file``, leídos de a uno; luego borra el archivo."""
+    import pyarrow as pa
+
+    try:
+        if not os.path.exists(path):
+            return
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                yield from arrow_chunks(pa.Table.from_batches([batch]), batch.num_rows)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def run_shards(function, shards, workers):
+    """Aplica ``function`` a cada lote y genera sus bloques de resultados en orden.
+
+    Sin pool los bloques pasan directo al escritor. Con ``workers > 1`` los
+    lotes se reparten en un pool de procesos y cada uno escribe sus bloques
+    en un archivo temporal; se envían como mucho ``2 * workers`` lotes a la
+    vez y cada archivo se lee en el orden de entrada en cuanto su lote
+    termina, de modo que el escritor puede ir volcándolo a la salida.
+    """
+    if workers <= 1 or len(shards) <= 1:
+        for shard in shards:
+            yield from function(*shard)
+        return
+    workers = min(workers, len(shards))
+    with tempfile.TemporaryDirectory(prefix="finanzas-") as folder, ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        queued = iter(enumerate(shards))
+        try:
+            for index, shard in queued:
+                pending.append(pool.submit(_shard_to_file, os.path.join(folder, f"{index}.arrow"), function, *shard))
+                if len(pending) == 2 * workers:
+                    break
+            while pending:
+                path = pending.popleft().result()
+                # Se envía el lote siguiente antes de leer este, para que el pool no quede esperando
+                for index, shard in queued:
+                    pending.append(pool.submit(_shard_to_file, os.path.join(folder, f"{index}.arrow"), function,
+                                               *shard))
+                    break
+                yield from _file_chunks(path)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _slices(size, batch_size):
+    return [slice(start, start + batch_size) for start in range(0, size, batch_size)]
+
+
+# --- Subcomandos: cada uno devuelve (filas de entrada, función, lotes) ---
+
+def amortize_command(args):
+    if args.redondeo and args.sistema != "Francés":
+        raise ValueError("El redondeo al centavo solo está disponible para el sistema francés.")
+    if args.curva:
+        return amortize_variable_command(args)
+    if args.base:
+        return amortize_dated_command(args)
+    table = read_table(args.entrada)
+    ids = _ids(table, "id")
+    columns = (
+        ids,
+        _column(table, "capital").astype(np.float64),
+        _column(table, "tasa_anual").astype(np.float64),
+        _column(table, "plazo_meses").astype(np.float64),
+        _column(table, "frecuencia", "Mensual").astype(str),
+    )
+    step_up_rates = _column(table, "incremento_anual", args.incremento).astype(np.float64)
+    shards = [tuple(column[part] for column in columns) + (args.tabla, args.redondeo, args.sistema, step_up_rates[part])
+              for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, amortize_shard, shards
+
+
+def amortize_variable_command(args):
+    if args.redondeo or args.sistema != "Francés":
+        raise ValueError("La tasa variable solo está disponible para el sistema francés sin redondeo al centavo.")
+    curve = read_table(args.curva)
+    # La curva se valida antes de repartir los lotes (los meses no enteros o vacíos son un error)
+    curve_months, curve_rates = index_curve(_column(curve, "mes"), _column(curve, "tasa"))
+    table = read_table(args.entrada)
+    columns = (
+        _ids(table, "id"),
+        _column(table, "capital").astype(np.float64),
+        _column(table, "margen", 0.0).astype(np.float64),
+        _column(table, "plazo_meses").astype(np.float64),
+        _column(table, "frecuencia", "Mensual").astype(str),
+    )
+    shards = [tuple(column[part] for column in columns) + (args.tabla, curve_months, curve_rates)
+              for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, amortize_variable_shard, shards
+
+
+def amortize_dated_command(args):
+    if args.redondeo or args.sistema != "Francés" or not args.tabla:
+        raise ValueError("Las fechas de pago requieren --tabla y el sistema francés sin redondeo al centavo.")
+    holidays = ()
+    if args.feriados:
+        holidays = tuple(_column(read_table(args.feriados), "fecha").astype("datetime64[D]"))
+    table = read_table(args.entrada)
+    columns = (
+        _ids(table, "id"),
+        _column(table, "capital").astype(np.float64),
+        _column(table, "tasa_anual").astype(np.float64),
+        _column(table, "plazo_meses").astype(np.float64),
+        _column(table, "frecuencia", "Mensual").astype(str),
+        _column(table, "fecha_desembolso").astype("datetime64[D]"),
+    )
+    shards = [tuple(column[part] for column in columns) + (args.base, args.ajuste, holidays)
+              for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, amortize_dated_shard, shards
+
+
+def irr_command(args):
+    ids, cash_flows = cash_flows_from_table(read_table(args.entrada))
+    shards = [(ids[part], cash_flows[part], args.tasa_descuento) for part in _slices(len(ids), args.lote)]
+    return len(ids), irr_shard, shards
+
+
+def compound_command(args):
+    table = read_table(args.entrada)
+    columns = (
+        _ids(table, "id"),
+        _column(table, "inversion_inicial").astype(np.float64),
+        _column(table, "aporte_anual", 0.0).astype(np.float64),
+        _column(table, "tasa_anual").astype(np.float64),
+        _column(table, "plazo_anios").astype(np.int64),
+        _column(table, "frecuencia_capitalizacion", "Mensual").astype(str),
+        _column(table, "frecuencia_aporte", "Mensual").astype(str),
+    )
+    shards = [tuple(column[part] for column in columns) for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, compound_shard, shards
+
+
+def convert_command(args):
+    table = read_table(args.entrada)
+    columns = (
+        _ids(table, "id"),
+        _column(table, "tasa").astype(np.float64),
+        _column(table, "frecuencia", args.frecuencia).astype(str),
+    )
+    shards = [tuple(column[part] for column in columns) + (args.conversion,)
+              for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, convert_shard, shards
+
+
+def solve_command(args):
+    fields, _ = SOLVERS[args.incognita]
+    table = read_table(args.entrada)
+    ids = _ids(table, "id")
+    frequencies = _column(table, "frecuencia", "Mensual").astype(str)
+    quotes = {field: _column(table, field).astype(np.float64) for field in fields}
+    shards = [(ids[part], frequencies[part], {field: values[part] for field, values in quotes.items()},
+               args.incognita)
+              for part in _slices(table.num_rows, args.lote)]
+    return table.num_rows, solve_shard, shards
+
+
+def _positive_int(text):
+    """Tipo de argparse para enteros mayores que cero."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un número entero: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m finanzas", description="Calculadora financiera por lotes.")
+    subcommands = parser.add_subparsers(dest="comando", required=True)
+
+    def add(name, command, help_text):
+        sub = subcommands.add_parser(name, help=help_text, description=help_text)
+        sub.add_argument("entrada", help="Archivo CSV o Parquet de entrada.")
+        sub.add_argument("salida", help="Archivo de salida (.csv, .parquet, .arrow o .xlsx).")
+        sub.add_argument("--procesos", type=_positive_int, default=os.cpu_count() or 1,
+                         help="Procesos del pool (por defecto, uno por núcleo).")
+        sub.add_argument("--lote", type=_positive_int, default=10_000, help="Filas de entrada por lote.")
+        sub.set_defaults(command=command)
+        return sub
+
+    amortize = add("amortize", amortize_command,
+                   "Cuota fija de cada préstamo (columnas capital, tasa_anual, plazo_meses y frecuencia).")
+    amortize.add_argument("--tabla", action="store_true", help="Escribir la tabla de amortización completa.")
+    amortize.add_argument("--redondeo", choices=list(ROUNDING_MODES),
+                          help="Calcular en centavos exactos con este redondeo por período (sistema francés).")
+    amortize.add_argument("--sistema", choices=list(AMORTIZATION_SYSTEMS), default="Francés",
+                          help="Sistema de amortización de todos los préstamos.")
+    amortize.add_argument("--incremento", type=float, default=0.0,
+                          help="Incremento anual (%%) de la cuota en el sistema escalonado, si el archivo no trae "
+                               "la columna incremento_anual.")
+    amortize.add_argument("--curva",
+                          help="CSV o Parquet con la curva del índice (columnas mes y tasa, desde el mes 0). La tasa "
+                               "de cada préstamo es el índice más su columna margen y la cuota se recalcula en "
+                               "cada ajuste.")
+    amortize.add_argument("--base", choices=list(DAY_COUNTS),
+                          help="Tabla con fechas de pago reales (columna fecha_desembolso) e intereses según esta "
+                               "base de conteo de días. Requiere --tabla.")
+    amortize.add_argument("--ajuste", choices=list(BUSINESS_DAY_CONVENTIONS), default="Sin ajuste",
+                          help="Ajuste de las fechas de pago que caen en día no hábil (con --base).")
+    amortize.add_argument("--feriados", help="CSV o Parquet con los feriados (columna fecha), con --base.")
+
+    irr = add("irr", irr_command, "TIR y VAN de cada proyecto (formato ancho o largo, como en la página TIR).")
+    irr.add_argument("--tasa-descuento", type=float, default=10.0, help="Tasa de descuento anual (%%) para el VAN.")
+
+    add("compound", compound_command,
+        "Valor final de cada inversión (columnas inversion_inicial, aporte_anual, tasa_anual, plazo_anios, "
+        "frecuencia_capitalizacion y frecuencia_aporte).")
+
+    convert = add("convert", convert_command, "Conversión de tasas (columnas tasa y frecuencia).")
+    convert.add_argument("--conversion", choices=list(CONVERSIONS), required=True)
+    convert.add_argument("--frecuencia", default="Mensual",
+                         help="Frecuencia cuando el archivo no tiene columna 'frecuencia'.")
+
+    solve = add("solve", solve_command,
+                "Despeja capital, plazo o tasa a partir de la cuota (columnas cuota, frecuencia y las dos que "
+                "correspondan entre capital, tasa_anual y plazo_meses).")
+    solve.add_argument("--incognita", choices=list(SOLVERS), required=True, help="Dato a calcular.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    extension = os.path.splitext(args.salida)[1].lower()
+    if extension not in WRITERS:
+        print(f"Formato de salida no soportado: {extension or args.salida}. Usa .csv, .parquet, .arrow o .xlsx.",
+              file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        rows_in, function, shards = args.command(args)
+        rows_out = WRITERS[extension](run_shards(function, shards, args.procesos), args.salida)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    # Cualquier otro fallo (también dentro de un proceso del pool) se informa igual, sin traza
+    except Exception as e:
+        print(f"Error inesperado ({type(e).__name__}): {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{args.comando}: {rows_in:,} filas de entrada -> {rows_out:,} filas en {args.salida} "
+        f"en {elapsed:.2f} s ({rows_in / elapsed:,.0f} filas/s, {len(shards)} lotes, {args.procesos} procesos)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
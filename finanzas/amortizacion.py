@@ -0,0 +1,454 @@
+"""Motor de amortización sobre arreglos NumPy (sistemas francés, alemán, americano y escalonado)."""
+import numpy as np
+
+from finanzas.tasas import PERIODS_PER_YEAR, frequency_lookup
+
+# Meses que cubre cada período según la frecuencia de pago
+PAYMENT_FREQUENCIES = {
+    name: 12 // PERIODS_PER_YEAR[name]
+    for name in ("Mensual", "Bimestral", "Trimestral", "Semestral", "Anual")
+}
+
+SCHEDULE_COLUMNS = [
+    "Período",
+    "Capital Inicial del Período",
+    "Cuota",
+    "Intereses",
+    "Capital Amortizado",
+    "Capital Pendiente",
+]
+
+
+def payment_terms(annual_interest_rate, loan_term_months, payment_frequency):
+    """Devuelve el número de pagos y la tasa periódica para una frecuencia de pago."""
+    months_per_period = PAYMENT_FREQUENCIES[payment_frequency]
+    num_payments = int(np.ceil(loan_term_months / months_per_period))
+    periodic_interest_rate = (annual_interest_rate / 100) / (12 / months_per_period)
+    return num_payments, periodic_interest_rate
+
+
+def fixed_payment(principal, periodic_interest_rate, num_payments):
+    """Cuota fija del sistema francés."""
+    return float(fixed_payments([principal], [periodic_interest_rate], [num_payments])[0])
+
+
+def fixed_payments(principals, periodic_interest_rates, num_payments):
+    """Cuota fija del sistema francés para arreglos de préstamos."""
+    principals = np.asarray(principals, dtype=np.float64)
+    periodic_interest_rates = np.asarray(periodic_interest_rates, dtype=np.float64)
+    num_payments = np.asarray(num_payments, dtype=np.int64)
+
+    if (num_payments <= 0).any():
+        raise ValueError("El número de pagos debe ser al menos 1. Ajusta el plazo o la frecuencia.")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominators = 1 - (1 + periodic_interest_rates) ** (-num_payments)
+        payments = np.where(
+            periodic_interest_rates == 0,
+            principals / num_payments,
+            (principals * periodic_interest_rates) / denominators,
+        )
+    if not np.isfinite(payments).all():
+        raise ValueError("Error en el cálculo de la cuota fija. La tasa de interés o el plazo pueden ser inválidos.")
+    return payments
+
+
+def _settle(periods, num_payments, opening, interest, payments, closing):
+    """Completa las columnas de una tabla: el último pago de cada préstamo cancela el saldo."""
+    payments = np.array(np.broadcast_to(payments, opening.shape))
+    amortized = payments - interest
+
+    # El último pago de cada préstamo cancela exactamente el capital pendiente
+    last = periods == num_payments
+    amortized[last] = opening[last]
+    payments[last] = opening[last] + interest[last]
+    closing[last] = 0.0
+
+    return {
+        "Período": periods,
+        "Capital Inicial del Período": opening,
+        "Cuota": payments,
+        "Intereses": interest,
+        "Capital Amortizado": amortized,
+        "Capital Pendiente": closing,
+        "mask": periods <= num_payments,
+    }
+
+
+def _loan_columns(principals, periodic_interest_rates, num_payments):
+    principals = np.asarray(principals, dtype=np.float64)[:, None]
+    rates = np.asarray(periodic_interest_rates, dtype=np.float64)[:, None]
+    num_payments = np.asarray(num_payments, dtype=np.int64)[:, None]
+    periods = np.arange(1, int(num_payments.max()) + 1)
+    return principals, rates, num_payments, periods
+
+
+def schedule_matrix(principals, periodic_interest_rates, num_payments, payment_amounts):
+    """Calcula las tablas de varios préstamos a la vez, una fila por préstamo.
+
+    ``payment_amounts`` es la cuota fija de cada préstamo (``fixed_payments``).
+    El saldo tras ``k`` pagos es el valor presente de las cuotas que faltan,
+    ``A(1 - (1+r)^-(n-k))/r``, así que todas las columnas se obtienen sin
+    recorrer los períodos uno a uno. La forma equivalente
+    ``P(1+r)^k - A((1+r)^k - 1)/r`` resta dos números enormes con tasas altas
+    y plazos largos; esta no. Las matrices tienen tantas columnas como el plazo
+    más largo; ``mask`` marca los períodos que existen para cada préstamo. El
+    último período liquida el saldo remanente, igual que la tabla original.
+    """
+    principals, rates, num_payments, periods = _loan_columns(principals, periodic_interest_rates, num_payments)
+    payment_amounts = np.asarray(payment_amounts, dtype=np.float64)[:, None]
+
+    # Pagos que faltan tras cada período (0 en los períodos que no existen)
+    remaining = np.maximum(num_payments - periods, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        closing = payment_amounts * np.where(
+            rates == 0,
+            remaining,
+            -np.expm1(-remaining * np.log1p(rates)) / rates,
+        )
+
+    opening = np.empty_like(closing)
+    opening[:, 0] = principals[:, 0]
+    opening[:, 1:] = closing[:, :-1]
+    return _settle(periods, num_payments, opening, opening * rates, payment_amounts, closing)
+
+
+# --- Sistemas de amortización ---
+# Cada sistema aporta dos funciones sobre arreglos de préstamos, con la misma firma:
+#   payments(principals, rates, num_payments, step_periods, step_up_rates) -> primera cuota
+#   matrix(principals, rates, num_payments, payments, step_periods, step_up_rates) -> columnas de la tabla
+# ``step_periods`` (pagos por año) y ``step_up_rates`` (decimales) solo los usa el sistema escalonado.
+
+def _french_payments(principals, rates, num_payments, step_periods, step_up_rates):
+    return fixed_payments(principals, rates, num_payments)
+
+
+def _french_matrix(principals, rates, num_payments, payments, step_periods, step_up_rates):
+    return schedule_matrix(principals, rates, num_payments, payments)
+
+
+def _german_payments(principals, rates, num_payments, step_periods, step_up_rates):
+    fixed_payments(principals, rates, num_payments)  # valida el plazo
+    principals = np.asarray(principals, dtype=np.float64)
+    return principals / num_payments + principals * rates
+
+
+def _german_matrix(principals, rates, num_payments, payments, step_periods, step_up_rates):
+    """Sistema alemán: amortización constante ``P/n`` e intereses sobre el saldo."""
+    principals, rates, num_payments, periods = _loan_columns(principals, rates, num_payments)
+    amortization = principals / num_payments
+    # Saldos como fracción del capital (``(n - k) / n``) para no acumular el error de restar ``P/n``
+    opening = principals * (num_payments - periods + 1) / num_payments
+    interest = opening * rates
+    return _settle(periods, num_payments, opening, interest, amortization + interest,
+                   principals * (num_payments - periods) / num_payments)
+
+
+def _bullet_payments(principals, rates, num_payments, step_periods, step_up_rates):
+    fixed_payments(principals, rates, num_payments)  # valida el plazo
+    principals = np.asarray(principals, dtype=np.float64)
+    # Con un solo pago la primera cuota ya incluye la devolución del capital
+    return principals * rates + np.where(np.asarray(num_payments) == 1, principals, 0.0)
+
+
+def _bullet_matrix(principals, rates, num_payments, payments, step_periods, step_up_rates):
+    """Sistema americano: solo intereses en cada período y el capital completo al final."""
+    principals, rates, num_payments, periods = _loan_columns(principals, rates, num_payments)
+    opening = np.repeat(principals, periods.size, axis=1)
+    interest = opening * rates
+    return _settle(periods, num_payments, opening, interest, interest, opening.copy())
+
+
+def _step_up_discounted(rates, periods, step_periods, step_up_rates):
+    """Suma de ``s_i v^i`` para ``i = 1..k`` con cuotas que suben ``g`` cada ``m`` pagos.
+
+    Con ``v = 1/(1+r)`` cada tramo completo de ``m`` pagos aporta
+    ``a(1+g)^j v^(jm)``, donde ``a`` es la anualidad de ``m`` pagos; los tramos
+    forman una serie geométrica de razón ``q = (1+g)v^m`` y el tramo
+    incompleto se suma aparte.
+    """
+    discount = 1 / (1 + rates)
+
+    def annuity(count):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(rates == 0, count, (1 - discount ** count) / rates)
+
+    blocks, remainder = np.divmod(periods, step_periods)
+    ratio = (1 + step_up_rates) * discount ** step_periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = np.where(np.isclose(ratio, 1.0, rtol=0, atol=1e-12), blocks, (1 - ratio ** blocks) / (1 - ratio))
+    return annuity(step_periods) * series + ratio ** blocks * annuity(remainder)
+
+
+def _step_up_payments(principals, rates, num_payments, step_periods, step_up_rates):
+    fixed_payments(principals, rates, num_payments)  # valida el plazo
+    principals = np.asarray(principals, dtype=np.float64)
+    rates = np.asarray(rates, dtype=np.float64)
+    return principals / _step_up_discounted(rates, np.asarray(num_payments), np.asarray(step_periods),
+                                            np.asarray(step_up_rates, dtype=np.float64))
+
+
+def _step_up_matrix(principals, rates, num_payments, payments, step_periods, step_up_rates):
+    """Sistema escalonado: la cuota sube ``step_up_rates`` cada ``step_periods`` pagos (una vez al año).
+
+    El saldo tras ``k`` pagos es el valor presente de las cuotas que faltan:
+    las que quedan en el escalón actual (una anualidad) y, desde el escalón
+    siguiente, una serie escalonada como la de ``_step_up_discounted``, así
+    que tampoco hace falta recorrer los períodos. Como en ``schedule_matrix``,
+    se evita la forma ``(1+r)^k (P - A_1 S_k)``, que pierde precisión con
+    tasas altas y plazos largos.
+    """
+    principals, rates, num_payments, periods = _loan_columns(principals, rates, num_payments)
+    first = np.asarray(payments, dtype=np.float64)[:, None]
+    step_periods = np.asarray(step_periods, dtype=np.int64)[:, None]
+    step_up_rates = np.asarray(step_up_rates, dtype=np.float64)[:, None]
+
+    remaining = np.maximum(num_payments - periods, 0)
+    # Pagos que faltan al nivel de la cuota siguiente y valor de esa cuota
+    current = np.minimum(step_periods - periods % step_periods, remaining)
+    level = first * (1 + step_up_rates) ** (periods // step_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        current_annuity = np.where(rates == 0, current, -np.expm1(-current * np.log1p(rates)) / rates)
+    later = _step_up_discounted(rates, remaining - current, step_periods, step_up_rates)
+    closing = level * (current_annuity + (1 + step_up_rates) * (1 + rates) ** -current * later)
+    opening = np.empty_like(closing)
+    opening[:, 0] = principals[:, 0]
+    opening[:, 1:] = closing[:, :-1]
+    payment_amounts = first * (1 + step_up_rates) ** ((periods - 1) // step_periods)
+    return _settle(periods, num_payments, opening, opening * rates, payment_amounts, closing)
+
+
+AMORTIZATION_SYSTEMS = {
+    "Francés": (_french_payments, _french_matrix),
+    "Alemán": (_german_payments, _german_matrix),
+    "Americano": (_bullet_payments, _bullet_matrix),
+    "Escalonado": (_step_up_payments, _step_up_matrix),
+}
+
+
+def _system(name):
+    if name not in AMORTIZATION_SYSTEMS:
+        raise ValueError(f"Sistema de amortización desconocido: {name}")
+    return AMORTIZATION_SYSTEMS[name]
+
+
+def schedule_arrays(principal, periodic_interest_rate, num_payments, payment_amount, system="Francés",
+                    step_periods=12, step_up_rate=0.0):
+    """Tabla de un solo préstamo como arreglos 1-D (ver ``schedule_matrix``)."""
+    _, matrix_function = _system(system)
+    matrix = matrix_function([principal], [periodic_interest_rate], [num_payments], [payment_amount],
+                             [step_periods], [step_up_rate])
+    arrays = {col: matrix[col][0] for col in SCHEDULE_COLUMNS[1:]}
+    arrays["Período"] = matrix["Período"]
+    return arrays
+
+
+def amortization_schedule(principal, annual_interest_rate, loan_term_months, payment_frequency, rounding=None,
+                          system="Francés", step_up_rate=0.0):
+    """Devuelve la primera cuota y la tabla de amortización con columnas numéricas.
+
+    ``system`` es uno de ``AMORTIZATION_SYSTEMS``; en el escalonado la cuota
+    sube ``step_up_rate`` % cada año. Con ``rounding`` (un nombre de
+    ``centavos.ROUNDING_MODES``) la tabla del sistema francés se calcula en
+    centavos exactos con ese redondeo por período.
+    """
+    import pandas as pd
+
+    if rounding is not None:
+        if system != "Francés":
+            raise ValueError("El redondeo al centavo solo está disponible para el sistema francés.")
+        from finanzas.centavos import amortization_schedule_cents
+
+        return amortization_schedule_cents(principal, annual_interest_rate, loan_term_months, payment_frequency,
+                                           rounding)
+
+    terms = portfolio_payments(principal, annual_interest_rate, loan_term_months, payment_frequency, system,
+                               step_up_rate)
+    matrix = _schedule_block(terms, slice(None), None)
+    arrays = {col: matrix[col][0] for col in SCHEDULE_COLUMNS[1:]}
+    arrays["Período"] = matrix["Período"]
+    return float(terms["payments"][0]), pd.DataFrame(arrays, columns=SCHEDULE_COLUMNS)
+
+
+# --- Cartera de préstamos (procesamiento por lotes) ---
+
+def _months_per_period(payment_frequencies, size):
+    """Traduce frecuencias (un nombre o un arreglo de nombres) a meses por período."""
+    months = np.asarray(frequency_lookup(payment_frequencies, PAYMENT_FREQUENCIES), dtype=np.int64)
+    if months.ndim == 0:
+        return np.full(size, months)
+    return months.reshape(-1)
+
+
+def portfolio_payments(principals, annual_interest_rates, loan_terms_months, payment_frequencies="Mensual",
+                       system="Francés", step_up_rates=0.0):
+    """Primera cuota de cada préstamo de una cartera, en columnas.
+
+    Acepta arreglos del mismo largo (o escalares) y usa la misma tabla de
+    frecuencias que la página, por lo que cada cuota coincide con la que
+    mostraría la calculadora para ese préstamo. ``step_up_rates`` (en
+    porcentaje anual) solo aplica al sistema escalonado.
+    """
+    payments_function, _ = _system(system)
+    principals = np.atleast_1d(np.asarray(principals, dtype=np.float64))
+    annual_interest_rates = np.atleast_1d(np.asarray(annual_interest_rates, dtype=np.float64))
+    loan_terms_months = np.atleast_1d(np.asarray(loan_terms_months, dtype=np.float64))
+    principals, annual_interest_rates, loan_terms_months = np.broadcast_arrays(
+        principals, annual_interest_rates, loan_terms_months
+    )
+
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period).astype(np.int64)
+    periodic_interest_rates = (annual_interest_rates / 100) / (12 / months_per_period)
+    # El escalonado sube la cuota una vez al año, es decir, cada ``12 / meses`` pagos
+    step_periods = 12 // months_per_period
+    step_up_rates = np.broadcast_to(np.asarray(step_up_rates, dtype=np.float64) / 100, principals.shape)
+    payments = payments_function(principals, periodic_interest_rates, num_payments, step_periods, step_up_rates)
+
+    return {
+        "system": system,
+        "principals": principals,
+        "num_payments": num_payments,
+        "months_per_period": months_per_period,
+        "periodic_interest_rates": periodic_interest_rates,
+        "step_periods": step_periods,
+        "step_up_rates": step_up_rates,
+        "payments": payments,
+    }
+
+
+def portfolio_cash_flows(principals, annual_interest_rates, loan_terms_months, payment_frequencies="Mensual",
+                         max_cells=2_000_000, system="Francés", step_up_rates=0.0):
+    """Cuotas por préstamo y flujo de caja agregado de toda la cartera por mes.
+
+    Los préstamos se agrupan por frecuencia, se ordenan por número de pagos y
+    se procesan en bloques de a lo sumo ``max_cells`` celdas (préstamos x
+    períodos), de modo que la memoria no depende del tamaño de la cartera y
+    casi no se calculan períodos de relleno. Como cada préstamo puede pagar
+    con distinta frecuencia, el flujo se agrega por mes transcurrido: el pago
+    ``k`` de un préstamo trimestral cae en el mes ``3k``.
+    """
+    import pandas as pd
+
+    terms = portfolio_payments(principals, annual_interest_rates, loan_terms_months, payment_frequencies, system,
+                               step_up_rates)
+    num_payments = terms["num_payments"]
+    months_per_period = terms["months_per_period"]
+
+    horizon = int((num_payments * months_per_period).max())
+    totals = {col: np.zeros(horizon + 1) for col in SCHEDULE_COLUMNS[2:5]}
+
+    order = np.lexsort((num_payments, months_per_period))
+    group_starts = np.flatnonzero(np.diff(months_per_period[order], prepend=-1))
+    for group in np.split(order, group_starts[1:]):
+        step = int(months_per_period[group[0]])
+        start = 0
+        while start < group.size:
+            # Como el grupo está ordenado, el plazo más largo del bloque es el último
+            rows = max(1, max_cells // int(num_payments[group[start]]))
+            while rows > 1 and rows * num_payments[group[min(start + rows, group.size) - 1]] > max_cells:
+                rows //= 2
+            block = group[start:start + rows]
+            start += rows
+
+            matrix = _schedule_block(terms, block, None)
+            mask = matrix["mask"]
+            months = matrix["Período"] * step
+            for col in totals:
+                totals[col][months] += np.where(mask, matrix[col], 0.0).sum(axis=0)
+
+    cash_flows = pd.DataFrame({"Mes": np.arange(1, horizon + 1)})
+    for col, values in totals.items():
+        cash_flows[col] = values[1:]
+    return terms["payments"], cash_flows
+
+
+def _schedule_block(terms, block, rounding):
+    """Tabla de un bloque de préstamos de la cartera, en punto flotante o en centavos exactos."""
+    if rounding is None:
+        _, matrix_function = _system(terms["system"])
+        return matrix_function(
+            terms["principals"][block],
+            terms["periodic_interest_rates"][block],
+            terms["num_payments"][block],
+            terms["payments"][block],
+            terms["step_periods"][block],
+            terms["step_up_rates"][block],
+        )
+    from finanzas.centavos import cents_schedule_matrix
+
+    matrix = cents_schedule_matrix(
+        terms["principals"][block],
+        terms["rate_units"][block],
+        terms["periods_per_year"][block],
+        terms["num_payments"][block],
+        terms["payments"][block],
+        rounding,
+    )
+    for col in SCHEDULE_COLUMNS[1:]:
+        matrix[col] = matrix[col].astype(np.float64) / 100
+    return matrix
+
+
+def iter_schedule_chunks(principals, annual_interest_rates, loan_terms_months, payment_frequencies="Mensual",
+                         loan_ids=None, chunk_rows=100_000, rounding=None, system="Francés", step_up_rates=0.0):
+    """Genera las tablas de toda una cartera en bloques de ``chunk_rows`` filas.
+
+    Cada bloque es un diccionario de arreglos NumPy con la columna
+    ``Préstamo`` seguida de las columnas de la tabla; las filas conservan el
+    orden de los préstamos y de sus períodos. Solo se mantiene en memoria el
+    bloque en curso, así que los escritores de ``finanzas.exportacion`` pueden
+    volcar millones de filas con memoria constante. ``system`` elige el
+    sistema de amortización y con ``rounding`` las tablas del francés se
+    calculan en centavos exactos (ver ``finanzas.centavos``).
+    """
+    if rounding is None:
+        terms = portfolio_payments(principals, annual_interest_rates, loan_terms_months, payment_frequencies, system,
+                                   step_up_rates)
+    elif system != "Francés":
+        raise ValueError("El redondeo al centavo solo está disponible para el sistema francés.")
+    else:
+        from finanzas.centavos import cents_portfolio_payments
+
+        terms = cents_portfolio_payments(principals, annual_interest_rates, loan_terms_months, payment_frequencies,
+                                         rounding)
+    return _iter_chunks(terms["num_payments"], loan_ids, chunk_rows,
+                        lambda block: _schedule_block(terms, block, rounding), SCHEDULE_COLUMNS)
+
+
+def _iter_chunks(num_payments, loan_ids, chunk_rows, block_matrix, schedule_columns):
+    """Recorre la cartera en bloques de préstamos y reparte sus filas en bloques de ``chunk_rows``.
+
+    ``block_matrix(block)`` devuelve las columnas (préstamos x períodos) y la
+    ``mask`` de los préstamos del bloque, como ``schedule_matrix``.
+    """
+    if loan_ids is None:
+        loan_ids = np.arange(1, num_payments.size + 1)
+    loan_ids = np.asarray(loan_ids)
+
+    columns = ["Préstamo"] + schedule_columns
+    pending = {col: [] for col in columns}
+    pending_rows = 0
+
+    loans_per_block = max(1, chunk_rows // int(num_payments.max()))
+    for start in range(0, num_payments.size, loans_per_block):
+        block = slice(start, start + loans_per_block)
+        matrix = block_matrix(block)
+        mask = matrix["mask"]
+        pending["Préstamo"].append(np.repeat(loan_ids[block], num_payments[block]))
+        pending["Período"].append(np.broadcast_to(matrix["Período"], mask.shape)[mask])
+        for col in schedule_columns[1:]:
+            pending[col].append(matrix[col][mask])
+        pending_rows += int(mask.sum())
+
+        if pending_rows >= chunk_rows:
+            merged = {col: np.concatenate(parts) for col, parts in pending.items()}
+            emitted = 0
+            while pending_rows - emitted >= chunk_rows:
+                yield {col: values[emitted:emitted + chunk_rows] for col, values in merged.items()}
+                emitted += chunk_rows
+            pending = {col: [values[emitted:]] for col, values in merged.items()}
+            pending_rows -= emitted
+
+    if pending_rows:
+        yield {col: np.concatenate(parts) for col, parts in pending.items()}
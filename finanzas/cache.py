@@ -0,0 +1,346 @@
+"""Caché de resultados compartida por todo el proceso (todas las sesiones).
+
+``memoize`` envuelve una función pura con una caché LRU que además expira
+entradas por antigüedad (``ttl``) y acota la memoria (``max_bytes``). La
+clave son los argumentos normalizados: ``50000``, ``50000.0`` y
+``np.float64(50000)`` son la misma entrada, y da igual si se pasan por
+posición o por nombre; los textos se comparan tal cual. Cada caché se
+registra en ``CACHES`` con contadores de aciertos y fallos para la vista de
+administración (``pages/ADMIN_CACHE.py``, habilitada solo con la variable de
+entorno ``FINANZAS_ADMIN=1``).
+
+Los resultados en caché se comparten entre llamadas: quien los reciba no
+debe modificarlos. Si varias sesiones piden a la vez una misma clave que no
+está en caché, solo la primera la calcula y las demás esperan su resultado.
+
+Opcionalmente los resultados también se guardan en disco (``DiskStore``, un
+archivo SQLite local) para sobrevivir a reinicios: si la variable de entorno
+``FINANZAS_CACHE_PATH`` apunta a un archivo, al importar el módulo se abre el
+almacén y se precargan en memoria las entradas usadas más recientemente.
+``FINANZAS_CACHE_MAX_MB`` acota su tamaño (512 MB por defecto). Los valores
+se guardan con ``pickle``; el archivo debe ser local y solo escribible por la
+aplicación.
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import update_wrapper
+from numbers import Number
+
+import numpy as np
+
+from finanzas import amortizacion, calendario, exportacion, interes_compuesto, tasa_variable, tir
+
+# Cachés registradas, por nombre
+CACHES = {}
+
+# Almacén en disco activo (ver ``configure_disk_store``)
+_disk_store = None
+
+
+def normalize(value):
+    """Convierte un argumento en una parte de clave hashable y canónica."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (bool, type(None))):
+        return value
+    if isinstance(value, Number):
+        return float(value)
+    if isinstance(value, str):
+        # Sin limpiar espacios: la caché no debe aceptar lo que la función rechaza
+        return value
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "O":
+            # Los bytes de un arreglo de objetos son punteros, no valores
+            return ("ndarray", value.dtype.str, value.shape, normalize(value.tolist()))
+        return ("ndarray", value.dtype.str, value.shape, value.tobytes())
+    if hasattr(value, "columns") and hasattr(value, "memory_usage"):
+        import pandas as pd
+
+        digest = hashlib.sha256(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        return ("DataFrame", tuple(map(str, value.columns)), tuple(map(str, value.dtypes)), digest.hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize(item)) for key, item in value.items()))
+    return value
+
+
+def estimate_size(value):
+    """Bytes aproximados de un resultado (DataFrames, arreglos y contenedores)."""
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class DiskStore:
+    """Resultados persistentes en un archivo SQLite, con desalojo LRU por tamaño.
+
+    Cada fila guarda el nombre de la caché, la clave normalizada y el valor
+    serializado, identificados por un hash de ambos. El modo WAL permite que
+    varios procesos de la aplicación compartan el mismo archivo.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " hash TEXT PRIMARY KEY, cache TEXT NOT NULL, clave BLOB NOT NULL, valor BLOB NOT NULL,"
+            " bytes INTEGER NOT NULL, ultimo_uso REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS resultados_uso ON resultados (ultimo_uso)")
+        self._connection.commit()
+
+    @staticmethod
+    def _hash(name, key):
+        return hashlib.sha256(pickle.dumps((name, key), protocol=4)).hexdigest()
+
+    def get(self, name, key):
+        """Valor guardado para ``(name, key)``; lanza ``KeyError`` si no existe."""
+        digest = self._hash(name, key)
+        with self._lock:
+            row = self._connection.execute("SELECT valor FROM resultados WHERE hash = ?", (digest,)).fetchone()
+            if row is None:
+                raise KeyError(digest)
+            self._connection.execute("UPDATE resultados SET ultimo_uso = ? WHERE hash = ?", (time.time(), digest))
+            self._connection.commit()
+        return pickle.loads(row[0])
+
+    def put(self, name, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?)",
+                (self._hash(name, key), name, pickle.dumps(key, protocol=4), blob, len(blob), time.time()),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM resultados").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for digest, size in self._connection.execute("SELECT hash, bytes FROM resultados ORDER BY ultimo_uso"):
+            victims.append((digest,))
+            freed += size
+            if freed >= excess:
+                break
+        self._connection.executemany("DELETE FROM resultados WHERE hash = ?", victims)
+
+    def recent(self, name, limit):
+        """Las ``limit`` entradas usadas más recientemente de una caché, como ``(clave, valor)``."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT clave, valor FROM resultados WHERE cache = ? ORDER BY ultimo_uso DESC LIMIT ?", (name, limit)
+            ).fetchall()
+        return [(pickle.loads(key), pickle.loads(value)) for key, value in rows]
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM resultados")
+            self._connection.commit()
+
+    def info(self):
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM resultados"
+            ).fetchone()
+        return {"Archivo": self.path, "Entradas": entries, "Memoria (MB)": size / 2**20,
+                "Máx. Memoria (MB)": self.max_bytes / 2**20}
+
+
+class MemoizedFunction:
+    """Función envuelta con caché LRU, expiración y límite de memoria."""
+
+    def __init__(self, function, name, maxsize=256, ttl=3600.0, max_bytes=64 * 1024 * 1024):
+        self.function = function
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._signature = inspect.signature(function)
+        self._entries = OrderedDict()  # clave -> (resultado, bytes, vencimiento)
+        self._pending = {}  # clave -> Future de un cálculo en curso
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = self.misses = self.disk_hits = self.evictions = self.expirations = 0
+        update_wrapper(self, function)
+
+    def key(self, *args, **kwargs):
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple((name, normalize(value)) for name, value in bound.arguments.items())
+
+    def __call__(self, *args, **kwargs):
+        key = self.key(*args, **kwargs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                self._remove(key)
+                self.expirations += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                # Esta llamada calcula la clave; las que lleguen mientras tanto esperan su resultado
+                pending = self._pending[key] = Future()
+                self.misses += 1
+                waiting = False
+            else:
+                self.hits += 1
+                waiting = True
+        if waiting:
+            return pending.result()
+
+        # El cálculo (o la lectura del disco) se hace fuera del candado para no bloquear otras sesiones
+        store = _disk_store
+        try:
+            try:
+                if store is None:
+                    raise KeyError(key)
+                result = store.get(self.name, key)
+                with self._lock:
+                    self.disk_hits += 1
+            except KeyError:
+                result = self.function(*args, **kwargs)
+                if store is not None:
+                    store.put(self.name, key, result)
+            self._insert(key, result)
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+        pending.set_result(result)
+        return result
+
+    def _insert(self, key, result):
+        size = estimate_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def cache_clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = self.expirations = 0
+
+    def warm(self, store):
+        """Precarga en memoria las entradas de esta caché usadas más recientemente en ``store``."""
+        entries = store.recent(self.name, self.maxsize)
+        # Se insertan de la más antigua a la más reciente para respetar el orden LRU
+        for key, value in reversed(entries):
+            self._insert(key, value)
+        return len(entries)
+
+    def cache_info(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "Caché": self.name,
+                "Entradas": len(self._entries),
+                "Máx. Entradas": self.maxsize,
+                "Memoria (MB)": self._bytes / 2**20,
+                "Máx. Memoria (MB)": self.max_bytes / 2**20,
+                "TTL (s)": self.ttl,
+                "Aciertos": self.hits,
+                "Fallos": self.misses,
+                "Tasa de Aciertos (%)": 100 * self.hits / requests if requests else 0.0,
+                "Aciertos en Disco": self.disk_hits,
+                "Desalojos": self.evictions,
+                "Expiradas": self.expirations,
+            }
+
+
+def memoize(name, maxsize=256, ttl=3600.0, max_bytes=64 * 1024 * 1024):
+    """Decorador que registra la función en ``CACHES`` con su caché."""
+    def decorator(function):
+        cached = MemoizedFunction(function, name, maxsize, ttl, max_bytes)
+        CACHES[name] = cached
+        return cached
+    return decorator
+
+
+def cache_stats():
+    """Estadísticas de todas las cachés registradas, una fila por caché."""
+    return [cached.cache_info() for cached in CACHES.values()]
+
+
+def clear_all(disk=False):
+    """Vacía las cachés en memoria y, con ``disk=True``, también el almacén en disco."""
+    for cached in CACHES.values():
+        cached.cache_clear()
+    if disk and _disk_store is not None:
+        _disk_store.clear()
+
+
+def configure_disk_store(path, max_bytes=512 * 1024 * 1024, warm=True):
+    """Activa (o con ``path=None`` desactiva) el almacén en disco.
+
+    Con ``warm=True`` precarga en memoria las entradas recientes de cada caché
+    registrada y devuelve cuántas se cargaron.
+    """
+    global _disk_store
+    _disk_store = DiskStore(path, max_bytes) if path else None
+    if _disk_store is None or not warm:
+        return 0
+    return sum(cached.warm(_disk_store) for cached in CACHES.values())
+
+
+def disk_store_info():
+    """Estado del almacén en disco, o ``None`` si no está activo."""
+    return None if _disk_store is None else _disk_store.info()
+
+
+# --- Cálculos de las páginas con caché ---
+amortization_schedule = memoize("Amortización")(amortizacion.amortization_schedule)
+variable_rate_schedule = memoize("Tasa Variable")(tasa_variable.variable_rate_schedule)
+dated_schedule = memoize("Tabla con Fechas")(calendario.dated_schedule)
+compound_interest_projection = memoize("Interés Compuesto")(interes_compuesto.compound_interest_projection)
+irr = memoize("TIR")(tir.irr)
+export_table = memoize("Exportación", maxsize=64)(exportacion.export_table)
+
+if os.environ.get("FINANZAS_CACHE_PATH"):
+    configure_disk_store(
+        os.environ["FINANZAS_CACHE_PATH"],
+        max_bytes=int(float(os.environ.get("FINANZAS_CACHE_MAX_MB", 512)) * 1024 * 1024),
+    )
@@ -0,0 +1,226 @@
+"""Fechas de pago, días hábiles y convenciones de conteo de días (sistema francés).
+
+Las tablas de ``amortizacion`` trabajan en períodos abstractos; aquí cada
+pago cae en una fecha real. Las fechas nominales se generan sumando meses a
+la fecha de desembolso (el día se recorta al fin de mes cuando no existe),
+se ajustan a días hábiles con ``BUSINESS_DAY_CONVENTIONS`` y el interés de
+cada período se devenga por la fracción de año entre dos pagos según
+``DAY_COUNTS``.
+
+Todo opera sobre arreglos ``datetime64[D]``: las fechas de una cartera
+completa se generan, ajustan y miden en unas pocas operaciones de NumPy, sin
+aritmética de ``datetime`` fila por fila. El calendario de días hábiles
+(fines de semana más feriados) se precalcula una vez por lista de feriados
+con ``np.busdaycalendar`` y queda en caché.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, _iter_chunks, _months_per_period, _settle, fixed_payments
+
+DATED_COLUMNS = SCHEDULE_COLUMNS[:1] + ["Fecha de Pago", "Días", "Fracción de Año"] + SCHEDULE_COLUMNS[1:]
+
+
+# --- Convenciones de conteo de días ---
+
+def _date_parts(dates):
+    """Año, mes (1 a 12) y día de cada fecha, sin pasar por ``datetime``."""
+    months = dates.astype("datetime64[M]")
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    days = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return years, months.astype(np.int64) % 12 + 1, days
+
+
+def _thirty_360(starts, ends):
+    # Base 30/360 (bond basis): el día 31 cuenta como 30
+    start_years, start_months, start_days = _date_parts(starts)
+    end_years, end_months, end_days = _date_parts(ends)
+    start_days = np.minimum(start_days, 30)
+    end_days = np.where((start_days == 30) & (end_days == 31), 30, end_days)
+    days = 360 * (end_years - start_years) + 30 * (end_months - start_months) + (end_days - start_days)
+    return days / 360
+
+
+def _actual_360(starts, ends):
+    return (ends - starts).astype(np.int64) / 360
+
+
+def _actual_365(starts, ends):
+    return (ends - starts).astype(np.int64) / 365
+
+
+# Fracción de año entre dos fechas, por convención
+DAY_COUNTS = {
+    "30/360": _thirty_360,
+    "ACT/360": _actual_360,
+    "ACT/365": _actual_365,
+}
+
+# Ajuste de las fechas que caen en día no hábil (``roll`` de ``np.busday_offset``)
+BUSINESS_DAY_CONVENTIONS = {
+    "Sin ajuste": None,
+    "Día hábil siguiente": "following",
+    "Día hábil siguiente modificado": "modifiedfollowing",
+    "Día hábil anterior": "preceding",
+}
+
+
+def year_fractions(starts, ends, day_count="30/360"):
+    """Fracción de año entre pares de fechas (arreglos ``datetime64``) con la convención indicada."""
+    if day_count not in DAY_COUNTS:
+        raise ValueError(f"Convención de conteo de días desconocida: {day_count}")
+    return DAY_COUNTS[day_count](np.asarray(starts, dtype="datetime64[D]"), np.asarray(ends, dtype="datetime64[D]"))
+
+
+# --- Calendario de días hábiles ---
+
+@lru_cache(maxsize=32)
+def _calendar(holidays):
+    return np.busdaycalendar(weekmask="1111100", holidays=list(holidays))
+
+
+def business_calendar(holidays=()):
+    """Calendario de lunes a viernes sin los feriados indicados, precalculado y en caché."""
+    holidays = np.unique(np.asarray(list(holidays), dtype="datetime64[D]"))
+    return _calendar(tuple(holidays.astype(str)))
+
+
+def adjust_dates(dates, business_day="Sin ajuste", holidays=()):
+    """Mueve a un día hábil las fechas que caen en fin de semana o feriado."""
+    if business_day not in BUSINESS_DAY_CONVENTIONS:
+        raise ValueError(f"Convención de día hábil desconocida: {business_day}")
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    roll = BUSINESS_DAY_CONVENTIONS[business_day]
+    if roll is None:
+        return dates
+    return np.busday_offset(dates, 0, roll=roll, busdaycal=business_calendar(holidays))
+
+
+def payment_dates(start_dates, num_payments, months_per_period):
+    """Fechas nominales de pago de cada préstamo (préstamos x períodos), antes de ajustar.
+
+    El pago ``k`` cae ``k x meses_por_período`` meses después del desembolso,
+    en el mismo día del mes o en el último día si ese mes es más corto.
+    """
+    start_dates = np.atleast_1d(np.asarray(start_dates, dtype="datetime64[D]"))[:, None]
+    months_per_period = np.asarray(months_per_period, dtype=np.int64)[:, None]
+    periods = np.arange(1, int(np.max(num_payments)) + 1)
+
+    start_months = start_dates.astype("datetime64[M]")
+    day_offsets = start_dates - start_months.astype("datetime64[D]")
+    months = start_months + periods * months_per_period
+    month_starts = months.astype("datetime64[D]")
+    month_lengths = (months + 1).astype("datetime64[D]") - month_starts
+    return month_starts + np.minimum(day_offsets, month_lengths - np.timedelta64(1, "D"))
+
+
+# --- Tablas con fechas ---
+
+def dated_schedule_matrix(principals, annual_interest_rates, num_payments, months_per_period, start_dates,
+                          day_count="30/360", business_day="Sin ajuste", holidays=()):
+    """Tablas con fechas de varios préstamos, una fila por préstamo.
+
+    La cuota es la del sistema francés con la tasa nominal del período; el
+    interés de cada período es ``saldo x tasa anual x fracción de año`` entre
+    el pago anterior (o el desembolso) y la fecha de pago ajustada. Como la
+    tasa de cada período queda fija, el saldo sale de productos y sumas
+    acumuladas; la diferencia que dejan los días reales la absorbe el último
+    pago. Devuelve las columnas de ``schedule_matrix`` más ``Fecha de Pago``,
+    ``Días`` y ``Fracción de Año``.
+    """
+    principals = np.asarray(principals, dtype=np.float64)[:, None]
+    annual_interest_rates = np.asarray(annual_interest_rates, dtype=np.float64)[:, None] / 100
+    num_payments = np.asarray(num_payments, dtype=np.int64)
+    months_per_period = np.asarray(months_per_period, dtype=np.int64)
+    start_dates = np.atleast_1d(np.asarray(start_dates, dtype="datetime64[D]"))
+
+    dates = adjust_dates(payment_dates(start_dates, num_payments, months_per_period), business_day, holidays)
+    previous = np.empty_like(dates)
+    previous[:, 0] = start_dates
+    previous[:, 1:] = dates[:, :-1]
+    fractions = year_fractions(previous, dates, day_count)
+    rates = annual_interest_rates * fractions
+
+    payments = fixed_payments(principals[:, 0], annual_interest_rates[:, 0] / (12 / months_per_period),
+                              num_payments)[:, None]
+    # saldo_k = G_k (P - A sum_{j<=k} 1/G_j), con G_k el factor de crecimiento acumulado. Con tasas altas y
+    # plazos largos esa resta pierde toda la precisión, así que se usa la forma equivalente
+    # saldo_k = G_k (D + A sum_{k<j<=n} 1/G_j): las cuotas que faltan, más la diferencia D = P - A sum_j 1/G_j
+    # que dejan los días reales frente a la tasa nominal (exactamente 0 si todos los períodos la usan).
+    log_growth = np.cumsum(np.log1p(rates), axis=1)
+    nominal = annual_interest_rates * (30 * months_per_period[:, None] / 360)
+    nominal_log_growth = np.cumsum(np.broadcast_to(np.log1p(nominal), rates.shape), axis=1)
+    due = np.arange(1, dates.shape[1] + 1) <= num_payments[:, None]
+    discount = np.where(due, np.exp(-log_growth), 0.0)
+    gap = payments * np.sum(discount * np.expm1(log_growth - nominal_log_growth), axis=1, keepdims=True)
+    still_due = np.zeros_like(discount)
+    still_due[:, :-1] = np.cumsum(discount[:, :0:-1], axis=1)[:, ::-1]
+    with np.errstate(over="ignore", invalid="ignore"):
+        closing = np.exp(log_growth) * (gap + payments * still_due)
+
+    opening = np.empty_like(closing)
+    opening[:, 0] = principals[:, 0]
+    opening[:, 1:] = closing[:, :-1]
+    matrix = _settle(np.arange(1, dates.shape[1] + 1), num_payments[:, None], opening, opening * rates, payments,
+                     closing)
+    matrix["Fecha de Pago"] = dates
+    matrix["Días"] = (dates - previous).astype(np.int64)
+    matrix["Fracción de Año"] = fractions
+    return matrix
+
+
+def dated_terms(principals, annual_interest_rates, loan_terms_months, payment_frequencies, start_dates):
+    """Términos de cada préstamo de una cartera con fecha de desembolso."""
+    principals, annual_interest_rates, loan_terms_months = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(values, dtype=np.float64))
+        for values in (principals, annual_interest_rates, loan_terms_months)
+    ))
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period).astype(np.int64)
+    if (num_payments <= 0).any():
+        raise ValueError("El número de pagos debe ser al menos 1. Ajusta el plazo o la frecuencia.")
+    start_dates = np.atleast_1d(np.asarray(start_dates, dtype="datetime64[D]"))
+    if np.isnat(start_dates).any():
+        raise ValueError("Falta la fecha de desembolso de algún préstamo.")
+    return {
+        "principals": principals,
+        "annual_interest_rates": annual_interest_rates,
+        "num_payments": num_payments,
+        "months_per_period": months_per_period,
+        "start_dates": np.broadcast_to(start_dates, principals.shape),
+    }
+
+
+def _block_matrix(terms, block, day_count, business_day, holidays):
+    return dated_schedule_matrix(
+        terms["principals"][block], terms["annual_interest_rates"][block], terms["num_payments"][block],
+        terms["months_per_period"][block], terms["start_dates"][block], day_count, business_day, holidays
+    )
+
+
+def dated_schedule(principal, annual_interest_rate, loan_term_months, payment_frequency, start_date,
+                   day_count="30/360", business_day="Sin ajuste", holidays=()):
+    """Cuota fija y tabla de amortización con fechas de pago reales."""
+    import pandas as pd
+
+    terms = dated_terms(principal, annual_interest_rate, loan_term_months, payment_frequency, start_date)
+    matrix = _block_matrix(terms, slice(None), day_count, business_day, tuple(holidays))
+    arrays = {col: matrix[col][0] for col in DATED_COLUMNS[1:]}
+    arrays["Período"] = matrix["Período"]
+    return float(matrix["Cuota"][0, 0]), pd.DataFrame(arrays, columns=DATED_COLUMNS)
+
+
+def iter_dated_schedule_chunks(principals, annual_interest_rates, loan_terms_months, payment_frequencies,
+                               start_dates, day_count="30/360", business_day="Sin ajuste", holidays=(),
+                               loan_ids=None, chunk_rows=100_000):
+    """Tablas con fechas de toda una cartera, en bloques de ``chunk_rows`` filas.
+
+    Mismo formato que ``amortizacion.iter_schedule_chunks``, con las columnas
+    ``Fecha de Pago``, ``Días`` y ``Fracción de Año``.
+    """
+    year_fractions(np.datetime64("2000-01-01"), np.datetime64("2000-01-01"), day_count)  # valida la convención
+    holidays = tuple(holidays)
+    terms = dated_terms(principals, annual_interest_rates, loan_terms_months, payment_frequencies, start_dates)
+    return _iter_chunks(terms["num_payments"], loan_ids, chunk_rows,
+                        lambda block: _block_matrix(terms, block, day_count, business_day, holidays), DATED_COLUMNS)
@@ -0,0 +1,209 @@
+"""Motor de amortización exacto en centavos enteros (sistema francés).
+
+Los montos se llevan en centavos y las tasas anuales en millonésimas
+(``RATE_SCALE``, es decir, porcentajes con hasta cuatro decimales), ambos en
+arreglos ``int64``. La cuota se redondea al centavo una sola vez y cada
+período redondea su interés con el modo elegido (``ROUNDING_MODES``); como
+el saldo se resta en enteros no hay deriva y el último pago liquida el saldo
+exacto que queda.
+
+Los períodos se recorren de a uno, pero cada paso opera sobre todos los
+préstamos a la vez. Si ``capital x tasa`` no cabe en ``int64`` los mismos
+cálculos se hacen con enteros de Python (arreglos ``object``) y la cuota se
+obtiene con ``Decimal``.
+"""
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, localcontext
+
+import numpy as np
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, _months_per_period, fixed_payments
+
+# Modos de redondeo al centavo (los nombres de ``decimal`` sirven también para el respaldo)
+ROUNDING_MODES = {
+    "Bancario": ROUND_HALF_EVEN,
+    "Mitad hacia arriba": ROUND_HALF_UP,
+}
+
+# Unidades de tasa por unidad (1 = 100 %): una unidad equivale a 0,0001 %
+RATE_SCALE = 1_000_000
+
+_INT64_LIMIT = 2**62
+
+
+def _rounding_mode(rounding):
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Modo de redondeo desconocido: {rounding}")
+    return ROUNDING_MODES[rounding]
+
+
+def _round_up(quotients, twice_remainders, divisors, mode):
+    """Indica qué cocientes suben una unidad según el resto (``2 * resto`` contra el divisor)."""
+    if mode == ROUND_HALF_UP:
+        return twice_remainders >= divisors
+    return (twice_remainders > divisors) | ((twice_remainders == divisors) & (quotients % 2 == 1))
+
+
+def divide_round(numerators, denominators, rounding="Bancario"):
+    """División entera redondeada de cantidades no negativas, sin pasar por punto flotante.
+
+    Funciona igual con arreglos ``int64`` y con arreglos ``object`` de enteros
+    de Python.
+    """
+    mode = _rounding_mode(rounding)
+    quotients = numerators // denominators
+    return quotients + _round_up(quotients, 2 * (numerators % denominators), denominators, mode)
+
+
+def scaled_integers(values, scale, rounding="Bancario"):
+    """Convierte montos en punto flotante a enteros de ``1/scale`` (por ejemplo, centavos).
+
+    El producto se redondea antes a seis decimales para absorber el error de
+    representación: ``1.005`` pesos son 100,5 centavos y no 100,4999...
+    """
+    mode = _rounding_mode(rounding)
+    scaled = np.round(np.asarray(values, dtype=np.float64) * scale, 6)
+    floors = np.floor(scaled)
+    twice_fractions = 2 * (scaled - floors)
+    return (floors + _round_up(floors, twice_fractions, 1.0, mode)).astype(np.int64)
+
+
+def _fits_int64(principals, rate_units):
+    if principals.size == 0:
+        return True
+    return int(principals.max()) * int(rate_units.max()) < _INT64_LIMIT
+
+
+def _decimal_payment(principal, rate_units, periods_per_year, num_payments, mode):
+    with localcontext() as context:
+        context.prec = 50
+        rate = Decimal(int(rate_units)) / (RATE_SCALE * int(periods_per_year))
+        if rate == 0:
+            payment = Decimal(int(principal)) / int(num_payments)
+        else:
+            payment = Decimal(int(principal)) * rate / (1 - (1 + rate) ** -int(num_payments))
+        return int(payment.to_integral_value(rounding=mode))
+
+
+def cents_payments(principals, rate_units, periods_per_year, num_payments, rounding="Bancario"):
+    """Cuota fija en centavos, redondeada una vez con el modo indicado."""
+    principals = np.asarray(principals)
+    rate_units = np.asarray(rate_units)
+    if _fits_int64(principals, rate_units):
+        exact = fixed_payments(principals, rate_units / (RATE_SCALE * np.asarray(periods_per_year)), num_payments)
+        return scaled_integers(exact, 1, rounding)
+    mode = _rounding_mode(rounding)
+    fixed_payments(principals.astype(np.float64), rate_units.astype(np.float64), num_payments)  # valida el plazo
+    return np.array([
+        _decimal_payment(*loan, mode)
+        for loan in zip(principals, rate_units, np.broadcast_to(periods_per_year, principals.shape), num_payments)
+    ], dtype=object)
+
+
+def cents_portfolio_payments(principals, annual_interest_rates, loan_terms_months, payment_frequencies="Mensual",
+                             rounding="Bancario"):
+    """Términos de cada préstamo de una cartera en centavos y unidades de tasa.
+
+    Recibe lo mismo que ``amortizacion.portfolio_payments`` (montos y tasas
+    en porcentaje) y devuelve capitales y cuotas en centavos enteros.
+    """
+    principals, annual_interest_rates, loan_terms_months = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(values, dtype=np.float64))
+        for values in (principals, annual_interest_rates, loan_terms_months)
+    ))
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period).astype(np.int64)
+    periods_per_year = 12 // months_per_period
+    principal_cents = scaled_integers(principals, 100, rounding)
+    rate_units = scaled_integers(annual_interest_rates, RATE_SCALE // 100, rounding)
+    if not _fits_int64(principal_cents, rate_units):
+        principal_cents = principal_cents.astype(object)
+        rate_units = rate_units.astype(object)
+
+    return {
+        "principals": principal_cents,
+        "rate_units": rate_units,
+        "periods_per_year": periods_per_year,
+        "months_per_period": months_per_period,
+        "num_payments": num_payments,
+        "payments": cents_payments(principal_cents, rate_units, periods_per_year, num_payments, rounding),
+    }
+
+
+def _loan_rows(principal, rate_units, denominator, num_payments, payment, rounding):
+    """Filas de un préstamo en centavos, con enteros de Python."""
+    balance, rate_units, denominator, payment = int(principal), int(rate_units), int(denominator), int(payment)
+    mode = _rounding_mode(rounding)
+    rows = []
+    for period in range(1, num_payments + 1):
+        quotient, remainder = divmod(balance * rate_units, denominator)
+        interest = quotient + _round_up(quotient, 2 * remainder, denominator, mode)
+        amortized = balance if period == num_payments else min(payment - interest, balance)
+        rows.append((balance, amortized + interest, interest, amortized, balance - amortized))
+        balance -= amortized
+    return rows
+
+
+def cents_schedule_matrix(principals, rate_units, periods_per_year, num_payments, payments, rounding="Bancario"):
+    """Tablas de varios préstamos en centavos, una fila por préstamo.
+
+    Devuelve las mismas claves que ``amortizacion.schedule_matrix`` con
+    enteros en lugar de flotantes. En cada período el interés es
+    ``saldo x tasa`` redondeado al centavo y el capital amortizado es la cuota
+    menos ese interés; el último pago cancela el saldo exacto.
+    """
+    dtype = object if np.asarray(principals).dtype == object else np.int64
+    principals = np.asarray(principals).astype(dtype)
+    rate_units = np.asarray(rate_units).astype(dtype)
+    denominators = (RATE_SCALE * np.asarray(periods_per_year, dtype=np.int64)).astype(dtype)
+    num_payments = np.asarray(num_payments, dtype=np.int64)
+    payments = np.asarray(payments).astype(dtype)
+
+    horizon = int(num_payments.max())
+    periods = np.arange(1, horizon + 1)
+    if principals.size == 1:
+        # Un solo préstamo (la página): con enteros de Python se evita el costo fijo de cada operación de NumPy
+        rows = _loan_rows(principals[0], rate_units[0], denominators.reshape(-1)[0], horizon, payments[0], rounding)
+        values = np.array(rows, dtype=dtype).reshape(horizon, len(SCHEDULE_COLUMNS) - 1)
+        columns = {col: values[None, :, position] for position, col in enumerate(SCHEDULE_COLUMNS[1:])}
+        columns["Período"] = periods
+        columns["mask"] = np.ones((1, horizon), dtype=bool)
+        return columns
+
+    # Orden Fortran: cada período escribe una columna contigua
+    columns = {col: np.zeros((principals.size, horizon), dtype=dtype, order="F") for col in SCHEDULE_COLUMNS[1:]}
+
+    balance = principals.copy()
+    for k in range(horizon):
+        interest = divide_round(balance * rate_units, denominators, rounding)
+        amortized = np.minimum(payments - interest, balance)
+        # Los préstamos ya cancelados tienen saldo cero y no generan pagos
+        amortized = np.where(num_payments == k + 1, balance, amortized)
+        columns["Capital Inicial del Período"][:, k] = balance
+        columns["Intereses"][:, k] = interest
+        columns["Capital Amortizado"][:, k] = amortized
+        columns["Cuota"][:, k] = amortized + interest
+        balance = balance - amortized
+        columns["Capital Pendiente"][:, k] = balance
+
+    columns["Período"] = periods
+    columns["mask"] = periods <= num_payments[:, None]
+    return columns
+
+
+def amortization_schedule_cents(principal, annual_interest_rate, loan_term_months, payment_frequency,
+                                rounding="Bancario"):
+    """Cuota fija y tabla de amortización exactas al centavo.
+
+    Misma salida que ``amortizacion.amortization_schedule`` (montos en
+    unidades monetarias), pero cada valor es un número exacto de centavos.
+    """
+    import pandas as pd
+
+    terms = cents_portfolio_payments(principal, annual_interest_rate, loan_term_months, payment_frequency, rounding)
+    matrix = cents_schedule_matrix(
+        terms["principals"], terms["rate_units"], terms["periods_per_year"], terms["num_payments"],
+        terms["payments"], rounding
+    )
+    arrays = {col: matrix[col][0].astype(np.float64) / 100 for col in SCHEDULE_COLUMNS[1:]}
+    arrays["Período"] = matrix["Período"]
+    return float(terms["payments"][0]) / 100, pd.DataFrame(arrays, columns=SCHEDULE_COLUMNS)
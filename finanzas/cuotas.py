@@ -0,0 +1,216 @@
+"""Problemas inversos de la cuota del sistema francés, sobre arreglos de cotizaciones.
+
+``amortizacion`` va de capital, tasa y plazo a la cuota. Aquí se despeja
+cualquiera de los otros tres datos a partir de la cuota:
+
+* **Capital** máximo para una cuota presupuestada: ``C = A a_n(i)``.
+* **Plazo** necesario: ``n = -ln(1 - C i / A) / ln(1 + i)``, redondeado hacia
+  arriba a pagos enteros; el último pago es menor y liquida el saldo.
+* **Tasa** implícita en una cuota cotizada (el problema de la TNA y la TEA):
+  no tiene forma cerrada y se resuelve con Newton para todas las filas a la
+  vez. Como ``A a_n(i) - C`` es decreciente y convexa en ``i``, Newton que
+  arranca a la izquierda de la raíz avanza sin pasarse; igual se mantiene el
+  intervalo ``[i, A/C]`` (que siempre contiene la raíz) y todo paso que salga
+  de él se reemplaza por bisección, como en ``finanzas.tir``.
+
+Las tasas van en porcentaje anual nominal, igual que en las páginas.
+"""
+import numpy as np
+
+from finanzas.amortizacion import _months_per_period
+from finanzas.tasas import nominal_to_effective_annual
+
+# Estado de cada cotización
+SOLVED = 0
+NO_SOLUTION = 1
+NOT_CONVERGED = 2
+
+STATUS_LABELS = {
+    SOLVED: "Resuelto",
+    NO_SOLUTION: "Sin solución",
+    NOT_CONVERGED: "No convergió",
+}
+
+
+def _broadcast(*values):
+    return np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in values))
+
+
+def _periodic_rates(annual_interest_rates, months_per_period):
+    return (annual_interest_rates / 100) / (12 / months_per_period)
+
+
+def _annuities(rates, num_payments):
+    """``a_n(i) = (1 - (1+i)^-n) / i``, con ``a_n(0) = n``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(rates == 0, num_payments, -np.expm1(-num_payments * np.log1p(rates)) / rates)
+
+
+def solve_principal(payments, annual_interest_rates, loan_terms_months, payment_frequencies="Mensual"):
+    """Capital máximo que se paga con cada cuota en el plazo y a la tasa dados."""
+    payments, annual_interest_rates, loan_terms_months = _broadcast(
+        payments, annual_interest_rates, loan_terms_months
+    )
+    months_per_period = _months_per_period(payment_frequencies, payments.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period)
+    return payments * _annuities(_periodic_rates(annual_interest_rates, months_per_period), num_payments)
+
+
+def solve_term(principals, payments, annual_interest_rates, payment_frequencies="Mensual"):
+    """Pagos necesarios para cancelar cada capital con la cuota dada.
+
+    Devuelve un diccionario con el número exacto (fraccionario) de pagos, el
+    número entero de pagos, el plazo en meses, el último pago (menor o igual
+    a la cuota) y el estado: si la cuota no cubre ni los intereses del primer
+    período no hay solución.
+    """
+    principals, payments, annual_interest_rates = _broadcast(principals, payments, annual_interest_rates)
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    rates = _periodic_rates(annual_interest_rates, months_per_period)
+
+    feasible = (payments > principals * rates) & (payments > 0) & (principals > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact = np.where(
+            rates == 0,
+            principals / payments,
+            -np.log1p(-principals * rates / payments) / np.log1p(rates),
+        )
+        exact = np.where(feasible, exact, np.nan)
+        # Una millonésima de pago de tolerancia: un plazo exacto (por ejemplo, 60 pagos) no se vuelve 61 por
+        # redondeo. Si la cuota apenas supera los intereses, el plazo es muy sensible a la cuota.
+        num_payments = np.maximum(np.ceil(exact - 1e-6), 1)
+        # El saldo tras ``N - 1`` pagos es A a_r(i), con ``r`` los pagos exactos que faltan (entre 0 y 1)
+        remaining = exact - (num_payments - 1)
+        balance = payments * _annuities(rates, remaining)
+        last_payment = balance * (1 + rates)
+
+    return {
+        "exact_payments": exact,
+        "num_payments": np.where(feasible, num_payments, 0).astype(np.int64),
+        "term_months": np.where(feasible, num_payments * months_per_period, 0).astype(np.int64),
+        "last_payment": np.where(feasible, last_payment, np.nan),
+        "status": np.where(feasible, SOLVED, NO_SOLUTION).astype(np.int8),
+    }
+
+
+def solve_rate(principals, payments, loan_terms_months, payment_frequencies="Mensual", tol=1e-12, max_iter=100):
+    """Tasa nominal anual (%) implícita en cada cuota y su estado de convergencia.
+
+    No hay solución si la cuota no alcanza a devolver el capital sin
+    intereses (``A n < C``). Devuelve ``(tasas, estados)``; las filas sin
+    solución tienen tasa ``nan`` (ver ``STATUS_LABELS``).
+    """
+    principals, payments, loan_terms_months = _broadcast(principals, payments, loan_terms_months)
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period)
+
+    rates = np.full(principals.size, np.nan)
+    status = np.full(principals.size, NO_SOLUTION, dtype=np.int8)
+    excess = payments * num_payments - principals
+    # Sin intereses la cuota es C / n, salvo el error de redondeo de la división
+    zero = (np.abs(excess) <= 1e-12 * principals) & (principals > 0)
+    rates[zero] = 0.0
+    status[zero] = SOLVED
+
+    rows = np.flatnonzero((excess > 0) & ~zero & (principals > 0) & (num_payments > 0))
+    principal, payment, n = principals[rows], payments[rows], num_payments[rows]
+    # Primer paso de Newton desde i = 0 (a_n(0) = n, a_n'(0) = -n(n+1)/2): queda a la izquierda de la raíz
+    current = 2 * excess[rows] / (payment * n * (n + 1))
+    lo = current.copy()
+    hi = payment / principal
+    converged = np.zeros(rows.size, dtype=bool)
+
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            active = np.flatnonzero(~converged)
+            if active.size == 0:
+                break
+            i, a, p, c = current[active], n[active], payment[active], principal[active]
+            discount = np.exp(-a * np.log1p(i))
+            annuity = -np.expm1(-a * np.log1p(i)) / i
+            value = p * annuity - c
+            derivative = p * (a * discount / (1 + i) - annuity) / i
+
+            # El intervalo conserva el cambio de signo: valor positivo a la izquierda de la raíz
+            lo[active] = np.where(value > 0, i, lo[active])
+            hi[active] = np.where(value > 0, hi[active], i)
+
+            newton = i - value / derivative
+            inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+            proposal = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+            done = (np.abs(proposal - i) <= tol * np.abs(proposal)) | (value == 0)
+            current[active] = np.where(value == 0, i, proposal)
+            converged[active[done]] = True
+
+    annual = current * (12 / months_per_period[rows]) * 100
+    rates[rows] = np.where(converged, annual, np.nan)
+    status[rows] = np.where(converged, SOLVED, NOT_CONVERGED)
+    return rates, status
+
+
+def effective_annual_rates(annual_interest_rates, payment_frequencies="Mensual"):
+    """TEA (%) equivalente a cada tasa nominal (%) capitalizada con la frecuencia de pago."""
+    annual_interest_rates = np.atleast_1d(np.asarray(annual_interest_rates, dtype=np.float64))
+    months_per_period = _months_per_period(payment_frequencies, annual_interest_rates.size)
+    return nominal_to_effective_annual(annual_interest_rates / 100, 12 // months_per_period) * 100
+
+
+# --- Cotizaciones por lotes ---
+
+def _principal_quotes(quotes, frequencies):
+    principals = solve_principal(quotes["cuota"], quotes["tasa_anual"], quotes["plazo_meses"], frequencies)
+    return {
+        "Capital": principals,
+        "Estado": np.where(np.isfinite(principals), SOLVED, NO_SOLUTION).astype(np.int8),
+    }
+
+
+def _term_quotes(quotes, frequencies):
+    solution = solve_term(quotes["capital"], quotes["cuota"], quotes["tasa_anual"], frequencies)
+    return {
+        "Número de Pagos": solution["num_payments"],
+        "Plazo (meses)": solution["term_months"],
+        "Último Pago": solution["last_payment"],
+        "Estado": solution["status"],
+    }
+
+
+def _rate_quotes(quotes, frequencies):
+    rates, status = solve_rate(quotes["capital"], quotes["cuota"], quotes["plazo_meses"], frequencies)
+    return {
+        "Tasa Nominal Anual (%)": rates,
+        "TEA (%)": effective_annual_rates(rates, frequencies),
+        "Estado": status,
+    }
+
+
+# Incógnita -> (datos que necesita, función que resuelve el lote)
+SOLVERS = {
+    "capital": (("cuota", "tasa_anual", "plazo_meses"), _principal_quotes),
+    "plazo": (("capital", "cuota", "tasa_anual"), _term_quotes),
+    "tasa": (("capital", "cuota", "plazo_meses"), _rate_quotes),
+}
+
+
+def solve_quotes(unknown, quotes, payment_frequencies="Mensual", quote_ids=None):
+    """Resuelve una incógnita (``capital``, ``plazo`` o ``tasa``) para un lote de cotizaciones.
+
+    ``quotes`` es un diccionario de arreglos con los datos que pide
+    ``SOLVERS[unknown]`` (mismos nombres que las columnas de la línea de
+    comandos). Devuelve un diccionario de arreglos, uno por columna, con el
+    estado ya traducido a texto.
+    """
+    if unknown not in SOLVERS:
+        raise ValueError(f"Incógnita desconocida: {unknown}. Opciones: {', '.join(SOLVERS)}.")
+    fields, solver = SOLVERS[unknown]
+    missing = [field for field in fields if field not in quotes]
+    if missing:
+        raise ValueError(f"Faltan los datos: {', '.join(missing)}.")
+    result = solver(quotes, payment_frequencies)
+    size = result["Estado"].size
+    labels = np.array([STATUS_LABELS[code] for code in sorted(STATUS_LABELS)], dtype=object)
+    return {
+        "Cotización": np.arange(1, size + 1) if quote_ids is None else np.asarray(quote_ids),
+        **{col: values for col, values in result.items() if col != "Estado"},
+        "Estado": labels[result["Estado"]],
+    }
@@ -0,0 +1,220 @@
+"""Escritores de tablas de resultados que consumen bloques de forma incremental.
+
+Cada escritor recibe un iterable de bloques (diccionarios de arreglos con las
+mismas columnas, como los que produce
+``finanzas.amortizacion.iter_schedule_chunks``) y los vuelca al archivo a
+medida que llegan, sin reunir la tabla completa en memoria.
+
+``export_table`` es la capa común de descargas: convierte una tabla de
+resultados (DataFrame, tabla de Arrow o diccionario de arreglos) en los bytes
+de cualquiera de los ``EXPORT_FORMATS``.
+"""
+
+# Límite de filas de una hoja de Excel (incluye la fila de encabezados)
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _to_arrow(chunk):
+    import pyarrow as pa
+
+    # Los lotes y tablas de Arrow se escriben tal cual, sin copiar sus buffers
+    if isinstance(chunk, pa.RecordBatch):
+        return pa.Table.from_batches([chunk])
+    if isinstance(chunk, pa.Table):
+        return chunk
+    return pa.table({col: values for col, values in chunk.items()})
+
+
+def write_csv(chunks, path):
+    """Escribe los bloques en un CSV y devuelve el número de filas escritas."""
+    import pyarrow.csv as pv
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _to_arrow(chunk)
+            if writer is None:
+                writer = pv.CSVWriter(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_parquet(chunks, path, compression="zstd"):
+    """Escribe los bloques en un Parquet (un row group por bloque)."""
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _to_arrow(chunk)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_ipc(chunks, path, compression=None):
+    """Escribe los bloques en un archivo Arrow IPC (Feather v2), un lote por bloque.
+
+    Sin compresión el archivo se puede abrir con ``memory_map`` y leerse sin
+    copias; ``compression`` acepta ``"lz4"`` o ``"zstd"``.
+    """
+    import pyarrow as pa
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = _to_arrow(chunk)
+            if writer is None:
+                options = pa.ipc.IpcWriteOptions(compression=compression)
+                writer = pa.ipc.new_file(path, table.schema, options=options)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _cell_values(values):
+    # Excel no admite NaN ni infinitos: se escriben como celdas vacías (``None``)
+    import numpy as np
+
+    values = np.asarray(values)
+    cells = values.tolist()
+    if values.dtype.kind in "fc":
+        missing = np.flatnonzero(~np.isfinite(values))
+        for position in missing.tolist():
+            cells[position] = None
+    return cells
+
+
+def write_xlsx(chunks, path, sheet_name="Amortizacion", column_formats=None):
+    """Escribe los bloques en un Excel usando el modo ``constant_memory``.
+
+    En ese modo xlsxwriter vuelca cada fila al disco en cuanto se escribe la
+    siguiente, por lo que la memoria no crece con el tamaño de la hoja. Si se
+    supera el límite de filas de Excel se continúa en una hoja nueva.
+    ``path`` puede ser una ruta o un objeto tipo archivo.
+
+    ``column_formats`` (``{columna: formato}``, por ejemplo
+    ``{"Cuota": "#,##0.00"}``) fija cómo muestra Excel esas columnas; las
+    demás quedan con el formato general. Los valores se escriben con toda su
+    precisión. Las fechas se muestran como ``aaaa-mm-dd``. Los valores
+    faltantes (``NaN``, infinitos o ``None``, por ejemplo la TIR de un
+    proyecto sin solución) quedan como celdas vacías.
+    """
+    import xlsxwriter
+
+    rows = 0
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "default_date_format": "yyyy-mm-dd"})
+    column_formats = column_formats or {}
+    formats = {number_format: workbook.add_format({"num_format": number_format})
+               for number_format in dict.fromkeys(column_formats.values())}
+    try:
+        worksheet = None
+        sheet_row = 0
+        sheet_count = 0
+        for chunk in chunks:
+            header = list(chunk)
+            columns = [_cell_values(chunk[col]) for col in header]
+            for values in zip(*columns):
+                if worksheet is None or sheet_row == XLSX_MAX_ROWS:
+                    sheet_count += 1
+                    name = sheet_name if sheet_count == 1 else f"{sheet_name}_{sheet_count}"
+                    worksheet = workbook.add_worksheet(name)
+                    # En modo constant_memory el formato de columna debe fijarse antes de escribir filas
+                    for position, col in enumerate(header):
+                        if col in column_formats:
+                            worksheet.set_column(position, position, 18, formats[column_formats[col]])
+                    worksheet.write_row(0, 0, header)
+                    sheet_row = 1
+                worksheet.write_row(sheet_row, 0, values)
+                sheet_row += 1
+            rows += len(columns[0]) if columns else 0
+    finally:
+        workbook.close()
+    return rows
+
+
+def dataframe_chunks(df, chunk_rows=50_000):
+    """Recorre un DataFrame en bloques de ``chunk_rows`` filas (diccionarios de arreglos)."""
+    for start in range(0, len(df), chunk_rows):
+        part = df.iloc[start:start + chunk_rows]
+        yield {col: part[col].to_numpy() for col in df.columns}
+
+
+def arrow_chunks(table, chunk_rows=50_000):
+    """Recorre una tabla de Arrow en bloques de ``chunk_rows`` filas (diccionarios de arreglos).
+
+    Las columnas numéricas sin nulos se exponen como vistas de NumPy sobre los
+    buffers de Arrow; el resto (texto, nulos) se convierte.
+    """
+    for batch in table.to_batches(max_chunksize=chunk_rows):
+        yield {name: column.to_numpy(zero_copy_only=False) for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def as_arrow_table(data):
+    """Tabla de Arrow a partir de un DataFrame, una tabla de Arrow o un diccionario de arreglos.
+
+    Un DataFrame con columnas respaldadas por Arrow (``dtype_backend="pyarrow"``)
+    reutiliza sus buffers sin copiarlos, igual que una tabla de Arrow.
+    """
+    import pyarrow as pa
+
+    if isinstance(data, pa.Table):
+        return data
+    if hasattr(data, "columns") and hasattr(data, "memory_usage"):
+        return pa.Table.from_pandas(data, preserve_index=False)
+    return pa.table(data)
+
+
+# Formatos de descarga: extensión, tipo MIME y escritor por bloques
+EXPORT_FORMATS = {
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", write_xlsx),
+    "Parquet": (".parquet", "application/vnd.apache.parquet", write_parquet),
+    "Arrow IPC": (".arrow", "application/vnd.apache.arrow.file", write_ipc),
+    "CSV": (".csv", "text/csv", write_csv),
+}
+
+
+def export_table(data, export_format, sheet_name="Resultados", column_formats=None):
+    """Devuelve los bytes de la tabla en uno de los ``EXPORT_FORMATS``.
+
+    ``data`` puede ser un DataFrame, una tabla de Arrow o un diccionario de
+    arreglos; todos los formatos se escriben por lotes desde la misma tabla
+    de Arrow. En Excel (``write_xlsx``) ``column_formats`` solo controla cómo
+    se muestran las columnas indicadas (los valores conservan toda su
+    precisión); ``sheet_name`` solo aplica a Excel.
+    """
+    from io import BytesIO
+
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación desconocido: {export_format}")
+    table = as_arrow_table(data)
+    output = BytesIO()
+    if export_format == "Excel":
+        write_xlsx(arrow_chunks(table), output, sheet_name=sheet_name, column_formats=column_formats)
+    else:
+        EXPORT_FORMATS[export_format][2](table.to_batches(max_chunksize=50_000), output)
+    return output.getvalue()
+
+
+def dataframe_to_xlsx(df, sheet_name, column_formats=None):
+    """Devuelve los bytes de un Excel con la tabla y formato numérico por columna.
+
+    Los valores se escriben con toda su precisión; ``column_formats`` solo
+    controla cómo los muestra Excel. Equivale a ``export_table(df, "Excel", ...)``.
+    """
+    return export_table(df, "Excel", sheet_name=sheet_name, column_formats=column_formats)
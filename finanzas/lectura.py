@@ -0,0 +1,83 @@
+"""Lectura de archivos de entrada (CSV o Parquet) con el lector columnar de pyarrow."""
+import numpy as np
+
+# Nombres de columna aceptados para flujos en formato largo (proyecto, período, flujo)
+LONG_FORMAT_COLUMNS = {
+    "project": ("proyecto", "project", "id"),
+    "period": ("periodo", "período", "period", "año", "year"),
+    "flow": ("flujo", "flujo de caja", "cash_flow", "cash flow", "valor", "value"),
+}
+
+
+def read_table(source, file_name=None):
+    """Lee un CSV o Parquet como ``pyarrow.Table``.
+
+    ``source`` puede ser una ruta o un objeto tipo archivo (por ejemplo, lo que
+    devuelve ``st.file_uploader``); el formato se deduce de la extensión.
+    """
+    name = (file_name or getattr(source, "name", None) or str(source)).lower()
+    if name.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(source)
+    import pyarrow.csv as pv
+
+    return pv.read_csv(source)
+
+
+def _find_column(names, candidates):
+    lowered = {name.strip().lower(): name for name in names}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+def cash_flows_from_table(table):
+    """Convierte una tabla de flujos en ``(ids, matriz)`` con un proyecto por fila.
+
+    Admite dos formatos:
+
+    - largo: columnas proyecto, período y flujo (una fila por flujo);
+    - ancho: un proyecto por fila; la columna proyecto (o, si no existe, la
+      primera columna no numérica) es el identificador y las demás columnas
+      numéricas son los flujos en orden.
+
+    La columna 0 de la matriz es el período 0 (la inversión inicial).
+    """
+    import pyarrow as pa
+
+    names = table.column_names
+    long_columns = {key: _find_column(names, candidates) for key, candidates in LONG_FORMAT_COLUMNS.items()}
+    if all(long_columns.values()):
+        projects = table.column(long_columns["project"]).to_numpy(zero_copy_only=False)
+        periods = table.column(long_columns["period"]).to_numpy(zero_copy_only=False).astype(np.int64)
+        flows = table.column(long_columns["flow"]).to_numpy(zero_copy_only=False).astype(np.float64)
+        if (periods < 0).any():
+            raise ValueError("Los períodos deben ser enteros no negativos.")
+        ids, rows = np.unique(projects, return_inverse=True)
+        matrix = np.zeros((ids.size, int(periods.max()) + 1))
+        np.add.at(matrix, (rows.reshape(-1), periods), flows)
+        return ids, matrix
+
+    id_column = long_columns["project"]
+    numeric = [name for name in names if name != id_column and (
+        pa.types.is_integer(table.schema.field(name).type) or pa.types.is_floating(table.schema.field(name).type))]
+    labels = [id_column] if id_column else [name for name in names if name not in numeric]
+    if not numeric:
+        raise ValueError("El archivo no contiene columnas numéricas de flujos de caja.")
+    matrix = np.column_stack([
+        table.column(name).to_numpy(zero_copy_only=False).astype(np.float64) for name in numeric
+    ])
+    # Las celdas vacías (proyectos más cortos) cuentan como flujo cero
+    matrix = np.nan_to_num(matrix, nan=0.0)
+    if labels:
+        ids = table.column(labels[0]).to_numpy(zero_copy_only=False)
+    else:
+        ids = np.arange(1, matrix.shape[0] + 1)
+    return ids, matrix
+
+
+def read_cash_flows(source, file_name=None):
+    """Atajo: ``read_table`` seguido de ``cash_flows_from_table``."""
+    return cash_flows_from_table(read_table(source, file_name))
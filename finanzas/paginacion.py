@@ -0,0 +1,70 @@
+"""Ventanas de tablas grandes: páginas, salto a una fila y resúmenes anuales.
+
+``st.dataframe`` convierte a Arrow y envía al navegador todas las filas que
+recibe, en cada ejecución. Las páginas cortan aquí la ventana visible antes
+de mostrarla, de modo que solo esas filas se serializan; la tabla completa
+queda en el servidor (y se descarga entera desde los botones de descarga).
+Las vistas agregadas por año también se calculan en el servidor, con
+``np.add.reduceat`` sobre las columnas de la tabla.
+"""
+import numpy as np
+
+# Filas por página que ofrecen las páginas
+PAGE_SIZES = (50, 100, 250, 500)
+
+YEARLY_COLUMNS = [
+    "Año",
+    "Capital Inicial del Año",
+    "Cuotas del Año",
+    "Intereses",
+    "Capital Amortizado",
+    "Capital Pendiente",
+]
+
+
+def page_count(total_rows, page_size):
+    """Cantidad de páginas (al menos una, aunque la tabla esté vacía)."""
+    return max(1, -(-int(total_rows) // int(page_size)))
+
+
+def page_bounds(total_rows, page_size, page):
+    """Filas ``[inicio, fin)`` de la página ``page`` (desde 1), recortada a las páginas existentes."""
+    page = min(max(int(page), 1), page_count(total_rows, page_size))
+    start = (page - 1) * int(page_size)
+    return start, min(start + int(page_size), int(total_rows))
+
+
+def page_of_row(row, page_size):
+    """Página (desde 1) que contiene la fila ``row`` (desde 0)."""
+    return max(int(row), 0) // int(page_size) + 1
+
+
+def table_page(table, page, page_size):
+    """Filas de la página ``page`` de un DataFrame, sin copiar la tabla completa."""
+    start, stop = page_bounds(len(table), page_size, page)
+    return table.iloc[start:stop]
+
+
+def yearly_schedule(table, periods_per_year):
+    """Tabla de amortización agregada por año del préstamo.
+
+    Suma cuotas, intereses y capital amortizado de los períodos de cada año;
+    el capital inicial es el del primer período del año y el pendiente, el
+    del último. Sirve para cualquier tabla con las columnas de
+    ``SCHEDULE_COLUMNS`` (con o sin fechas, tasa variable o centavos).
+    """
+    import pandas as pd
+
+    periods = table["Período"].to_numpy()
+    years = (periods - 1) // int(periods_per_year) + 1
+    starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+    ends = np.r_[starts[1:], periods.size] - 1
+    arrays = {
+        "Año": years[starts],
+        "Capital Inicial del Año": table["Capital Inicial del Período"].to_numpy()[starts],
+        "Cuotas del Año": np.add.reduceat(table["Cuota"].to_numpy(), starts),
+        "Intereses": np.add.reduceat(table["Intereses"].to_numpy(), starts),
+        "Capital Amortizado": np.add.reduceat(table["Capital Amortizado"].to_numpy(), starts),
+        "Capital Pendiente": table["Capital Pendiente"].to_numpy()[ends],
+    }
+    return pd.DataFrame(arrays, columns=YEARLY_COLUMNS)
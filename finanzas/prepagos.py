@@ -0,0 +1,190 @@
+"""Pagos extraordinarios (prepagos) sobre el sistema francés, con recálculo incremental.
+
+Cada período puede tener un pago extra, que se aplica junto con la cuota y
+va completo a capital. Hay dos modalidades (``PREPAYMENT_MODES``):
+
+* **Reducir plazo:** la cuota se mantiene y el préstamo termina antes. Con
+  ``v = 1/(1+r)`` y ``a_k = (1 - v^k)/r``, el saldo tras ``k`` pagos es
+  ``A a_(n-k) - sum_{j<=k} E_j (1+r)^(k-j)``: las cuotas que faltan menos lo
+  que ya se adelantó, con sus intereses. (La forma equivalente
+  ``(1+r)^k (P - A a_k - ...)`` pierde toda la precisión con tasas altas y
+  plazos largos.)
+* **Reducir cuota:** el plazo se mantiene y la cuota se recalcula tras cada
+  pago extra. Como la cuota siempre es ``saldo / a_(n-k)``, cada extra la
+  baja en ``E_k / a_(n-k)`` y la cuota del período ``k`` es
+  ``A_1 - sum_{j<k} E_j / a_(n-j)``.
+
+En ambos casos las columnas salen de sumas acumuladas, sin recorrer los
+períodos. Si se edita un pago extra del período ``k``, ``prepayment_schedule``
+reutiliza las filas anteriores del resultado previo y solo recalcula de
+``k`` en adelante.
+"""
+import numpy as np
+
+from finanzas.amortizacion import payment_terms, fixed_payment
+
+PREPAYMENT_MODES = ["Reducir plazo", "Reducir cuota"]
+
+PREPAYMENT_COLUMNS = [
+    "Período",
+    "Capital Inicial del Período",
+    "Cuota",
+    "Pago Extra",
+    "Intereses",
+    "Capital Amortizado",
+    "Capital Pendiente",
+]
+
+# Saldos menores a esta fracción del capital se consideran cancelados (error de redondeo)
+_PAID_OFF = 1e-9
+
+
+def extra_payments(num_payments, one_off=None, recurring_amount=0.0, every=1, start=1, end=None):
+    """Vector de pagos extra por período (``num_payments`` posiciones, período 1 en la posición 0).
+
+    ``one_off`` es un iterable de pares ``(período, monto)``; el pago
+    recurrente de ``recurring_amount`` se hace cada ``every`` períodos desde
+    ``start`` hasta ``end`` (por defecto, el último período).
+    """
+    extras = np.zeros(int(num_payments))
+    for period, amount in one_off or ():
+        period = int(period)
+        if not 1 <= period <= num_payments:
+            raise ValueError(f"El período {period} del pago extra está fuera del plazo (1 a {num_payments}).")
+        if amount < 0:
+            raise ValueError("Los pagos extra no pueden ser negativos.")
+        extras[period - 1] += amount
+    if recurring_amount:
+        if recurring_amount < 0 or every < 1:
+            raise ValueError("El pago extra recurrente debe ser positivo y repetirse cada 1 o más períodos.")
+        last = num_payments if end is None else min(int(end), num_payments)
+        extras[int(start) - 1:last:int(every)] += recurring_amount
+    return extras
+
+
+def _annuities(rate, counts):
+    """``a_k = (1 - v^k) / r`` para cada ``k`` de ``counts``."""
+    counts = np.asarray(counts, dtype=np.float64)
+    if rate == 0:
+        return counts
+    return (1 - (1 + rate) ** -counts) / rate
+
+
+def _schedule_from(balance, rate, remaining, payment, extras, mode, prepaid=0.0):
+    """Filas desde un saldo inicial para ``remaining`` períodos (los pagos extra, alineados).
+
+    En "Reducir plazo", ``prepaid`` es el valor, al inicio, de los pagos
+    extra anteriores (``balance`` es la cuota por ``a_remaining`` menos ese
+    monto). Devuelve las columnas de ``PREPAYMENT_COLUMNS`` salvo
+    ``Período``, ya recortadas al período en que el préstamo queda cancelado.
+    """
+    periods = np.arange(1, remaining + 1)
+    if mode == "Reducir plazo":
+        growth = (1 + rate) ** periods
+        prepaid = growth * (prepaid + np.cumsum(extras / growth))
+        closing = payment * _annuities(rate, remaining - periods) - prepaid
+        payments = np.full(remaining, payment)
+    else:
+        annuities = _annuities(rate, remaining - periods)
+        first = balance / _annuities(rate, [remaining])[0]
+        # Los extras del último período no cambian ninguna cuota posterior
+        with np.errstate(divide="ignore"):
+            reductions = np.where(annuities > 0, extras / np.where(annuities > 0, annuities, 1.0), 0.0)
+        payments = first - np.concatenate(([0.0], np.cumsum(reductions)[:-1]))
+        closing = (payments - reductions) * annuities
+
+    # El préstamo termina en el primer período cuyo saldo llega a cero (o en el último)
+    paid_off = np.flatnonzero(closing <= _PAID_OFF * max(balance, 1.0))
+    end = int(paid_off[0]) + 1 if paid_off.size else remaining
+    closing = closing[:end].copy()
+    payments = payments[:end].copy()
+    extras = extras[:end].copy()
+
+    opening = np.empty(end)
+    opening[0] = balance
+    opening[1:] = closing[:-1]
+    interest = opening * rate
+
+    # El último pago cancela el saldo exacto: primero con el pago extra y el resto con la cuota
+    extras[-1] = min(extras[-1], opening[-1])
+    payments[-1] = opening[-1] + interest[-1] - extras[-1]
+    closing[-1] = 0.0
+    return {
+        "Capital Inicial del Período": opening,
+        "Cuota": payments,
+        "Pago Extra": extras,
+        "Intereses": interest,
+        "Capital Amortizado": payments - interest + extras,
+        "Capital Pendiente": closing,
+    }
+
+
+def prepayment_schedule(principal, annual_interest_rate, loan_term_months, payment_frequency, extras,
+                        mode="Reducir plazo", previous=None):
+    """Tabla del sistema francés con pagos extra.
+
+    ``extras`` es el vector de ``extra_payments``. Devuelve un diccionario
+    con la tabla (``arrays``), la cuota original (``payment``), los pagos
+    extra usados y los datos del préstamo. Si ``previous`` es un resultado
+    anterior del mismo préstamo y modalidad, se conservan sus filas hasta el
+    primer período cuyo pago extra cambió y solo se recalcula el resto.
+    """
+    if mode not in PREPAYMENT_MODES:
+        raise ValueError(f"Modalidad de prepago desconocida: {mode}")
+    num_payments, rate = payment_terms(annual_interest_rate, loan_term_months, payment_frequency)
+    extras = np.asarray(extras, dtype=np.float64)
+    if extras.shape != (num_payments,):
+        raise ValueError(f"Se esperaban {num_payments} pagos extra (uno por período) y llegaron {extras.size}.")
+    loan = (float(principal), float(annual_interest_rate), int(loan_term_months), payment_frequency, mode)
+
+    start = 0
+    if previous is not None and previous["loan"] == loan:
+        changed = np.flatnonzero(previous["extras"] != extras)
+        start = int(changed[0]) if changed.size else num_payments
+        # Los cambios posteriores a la cancelación no alteran la tabla
+        start = min(start, previous["arrays"]["Período"].size)
+    prepaid = 0.0
+    if start == 0:
+        payment = fixed_payment(principal, rate, num_payments)
+        prefix = None
+        balance = float(principal)
+    else:
+        payment = previous["payment"]
+        prefix = {col: values[:start] for col, values in previous["arrays"].items()}
+        balance = float(prefix["Capital Pendiente"][-1])
+        if start == previous["arrays"]["Período"].size and balance <= 0:
+            # La tabla anterior ya estaba cancelada en ese punto: no hay nada que recalcular
+            return {**previous, "extras": extras}
+        # Pagos extra ya aplicados, con sus intereses hasta el período ``start``
+        prepaid = float(np.sum(prefix["Pago Extra"] * (1 + rate) ** (start - prefix["Período"])))
+
+    # En "Reducir cuota" la cuota vigente se deduce del saldo: saldo / a_(n-k) es la misma cuota
+    rest = _schedule_from(balance, rate, num_payments - start, payment, extras[start:], mode, prepaid)
+    rest["Período"] = np.arange(start + 1, start + rest["Cuota"].size + 1)
+
+    if prefix is None:
+        arrays = rest
+    else:
+        arrays = {col: np.concatenate((prefix[col], rest[col])) for col in PREPAYMENT_COLUMNS}
+    return {
+        "arrays": {col: arrays[col] for col in PREPAYMENT_COLUMNS},
+        "payment": payment,
+        "extras": extras,
+        "loan": loan,
+    }
+
+
+def prepayment_summary(result, principal, annual_interest_rate, loan_term_months, payment_frequency):
+    """Plazo, intereses totales y ahorro frente a la tabla sin pagos extra."""
+    num_payments, rate = payment_terms(annual_interest_rate, loan_term_months, payment_frequency)
+    payment = fixed_payment(principal, rate, num_payments)
+    base_interest = payment * num_payments - principal
+    interest = float(result["arrays"]["Intereses"].sum())
+    return {
+        "Pagos": int(result["arrays"]["Período"].size),
+        "Pagos sin Extras": num_payments,
+        "Intereses": interest,
+        "Intereses sin Extras": base_interest,
+        "Ahorro en Intereses": base_interest - interest,
+        "Pagos Extra": float(result["arrays"]["Pago Extra"].sum()),
+    }
@@ -0,0 +1,420 @@
+"""Servicio HTTP/JSON con las calculadoras, sin Streamlit.
+
+``app`` es una aplicación ASGI sin dependencias: puede servirla cualquier
+servidor ASGI (por ejemplo ``uvicorn finanzas.servicio:app``) o el servidor
+mínimo sobre ``asyncio`` de este módulo::
+
+    python -m finanzas.servicio --port 8000
+
+Cada endpoint recibe un objeto JSON o una lista de objetos (lote) y responde
+con un objeto o una lista en el mismo orden. Los lotes se resuelven con los
+motores vectorizados de ``finanzas``; las tasas van en porcentaje, igual que
+en las páginas.
+
+==========================  ==================================================
+``POST /amortizacion``      ``capital``, ``tasa_anual``, ``plazo_meses``,
+                            ``frecuencia``, ``sistema``, ``incremento_anual``
+                            (escalonado) y ``tabla`` (opcionales)
+``POST /tir``               ``flujos`` (empezando por la inversión) y
+                            ``tasa_descuento`` (opcional)
+``POST /interes-compuesto`` ``inversion_inicial``, ``aporte_anual``,
+                            ``tasa_anual``, ``plazo_anios``,
+                            ``frecuencia_capitalizacion``, ``frecuencia_aporte``
+                            y ``tabla`` (opcional)
+``POST /tasas``             ``conversion``, ``tasa`` y ``frecuencia``
+``POST /cuotas``            ``incognita`` (``capital``, ``plazo`` o ``tasa``),
+                            ``cuota``, ``frecuencia`` y los otros dos datos
+``GET /salud``              estado del servicio
+==========================  ==================================================
+
+Los resultados sin valor (por ejemplo la TIR de un proyecto sin solución)
+se devuelven como ``null``. Los cuerpos de más de ``MAX_BODY_BYTES`` se
+rechazan con 413, y los cálculos corren en un hilo aparte para que un lote
+grande no frene a las demás conexiones.
+"""
+import argparse
+import asyncio
+import json
+import math
+
+import numpy as np
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, portfolio_payments, schedule_arrays
+from finanzas.cuotas import SOLVERS, solve_quotes
+from finanzas.interes_compuesto import COMPOUND_COLUMNS, compound_interest_arrays, frequencies
+from finanzas.tasas import CONVERSIONS
+from finanzas.tir import STATUS_LABELS, irr_batch, npv_batch, pad_cash_flows
+
+# Tamaño máximo del cuerpo de una solicitud
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _field(item, name, default=None):
+    if not isinstance(item, dict):
+        raise ValueError("Cada elemento del lote debe ser un objeto JSON.")
+    if name in item:
+        return item[name]
+    if default is None:
+        raise ValueError(f"Falta el campo '{name}'.")
+    return default
+
+
+def _number_or_none(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _json_ready(value):
+    """Reemplaza NaN e infinitos por ``None``: ``json.dumps`` los escribiría como ``NaN``, que no es JSON."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_ready(item) for item in value]
+    return value
+
+
+def _encode(result):
+    return json.dumps(_json_ready(result), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _table(arrays, columns):
+    """Tabla como objeto de columnas, listo para JSON."""
+    return {column: arrays[column].tolist() for column in columns}
+
+
+# --- Endpoints (cada uno recibe la lista de elementos del lote) ---
+
+def amortization_endpoint(items):
+    principals = np.array([_field(item, "capital") for item in items], dtype=np.float64)
+    rates = np.array([_field(item, "tasa_anual") for item in items], dtype=np.float64)
+    terms = np.array([_field(item, "plazo_meses") for item in items], dtype=np.float64)
+    frequencies = np.array([_field(item, "frecuencia", "Mensual") for item in items])
+    systems = np.array([_field(item, "sistema", "Francés") for item in items])
+    step_up_rates = np.array([_field(item, "incremento_anual", 0.0) for item in items], dtype=np.float64)
+
+    results = [None] * len(items)
+    # Un cálculo vectorizado por sistema de amortización presente en el lote
+    for system in np.unique(systems):
+        positions = np.flatnonzero(systems == system)
+        portfolio = portfolio_payments(principals[positions], rates[positions], terms[positions],
+                                       frequencies[positions], str(system), step_up_rates[positions])
+        for row, position in enumerate(positions):
+            result = {
+                "cuota": float(portfolio["payments"][row]),
+                "numero_pagos": int(portfolio["num_payments"][row]),
+                "tasa_periodica": float(portfolio["periodic_interest_rates"][row]) * 100,
+            }
+            if items[position].get("tabla"):
+                result["tabla"] = _table(schedule_arrays(
+                    portfolio["principals"][row],
+                    portfolio["periodic_interest_rates"][row],
+                    portfolio["num_payments"][row],
+                    portfolio["payments"][row],
+                    str(system),
+                    portfolio["step_periods"][row],
+                    portfolio["step_up_rates"][row],
+                ), SCHEDULE_COLUMNS)
+            results[position] = result
+    return results
+
+
+def irr_endpoint(items):
+    sequences = [_field(item, "flujos") for item in items]
+    if any(len(sequence) < 2 for sequence in sequences):
+        raise ValueError("Cada proyecto necesita la inversión inicial y al menos un flujo futuro.")
+    cash_flows = pad_cash_flows(sequences)
+    discount_rates = np.array([_field(item, "tasa_descuento", 10.0) for item in items], dtype=np.float64)
+    rates, status = irr_batch(cash_flows)
+    npvs = npv_batch(discount_rates / 100, cash_flows)
+    return [
+        {
+            "tir": _number_or_none(rate * 100),
+            "van": float(npv),
+            "estado": STATUS_LABELS[int(code)],
+        }
+        for rate, npv, code in zip(rates, npvs, status)
+    ]
+
+
+def compound_interest_endpoint(items):
+    # Se valida todo el lote antes de calcular: un dato inválido es un error del cliente (400)
+    terms = [int(_field(item, "plazo_anios")) for item in items]
+    if min(terms) < 1:
+        raise ValueError("El plazo de la inversión debe ser de al menos 1 año.")
+    for item in items:
+        frequencies(_field(item, "frecuencia_capitalizacion", "Mensual"), _field(item, "frecuencia_aporte", "Mensual"))
+
+    results = []
+    for item, term in zip(items, terms):
+        arrays, summary = compound_interest_arrays(
+            _field(item, "inversion_inicial"),
+            _field(item, "aporte_anual", 0.0),
+            _field(item, "tasa_anual"),
+            term,
+            _field(item, "frecuencia_capitalizacion", "Mensual"),
+            _field(item, "frecuencia_aporte", "Mensual"),
+        )
+        result = {
+            "valor_final": summary["final_value"],
+            "capital_aportado": summary["total_invested"],
+            "intereses": summary["total_interest"],
+        }
+        if item.get("tabla"):
+            result["tabla"] = _table(arrays, COMPOUND_COLUMNS)
+        results.append(result)
+    return results
+
+
+def rate_conversion_endpoint(items):
+    conversions = [_field(item, "conversion") for item in items]
+    unknown = set(conversions) - set(CONVERSIONS)
+    if unknown:
+        raise ValueError(
+            f"Conversión desconocida: {', '.join(map(str, unknown))}. Opciones: {', '.join(CONVERSIONS)}."
+        )
+    # Los elementos con la misma conversión se convierten en una sola llamada
+    results = [None] * len(items)
+    for conversion in set(conversions):
+        positions = [i for i, name in enumerate(conversions) if name == conversion]
+        rates = np.array([_field(items[i], "tasa") for i in positions], dtype=np.float64)
+        frequencies = np.array([_field(items[i], "frecuencia", "Mensual") for i in positions])
+        converted = CONVERSIONS[conversion](rates / 100, frequencies) * 100
+        for i, value in zip(positions, converted):
+            results[i] = {"tasa": float(value)}
+    return results
+
+
+# Columnas de ``solve_quotes`` -> campos de la respuesta
+_SOLVER_FIELDS = {
+    "Capital": "capital",
+    "Número de Pagos": "numero_pagos",
+    "Plazo (meses)": "plazo_meses",
+    "Último Pago": "ultimo_pago",
+    "Tasa Nominal Anual (%)": "tasa_anual",
+    "TEA (%)": "tea",
+}
+
+
+def payment_solver_endpoint(items):
+    unknowns = np.array([_field(item, "incognita") for item in items])
+    results = [None] * len(items)
+    # Una resolución vectorizada por incógnita presente en el lote
+    for unknown in np.unique(unknowns):
+        if unknown not in SOLVERS:
+            raise ValueError(f"Incógnita desconocida: {unknown}. Opciones: {', '.join(SOLVERS)}.")
+        positions = np.flatnonzero(unknowns == unknown)
+        fields, _ = SOLVERS[unknown]
+        quotes = {
+            field: np.array([_field(items[i], field) for i in positions], dtype=np.float64) for field in fields
+        }
+        frequencies = np.array([_field(items[i], "frecuencia", "Mensual") for i in positions])
+        solved = solve_quotes(str(unknown), quotes, frequencies)
+        columns = [col for col in solved if col in _SOLVER_FIELDS]
+        for row, position in enumerate(positions):
+            result = {_SOLVER_FIELDS[col]: _number_or_none(solved[col][row]) for col in columns}
+            result["estado"] = str(solved["Estado"][row])
+            results[position] = result
+    return results
+
+
+ROUTES = {
+    "/amortizacion": amortization_endpoint,
+    "/tir": irr_endpoint,
+    "/interes-compuesto": compound_interest_endpoint,
+    "/tasas": rate_conversion_endpoint,
+    "/cuotas": payment_solver_endpoint,
+}
+
+
+def handle(method, path, body):
+    """Resuelve una solicitud y devuelve ``(estado, objeto JSON)``."""
+    if path == "/salud":
+        return 200, {"estado": "ok", "endpoints": sorted(ROUTES)}
+    if path not in ROUTES:
+        return 404, {"error": f"No existe el endpoint {path}."}
+    if method != "POST":
+        return 405, {"error": "Usa POST con un cuerpo JSON."}
+    try:
+        payload = json.loads(body or b"null")
+    except ValueError:
+        return 400, {"error": "El cuerpo no es JSON válido."}
+
+    batch = isinstance(payload, list)
+    items = payload if batch else [payload]
+    if not items:
+        return 200, []
+    try:
+        results = ROUTES[path](items)
+    # Datos inválidos de la solicitud
+    except (ValueError, TypeError) as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": f"Ocurrió un error inesperado en el cálculo. Detalles: {e}"}
+    return 200, results if batch else results[0]
+
+
+def respond(method, path, body):
+    """Como ``handle``, con la respuesta ya codificada como JSON (bytes)."""
+    status, result = handle(method, path, body)
+    return status, _encode(result)
+
+
+def _response_messages(status, content):
+    return [
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json; charset=utf-8"),
+                (b"content-length", str(len(content)).encode()),
+            ],
+        },
+        {"type": "http.response.body", "body": content},
+    ]
+
+
+def _too_large():
+    return 413, _encode({"error": f"El cuerpo supera el máximo de {MAX_BODY_BYTES:,} bytes."})
+
+
+# --- Aplicación ASGI ---
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    parts = []
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        parts.append(message.get("body", b""))
+        size += len(parts[-1])
+        more_body = message.get("more_body", False)
+        if size > MAX_BODY_BYTES:
+            break
+
+    if size > MAX_BODY_BYTES:
+        status, content = _too_large()
+    else:
+        # Los lotes grandes ocupan la CPU: fuera del bucle de eventos, las demás conexiones siguen atendidas
+        status, content = await asyncio.to_thread(respond, scope["method"], scope["path"], b"".join(parts))
+    for message in _response_messages(status, content):
+        await send(message)
+
+
+# --- Servidor HTTP/1.1 mínimo sobre asyncio ---
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Content Too Large",
+    500: "Internal Server Error",
+}
+
+
+def _write_response(writer, response, keep_alive):
+    start = response[0]
+    reason = _REASONS.get(start["status"], "")
+    lines = [f"HTTP/1.1 {start['status']} {reason}"]
+    lines += [f"{k.decode()}: {v.decode()}" for k, v in start["headers"]]
+    lines.append(f"connection: {'keep-alive' if keep_alive else 'close'}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    for message in response[1:]:
+        writer.write(message.get("body", b""))
+
+
+async def _serve_connection(reader, writer, application):
+    """Atiende solicitudes de una conexión (con keep-alive) hasta que el cliente la cierre."""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ", 2)
+            headers = {}
+            for line in header_lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_BODY_BYTES:
+                # El cuerpo no se lee: se responde y se cierra la conexión
+                if length > 0:
+                    status, content = _too_large()
+                else:
+                    status, content = 400, _encode({"error": "Content-Length inválido."})
+                _write_response(writer, _response_messages(status, content), keep_alive=False)
+                await writer.drain()
+                return
+            body = await reader.readexactly(length)
+
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": version.split("/")[-1],
+                "method": method,
+                "path": path,
+                "query_string": query.encode(),
+                "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if received:
+                    return {"type": "http.disconnect"}
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            response = []
+
+            async def send(message):
+                response.append(message)
+
+            await application(scope, receive, send)
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            _write_response(writer, response, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8000, application=app):
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_connection(reader, writer, application), host, port
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio JSON de las calculadoras financieras.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    print(f"Sirviendo en http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Amortización con tasa variable (préstamos indexados, sistema francés).
+
+La tasa de cada préstamo es un índice de mercado más un margen propio. El
+índice se da como una curva de ajustes: pares ``(mes, tasa)`` donde cada tasa
+rige desde ese mes hasta el ajuste siguiente (la curva empieza en el mes 0).
+Cada período usa la tasa vigente al comenzar y, en cada ajuste, la cuota se
+recalcula para pagar el saldo en los períodos que quedan.
+
+Como la cuota del sistema francés es proporcional al saldo, la razón entre
+el saldo final y el inicial de cada período depende solo de la tasa de ese
+período y de los pagos pendientes. Toda la tabla sale entonces de un
+producto acumulado, sin recorrer los períodos ni los tramos entre ajustes:
+el costo no depende de cuántos ajustes tenga la curva. Los préstamos de una
+cartera comparten la misma curva aunque paguen con distinta frecuencia.
+"""
+import numpy as np
+
+from finanzas.amortizacion import SCHEDULE_COLUMNS, _iter_chunks, _months_per_period, _settle, fixed_payments
+
+VARIABLE_RATE_COLUMNS = SCHEDULE_COLUMNS[:1] + ["Tasa Anual (%)"] + SCHEDULE_COLUMNS[1:]
+
+
+def index_curve(months, rates):
+    """Valida una curva de ajustes y la devuelve como dos arreglos ordenados por mes."""
+    months = np.asarray(months, dtype=np.float64).reshape(-1)
+    rates = np.asarray(rates, dtype=np.float64).reshape(-1)
+    if months.size == 0 or months.size != rates.size:
+        raise ValueError("La curva de tasas necesita al menos un ajuste y una tasa por cada mes.")
+    # Los meses llegan como decimales desde el editor de la página: no se truncan en silencio
+    if not (np.abs(months) <= np.iinfo(np.int32).max).all():
+        raise ValueError("La curva de tasas tiene meses vacíos o inválidos.")
+    if (months != np.round(months)).any():
+        raise ValueError("Los meses de la curva de tasas deben ser números enteros.")
+    months = months.astype(np.int64)
+    order = np.argsort(months, kind="stable")
+    months, rates = months[order], rates[order]
+    if months[0] != 0:
+        raise ValueError("La curva de tasas debe empezar en el mes 0 (la tasa inicial).")
+    if (np.diff(months) == 0).any():
+        raise ValueError("La curva de tasas tiene dos ajustes en el mismo mes.")
+    if not np.isfinite(rates).all():
+        raise ValueError("La curva de tasas tiene valores inválidos.")
+    return months, rates
+
+
+def variable_rate_matrix(principals, spreads, num_payments, months_per_period, curve_months, curve_rates):
+    """Tablas de varios préstamos indexados, una fila por préstamo.
+
+    Devuelve las columnas de ``schedule_matrix`` más ``Tasa Anual (%)`` (la
+    tasa de cada período, índice más margen y nunca negativa). Con ``m``
+    pagos pendientes y la tasa ``r`` del período, la cuota es
+    ``saldo / a_m(r)`` y el saldo pasa a ``saldo x a_(m-1)(r) / a_m(r)``, de
+    modo que los saldos son el producto acumulado de esas razones.
+    """
+    principals = np.asarray(principals, dtype=np.float64)[:, None]
+    spreads = np.asarray(spreads, dtype=np.float64)[:, None]
+    num_payments = np.asarray(num_payments, dtype=np.int64)[:, None]
+    months_per_period = np.asarray(months_per_period, dtype=np.int64)[:, None]
+    periods = np.arange(1, int(num_payments.max()) + 1)
+
+    # Tasa vigente al comenzar cada período: la del último ajuste hasta ese mes
+    positions = np.searchsorted(curve_months, (periods - 1) * months_per_period, side="right") - 1
+    annual_rates = np.maximum(curve_rates[positions] + spreads, 0.0)
+    rates = (annual_rates / 100) / (12 / months_per_period)
+
+    # Pagos pendientes al comenzar cada período (cero después del último)
+    remaining = np.maximum(num_payments - periods + 1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discount = (1 + rates) ** -remaining
+        annuity = np.where(rates == 0, remaining, (1 - discount) / rates)
+        next_annuity = np.where(rates == 0, remaining - 1, (1 - discount * (1 + rates)) / rates)
+        ratios = np.where(remaining > 0, next_annuity / annuity, 0.0)
+    closing = principals * np.cumprod(ratios, axis=1)
+
+    opening = np.empty_like(closing)
+    opening[:, 0] = principals[:, 0]
+    opening[:, 1:] = closing[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payments = np.where(remaining > 0, opening / annuity, 0.0)
+    matrix = _settle(periods, num_payments, opening, opening * rates, payments, closing)
+    matrix["Tasa Anual (%)"] = annual_rates
+    return matrix
+
+
+def variable_rate_terms(principals, spreads, loan_terms_months, payment_frequencies="Mensual"):
+    """Capital, margen, número de pagos y meses por período de cada préstamo de la cartera."""
+    principals, spreads, loan_terms_months = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(values, dtype=np.float64))
+        for values in (principals, spreads, loan_terms_months)
+    ))
+    months_per_period = _months_per_period(payment_frequencies, principals.size)
+    num_payments = np.ceil(loan_terms_months / months_per_period).astype(np.int64)
+    if (num_payments <= 0).any():
+        raise ValueError("El número de pagos debe ser al menos 1. Ajusta el plazo o la frecuencia.")
+    return {
+        "principals": principals,
+        "spreads": spreads,
+        "num_payments": num_payments,
+        "months_per_period": months_per_period,
+    }
+
+
+def _block_matrix(terms, block, curve):
+    return variable_rate_matrix(terms["principals"][block], terms["spreads"][block], terms["num_payments"][block],
+                                terms["months_per_period"][block], *curve)
+
+
+def variable_rate_payments(principals, spreads, loan_terms_months, payment_frequencies, curve_months, curve_rates):
+    """Primera cuota, número de pagos y tasa inicial de cada préstamo indexado."""
+    curve = index_curve(curve_months, curve_rates)
+    terms = variable_rate_terms(principals, spreads, loan_terms_months, payment_frequencies)
+    initial_rates = np.maximum(curve[1][0] + terms["spreads"], 0.0)
+    periodic_rates = (initial_rates / 100) / (12 / terms["months_per_period"])
+    terms["initial_rates"] = initial_rates
+    terms["payments"] = fixed_payments(terms["principals"], periodic_rates, terms["num_payments"])
+    return terms
+
+
+def variable_rate_schedule(principal, spread, loan_term_months, payment_frequency, curve_months, curve_rates):
+    """Primera cuota y tabla de amortización de un préstamo indexado.
+
+    Con ``spread=0`` la curva es directamente la tasa del préstamo.
+    """
+    import pandas as pd
+
+    curve = index_curve(curve_months, curve_rates)
+    terms = variable_rate_terms(principal, spread, loan_term_months, payment_frequency)
+    matrix = _block_matrix(terms, slice(None), curve)
+    arrays = {col: matrix[col][0] for col in VARIABLE_RATE_COLUMNS[1:]}
+    arrays["Período"] = matrix["Período"]
+    return float(matrix["Cuota"][0, 0]), pd.DataFrame(arrays, columns=VARIABLE_RATE_COLUMNS)
+
+
+def iter_variable_rate_chunks(principals, spreads, loan_terms_months, payment_frequencies, curve_months, curve_rates,
+                              loan_ids=None, chunk_rows=100_000):
+    """Tablas de toda una cartera indexada a una curva común, en bloques de ``chunk_rows`` filas.
+
+    Mismo formato que ``amortizacion.iter_schedule_chunks``, con la columna
+    ``Tasa Anual (%)`` de cada período.
+    """
+    curve = index_curve(curve_months, curve_rates)
+    terms = variable_rate_terms(principals, spreads, loan_terms_months, payment_frequencies)
+    return _iter_chunks(terms["num_payments"], loan_ids, chunk_rows, lambda block: _block_matrix(terms, block, curve),
+                        VARIABLE_RATE_COLUMNS)
@@ -0,0 +1,87 @@
+"""Tabla única de frecuencias y conversiones de tasas sobre escalares o arreglos.
+
+Todas las calculadoras traducen el nombre de una frecuencia a períodos por
+año con ``PERIODS_PER_YEAR``. Las conversiones aceptan tanto un valor como un
+arreglo NumPy de tasas (y de frecuencias), así que una curva completa se
+convierte en una sola llamada. Las tasas se expresan en decimales.
+"""
+import numpy as np
+
+# Períodos por año de cada frecuencia
+PERIODS_PER_YEAR = {
+    "Anual": 1,
+    "Semestral": 2,
+    "Cuatrimestral": 3,
+    "Trimestral": 4,
+    "Bimestral": 6,
+    "Mensual": 12,
+    "Quincenal": 24,
+    "Diario": 365,
+    # Año comercial de 360 días (bases 30/360 y ACT/360, ver ``finanzas.calendario``)
+    "Diario 360": 360,
+}
+
+FREQUENCY_OPTIONS = list(PERIODS_PER_YEAR)
+
+
+def frequency_lookup(frequencies, table=PERIODS_PER_YEAR):
+    """Traduce un nombre o un arreglo de nombres de frecuencia con ``table``.
+
+    Un arreglo numérico se toma como ya traducido y se devuelve tal cual, lo
+    que evita comparar cadenas al convertir curvas muy grandes.
+    """
+    if isinstance(frequencies, str):
+        if frequencies not in table:
+            raise ValueError(f"Frecuencia desconocida: {frequencies}")
+        return table[frequencies]
+    frequencies = np.asarray(frequencies)
+    if frequencies.dtype.kind in "iuf":
+        return frequencies
+    # Una comparación vectorizada por frecuencia conocida; más rápido que ordenar cadenas
+    values = np.zeros(frequencies.shape, dtype=np.int64)
+    matched = np.zeros(frequencies.shape, dtype=bool)
+    for name, value in table.items():
+        mask = frequencies == name
+        values[mask] = value
+        matched |= mask
+    if not matched.all():
+        unknown = sorted({str(name) for name in frequencies[~matched]})
+        raise ValueError(f"Frecuencia desconocida: {', '.join(unknown)}")
+    return values
+
+
+def _as_rates(rates):
+    return np.asarray(rates, dtype=np.float64)
+
+
+def nominal_to_effective_annual(nominal_rate, compounding_frequency):
+    """Convierte una tasa nominal a Tasa Efectiva Anual (TEA)."""
+    n = frequency_lookup(compounding_frequency)
+    return np.expm1(n * np.log1p(_as_rates(nominal_rate) / n))
+
+
+def effective_annual_to_nominal(tea, compounding_frequency):
+    """Convierte Tasa Efectiva Anual (TEA) a tasa nominal."""
+    n = frequency_lookup(compounding_frequency)
+    return n * np.expm1(np.log1p(_as_rates(tea)) / n)
+
+
+def effective_periodic_to_effective_annual(effective_periodic_rate, periodic_frequency):
+    """Convierte una tasa efectiva periódica a Tasa Efectiva Anual (TEA)."""
+    n = frequency_lookup(periodic_frequency)
+    return np.expm1(n * np.log1p(_as_rates(effective_periodic_rate)))
+
+
+def effective_annual_to_effective_periodic(tea, periodic_frequency):
+    """Convierte Tasa Efectiva Anual (TEA) a tasa efectiva periódica."""
+    n = frequency_lookup(periodic_frequency)
+    return np.expm1(np.log1p(_as_rates(tea)) / n)
+
+
+# Conversiones por nombre, para el servicio y la línea de comandos
+CONVERSIONS = {
+    "nominal_a_tea": nominal_to_effective_annual,
+    "tea_a_nominal": effective_annual_to_nominal,
+    "periodica_a_tea": effective_periodic_to_effective_annual,
+    "tea_a_periodica": effective_annual_to_effective_periodic,
+}
@@ -0,0 +1,215 @@
+"""Tasa Interna de Retorno (TIR) para muchos flujos de caja a la vez.
+
+Cada fila de la matriz de flujos es un proyecto (columna 0 = período 0). Las
+filas se resuelven simultáneamente: una búsqueda en grilla acota la raíz de
+cada fila y luego un Newton protegido por bisección la refina, de modo que
+el resultado no depende de que Newton arranque cerca de la raíz.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# Estado de convergencia por fila
+CONVERGED = 0
+NO_SIGN_CHANGE = 1
+NOT_CONVERGED = 2
+
+STATUS_LABELS = {
+    CONVERGED: "Convergió",
+    NO_SIGN_CHANGE: "Sin TIR (el VAN no cambia de signo)",
+    NOT_CONVERGED: "No convergió",
+}
+
+# Tasas donde se buscan cambios de signo del VAN
+_BRACKET_GRID = np.concatenate((
+    -1 + np.geomspace(1e-6, 0.01, 30)[:-1],
+    np.linspace(-0.99, 1.0, 399),
+    np.geomspace(1.0, 1e4, 60)[1:],
+))
+
+
+def _npv_and_derivative(rates, cash_flows):
+    """VAN y su derivada respecto de la tasa, por fila, con el esquema de Horner.
+
+    Con ``x = 1/(1+r)`` el VAN es el polinomio ``sum(c_t x^t)``; ambos se
+    evalúan recorriendo los períodos de atrás hacia adelante.
+    """
+    x = 1.0 / (1.0 + rates)
+    value = np.zeros_like(x)
+    slope = np.zeros_like(x)
+    for column in range(cash_flows.shape[1] - 1, -1, -1):
+        slope = slope * x + value
+        value = value * x + cash_flows[:, column]
+    # d/dr = d/dx * dx/dr, con dx/dr = -x^2
+    return value, -slope * x * x
+
+
+def _discount_factors(rates, num_flows):
+    """Matriz (períodos x tasas) de factores ``(1+r)^-t``, de solo lectura.
+
+    Con ella el VAN de muchas filas en muchas tasas es un solo producto
+    matricial: ``flujos @ factores``.
+    """
+    with np.errstate(all="ignore"):
+        factors = (1 + np.asarray(rates, dtype=np.float64)[None, :]) ** -np.arange(num_flows)[:, None]
+    factors.setflags(write=False)
+    return factors
+
+
+@lru_cache(maxsize=32)
+def _grid_discount_factors(num_flows):
+    return _discount_factors(_BRACKET_GRID, num_flows)
+
+
+def _bracket_nearest_zero(cash_flows):
+    """Intervalo de la grilla con cambio de signo del VAN más cercano a tasa 0, por fila."""
+    grid = _BRACKET_GRID
+    with np.errstate(all="ignore"):
+        values = cash_flows @ _grid_discount_factors(cash_flows.shape[1])
+
+    finite = np.isfinite(values[:, :-1]) & np.isfinite(values[:, 1:])
+    changes = finite & (np.signbit(values[:, :-1]) != np.signbit(values[:, 1:]))
+    lo, hi = grid[:-1], grid[1:]
+    distance = np.where((lo <= 0) & (hi >= 0), 0.0, np.minimum(np.abs(lo), np.abs(hi)))
+    choice = np.where(changes, distance, np.inf).argmin(axis=1)
+    rows = np.arange(cash_flows.shape[0])
+    return changes.any(axis=1), lo[choice], hi[choice], values[rows, choice]
+
+
+def irr_batch(cash_flows, guess=0.1, tol=1e-12, max_iter=100):
+    """TIR de cada fila de ``cash_flows`` y su estado de convergencia.
+
+    Primero se ubica, para cada fila, el intervalo con cambio de signo del VAN
+    más cercano a tasa 0 (la misma raíz que elige ``npf.irr`` cuando hay
+    varias). Dentro de él se itera Newton, reemplazando por bisección todo
+    paso que salga del intervalo. ``guess`` puede ser un escalar o un arreglo
+    por fila (por ejemplo, la TIR de la corrida anterior) y se usa como punto
+    de partida cuando cae dentro del intervalo. Devuelve ``(tasas, estados)``;
+    las filas sin solución tienen tasa ``nan`` y el estado indica el motivo
+    (ver ``STATUS_LABELS``).
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    guess = np.broadcast_to(np.asarray(guess, dtype=np.float64), cash_flows.shape[:1])
+    rates = np.full(cash_flows.shape[0], np.nan)
+    status = np.full(cash_flows.shape[0], NO_SIGN_CHANGE, dtype=np.int8)
+
+    found, lo, hi, f_lo = _bracket_nearest_zero(cash_flows)
+    rows = np.flatnonzero(found)
+    lo, hi, f_lo, flows = lo[rows], hi[rows], f_lo[rows], cash_flows[rows]
+    current = np.where((guess[rows] > lo) & (guess[rows] < hi), guess[rows], 0.5 * (lo + hi))
+    converged = np.zeros(rows.size, dtype=bool)
+
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            active = np.flatnonzero(~converged)
+            if active.size == 0:
+                break
+            value, derivative = _npv_and_derivative(current[active], flows[active])
+
+            # Se achica el intervalo conservando el cambio de signo
+            same_side = np.signbit(value) == np.signbit(f_lo[active])
+            lo[active] = np.where(same_side, current[active], lo[active])
+            f_lo[active] = np.where(same_side, value, f_lo[active])
+            hi[active] = np.where(same_side, hi[active], current[active])
+
+            newton = current[active] - value / derivative
+            inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+            proposal = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+            done = (np.abs(proposal - current[active]) <= tol * (1 + np.abs(proposal))) | (value == 0)
+            current[active] = np.where(value == 0, current[active], proposal)
+            converged[active[done]] = True
+
+    rates[rows] = np.where(converged, current, np.nan)
+    status[rows] = np.where(converged, CONVERGED, NOT_CONVERGED)
+    return rates, status
+
+
+def irr(cash_flows, guess=0.1):
+    """TIR de un único flujo de caja; lanza ``ValueError`` si no existe."""
+    rates, status = irr_batch([cash_flows], guess=guess)
+    if status[0] != CONVERGED:
+        raise ValueError(STATUS_LABELS[int(status[0])])
+    return float(rates[0])
+
+
+def npv_batch(rates, cash_flows):
+    """VAN de cada fila a una tasa común o a una tasa por fila (convención de ``npf.npv``)."""
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    rates = np.broadcast_to(np.asarray(rates, dtype=np.float64), cash_flows.shape[:1])
+    return _npv_and_derivative(rates, cash_flows)[0]
+
+
+def pad_cash_flows(sequences):
+    """Matriz de flujos a partir de secuencias de distinto largo, rellenando con ceros.
+
+    Los ceros al final no cambian ni el VAN ni la TIR.
+    """
+    lengths = np.array([len(sequence) for sequence in sequences])
+    matrix = np.zeros((len(sequences), int(lengths.max(initial=0))))
+    mask = np.arange(matrix.shape[1]) < lengths[:, None]
+    matrix[mask] = np.concatenate([np.asarray(sequence, dtype=np.float64) for sequence in sequences])
+    return matrix
+
+
+def evaluation_arrays(cash_flows, discount_rate, project_ids=None):
+    """TIR, VAN y estado de cada proyecto en una sola pasada vectorizada, como arreglos.
+
+    ``discount_rate`` está en decimales; la TIR del resultado, en porcentaje.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    if project_ids is None:
+        project_ids = np.arange(1, cash_flows.shape[0] + 1)
+    rates, status = irr_batch(cash_flows)
+    labels = np.array([STATUS_LABELS[code] for code in sorted(STATUS_LABELS)], dtype=object)
+    return {
+        "Proyecto": np.asarray(project_ids),
+        "TIR (%)": rates * 100,
+        "VAN": npv_batch(discount_rate, cash_flows),
+        "Estado": labels[status],
+    }
+
+
+def evaluate_projects(cash_flows, discount_rate, project_ids=None):
+    """Igual que ``evaluation_arrays``, como DataFrame."""
+    import pandas as pd
+
+    return pd.DataFrame(evaluation_arrays(cash_flows, discount_rate, project_ids))
+
+
+# --- Perfil y sensibilidad del VAN ---
+
+@lru_cache(maxsize=16)
+def discount_factor_matrix(start_bp, stop_bp, step_bp, num_flows):
+    """Tasas de una grilla en puntos básicos y su matriz de factores de descuento.
+
+    La grilla va de ``start_bp`` a ``stop_bp`` inclusive (100 pb = 1%). Se
+    guarda en caché por proceso, así que las siguientes evaluaciones con la
+    misma grilla y cantidad de flujos reutilizan la matriz.
+    """
+    rates = np.arange(start_bp, stop_bp + 1, step_bp) / 10_000
+    rates.setflags(write=False)
+    return rates, _discount_factors(rates, num_flows)
+
+
+def npv_profile(cash_flows, start_bp=0, stop_bp=5_000, step_bp=1):
+    """VAN de cada proyecto en cada tasa de la grilla.
+
+    Devuelve ``(tasas, van)`` con ``van`` de forma (proyectos, tasas): un
+    único producto matricial contra la matriz de factores en caché.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    rates, factors = discount_factor_matrix(start_bp, stop_bp, step_bp, cash_flows.shape[1])
+    return rates, cash_flows @ factors
+
+
+def npv_sensitivity(cash_flows, shocks, start_bp=0, stop_bp=5_000, step_bp=1):
+    """Perfil del VAN de un proyecto bajo escenarios de flujos perturbados.
+
+    Cada escenario multiplica los flujos futuros (no la inversión inicial)
+    por ``1 + shock``. Devuelve ``(tasas, van)`` con ``van`` de forma
+    (escenarios, tasas).
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    scenarios = np.tile(cash_flows, (len(shocks), 1))
+    scenarios[:, 1:] *= 1 + np.asarray(shocks, dtype=np.float64)[:, None]
+    return npv_profile(scenarios, start_bp, stop_bp, step_bp)
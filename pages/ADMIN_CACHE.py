@@ -0,0 +1,77 @@
+import os
+
+import streamlit as st
+import pandas as pd
+
+from finanzas.cache import cache_stats, clear_all, disk_store_info
+
+st.set_page_config(page_title="Administración de Caché", page_icon="images/finance.png", layout="centered")
+
+# --- Acceso restringido ---
+# La página permite vaciar las cachés de todas las sesiones: solo se muestra si quien despliega la
+# aplicación la habilita con la variable de entorno FINANZAS_ADMIN=1
+if os.environ.get("FINANZAS_ADMIN") != "1":
+    st.title("Página no disponible")
+    if st.button("Volver a Herramientas Financieras", key="back_to_home_cache_disabled"):
+        st.switch_page("HOME.py")
+    st.stop()
+
+st.title("🗄️ Administración de Caché")
+st.markdown("""
+    Estado de la caché de resultados que comparten todas las sesiones de la aplicación.
+    Las entradas más usadas se sirven desde memoria sin volver a calcular.
+""")
+
+st.divider()
+
+stats = pd.DataFrame(cache_stats())
+
+# --- Totales ---
+hits = int(stats["Aciertos"].sum())
+misses = int(stats["Fallos"].sum())
+col1, col2, col3 = st.columns(3)
+col1.metric("**Aciertos**", f"{hits:,}")
+col2.metric("**Fallos**", f"{misses:,}")
+col3.metric("**Tasa de Aciertos**", f"{100 * hits / (hits + misses) if hits + misses else 0:.1f} %")
+
+# --- Detalle por caché ---
+st.subheader("Detalle por Caché")
+st.dataframe(
+    stats.style.format({
+        "Memoria (MB)": "{:,.2f}",
+        "Máx. Memoria (MB)": "{:,.0f}",
+        "TTL (s)": "{:,.0f}",
+        "Tasa de Aciertos (%)": "{:.1f}",
+    }),
+    hide_index=True
+)
+
+# --- Almacén persistente en disco ---
+st.subheader("Almacén en Disco")
+disk_info = disk_store_info()
+if disk_info is None:
+    st.info("El almacén en disco está desactivado. Define la variable de entorno `FINANZAS_CACHE_PATH` para activarlo.")
+else:
+    st.markdown(f"**Archivo:** `{disk_info['Archivo']}`")
+    col_disk1, col_disk2 = st.columns(2)
+    col_disk1.metric("**Entradas en Disco**", f"{disk_info['Entradas']:,}")
+    col_disk2.metric("**Tamaño en Disco**", f"{disk_info['Memoria (MB)']:,.1f} / {disk_info['Máx. Memoria (MB)']:,.0f} MB")
+
+col_refresh, col_clear, col_clear_disk = st.columns(3)
+with col_refresh:
+    st.button("Actualizar", key="refresh_cache_admin")
+with col_clear:
+    st.button("Vaciar Cachés", key="clear_cache_admin", on_click=clear_all,
+              help="Elimina las entradas en memoria y reinicia los contadores.")
+with col_clear_disk:
+    st.button("Vaciar También el Disco", key="clear_disk_cache_admin", on_click=clear_all, kwargs={"disk": True},
+              disabled=disk_info is None, help="Elimina además los resultados guardados en disco.")
+
+st.markdown("---")
+
+# --- Botón para regresar a Home.py (en el cuerpo principal) ---
+col_back1, col_back2, col_back3 = st.columns([1, 2, 1])
+
+with col_back2:
+    if st.button("Volver a Herramientas Financieras", key="back_to_home_cache"):
+        st.switch_page("HOME.py")
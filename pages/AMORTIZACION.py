@@ -1,13 +1,28 @@
-import streamlit as st
+import datetime
+import time
+
 import pandas as pd
-import numpy as np
-from io import BytesIO
+import streamlit as st
+
+from finanzas.amortizacion import AMORTIZATION_SYSTEMS, PAYMENT_FREQUENCIES, SCHEDULE_COLUMNS
+from finanzas.calendario import BUSINESS_DAY_CONVENTIONS, DAY_COUNTS
+from finanzas.centavos import ROUNDING_MODES
+from finanzas.cuotas import SOLVED, STATUS_LABELS, effective_annual_rates, solve_principal, solve_rate, solve_term
+from finanzas.cache import amortization_schedule, dated_schedule, export_table, variable_rate_schedule
+from finanzas.exportacion import EXPORT_FORMATS
+from finanzas.paginacion import PAGE_SIZES, YEARLY_COLUMNS, page_bounds, page_count, page_of_row, yearly_schedule
+from finanzas.prepagos import (
+    PREPAYMENT_COLUMNS, PREPAYMENT_MODES, extra_payments, prepayment_schedule, prepayment_summary
+)
+
+# Tiempo máximo del recálculo en modo en vivo (ver benchmarks/bench_modo_en_vivo.py)
+LIVE_BUDGET_MS = 50
 
 st.set_page_config(page_title="Calculadora de Amortización", page_icon="images/finance.png", layout="centered")
 
 st.title("🗓️ Calculadora de Amortización")
 st.markdown("""
-    Calcula tu tabla de amortización detallada para préstamos y descárgala en formato Excel.
+    Calcula tu tabla de amortización detallada para préstamos y descárgala en Excel, CSV, Parquet o Arrow.
 """)
 
 st.divider()
@@ -25,136 +40,312 @@ if 'loan_term_months_amort' not in st.session_state:
     st.session_state.loan_term_months_amort = 60
 if 'payment_frequency_amort' not in st.session_state:
     st.session_state.payment_frequency_amort = "Mensual"
+if 'rounding_amort' not in st.session_state:
+    st.session_state.rounding_amort = "Sin redondeo"
+if 'system_amort' not in st.session_state:
+    st.session_state.system_amort = "Francés"
+if 'step_up_rate_amort' not in st.session_state:
+    st.session_state.step_up_rate_amort = 5.0
+if 'rate_type_amort' not in st.session_state:
+    st.session_state.rate_type_amort = "Fija"
+if 'spread_amort' not in st.session_state:
+    st.session_state.spread_amort = 1.5
+if 'dated_amort' not in st.session_state:
+    st.session_state.dated_amort = False
+if 'start_date_amort' not in st.session_state:
+    st.session_state.start_date_amort = datetime.date.today()
+if 'day_count_amort' not in st.session_state:
+    st.session_state.day_count_amort = "30/360"
+if 'business_day_amort' not in st.session_state:
+    st.session_state.business_day_amort = "Sin ajuste"
+if 'holidays_amort' not in st.session_state:
+    st.session_state.holidays_amort = ""
+if 'index_curve_amort' not in st.session_state:
+    st.session_state.index_curve_amort = pd.DataFrame({"Mes": [0, 12, 24, 36], "Tasa (%)": [4.0, 4.5, 5.25, 4.75]})
 
 # Aseguramos que 'df_amortization_result' y 'payment_amount_result' siempre existan en session_state, incluso si es None
 if 'df_amortization_result' not in st.session_state:
     st.session_state.df_amortization_result = None
 if 'payment_amount_result' not in st.session_state:
     st.session_state.payment_amount_result = None
+# El archivo de descarga se genera solo cuando el usuario lo pide
+if 'export_requested_amort' not in st.session_state:
+    st.session_state.export_requested_amort = False
+# Último resultado con pagos extra: al editar un pago solo se recalculan los períodos siguientes
+if 'prepayment_result_amort' not in st.session_state:
+    st.session_state.prepayment_result_amort = None
+# Página visible de la tabla: solo esas filas se envían al navegador
+if 'page_amort' not in st.session_state:
+    st.session_state.page_amort = 1
+# Cuota de la calculadora inversa: toma la cuota de cada tabla nueva del sistema francés con tasa fija
+if 'payment_solver_amort' not in st.session_state:
+    st.session_state.payment_solver_amort = 1000.0
+
+
+def loan_inputs():
+    """Dibuja los datos del préstamo y devuelve sus valores."""
+    principal = st.number_input(
+        "**Monto del Préstamo (Capital Inicial)**",
+        min_value=100.0,
+        max_value=100000000.0,
+        value=st.session_state.principal_amort,
+        key='principal_input_amort',
+        step=1000.0,
+        format="%.2f",
+        help="El monto total del dinero prestado."
+    )
 
-principal = st.number_input(
-    "**Monto del Préstamo (Capital Inicial)**",
-    min_value=100.0,
-    max_value=100000000.0,
-    value=st.session_state.principal_amort,
-    key='principal_input_amort',
-    step=1000.0,
-    format="%.2f",
-    help="El monto total del dinero prestado."
-)
+    annual_interest_rate = st.number_input(
+        "**Tasa de Interés Anual (%)**",
+        min_value=0.1,
+        max_value=100.0,
+        value=st.session_state.annual_interest_rate_amort,
+        key='annual_interest_input_amort',
+        step=0.1,
+        format="%.2f",
+        help="La tasa de interés nominal anual del préstamo."
+    )
 
-annual_interest_rate = st.number_input(
-    "**Tasa de Interés Anual (%)**",
-    min_value=0.1,
-    max_value=100.0,
-    value=st.session_state.annual_interest_rate_amort,
-    key='annual_interest_input_amort',
-    step=0.1,
-    format="%.2f",
-    help="La tasa de interés nominal anual del préstamo."
-)
+    loan_term_months = st.number_input(
+        "**Plazo del Préstamo (meses)**",
+        min_value=1,
+        max_value=600,
+        value=st.session_state.loan_term_months_amort,
+        key='loan_term_input_amort',
+        step=1,
+        help="El número total de meses para pagar el préstamo."
+    )
 
-loan_term_months = st.number_input(
-    "**Plazo del Préstamo (meses)**",
-    min_value=1,
-    max_value=600,
-    value=st.session_state.loan_term_months_amort,
-    key='loan_term_input_amort',
-    step=1,
-    help="El número total de meses para pagar el préstamo."
-)
+    payment_frequency = st.selectbox(
+        "**Frecuencia de Pago**",
+        options=["Mensual", "Bimestral", "Trimestral", "Semestral", "Anual"],
+        index=["Mensual", "Bimestral", "Trimestral", "Semestral", "Anual"].index(st.session_state.payment_frequency_amort),
+        key='payment_frequency_input_amort',
+        help="Define la periodicidad con la que se realizarán los pagos."
+    )
 
-payment_frequency = st.selectbox(
-    "**Frecuencia de Pago**",
-    options=["Mensual", "Bimestral", "Trimestral", "Semestral", "Anual"],
-    index=["Mensual", "Bimestral", "Trimestral", "Semestral", "Anual"].index(st.session_state.payment_frequency_amort),
-    key='payment_frequency_input_amort',
-    help="Define la periodicidad con la que se realizarán los pagos."
-)
+    system_options = list(AMORTIZATION_SYSTEMS)
+    amortization_system = st.selectbox(
+        "**Sistema de Amortización**",
+        options=system_options,
+        index=system_options.index(st.session_state.system_amort),
+        key='system_input_amort',
+        help="Francés: cuota fija. Alemán: amortización de capital constante y cuota decreciente. "
+             "Americano: solo intereses y el capital completo al final. Escalonado: la cuota sube un porcentaje cada año."
+    )
 
-st.divider()
+    step_up_rate = 0.0
+    if amortization_system == "Escalonado":
+        step_up_rate = st.number_input(
+            "**Incremento Anual de la Cuota (%)**",
+            min_value=0.0,
+            max_value=50.0,
+            value=st.session_state.step_up_rate_amort,
+            key='step_up_rate_input_amort',
+            step=0.5,
+            format="%.2f",
+            help="Porcentaje en que sube la cuota al cumplirse cada año del préstamo."
+        )
+
+    rate_type_options = ["Fija", "Variable"]
+    rate_type = st.selectbox(
+        "**Tipo de Tasa**",
+        options=rate_type_options,
+        index=rate_type_options.index(st.session_state.rate_type_amort),
+        key='rate_type_input_amort',
+        disabled=amortization_system != "Francés",
+        help="Con tasa variable, la tasa de cada período es el índice vigente al comenzar el período más el margen, "
+             "y la cuota se recalcula en cada ajuste del índice. Disponible para el sistema francés."
+    )
+    if amortization_system != "Francés":
+        rate_type = "Fija"
+
+    spread = 0.0
+    index_curve_table = st.session_state.index_curve_amort
+    if rate_type == "Variable":
+        spread = st.number_input(
+            "**Margen sobre el Índice (%)**",
+            min_value=-20.0,
+            max_value=50.0,
+            value=st.session_state.spread_amort,
+            key='spread_input_amort',
+            step=0.25,
+            format="%.2f",
+            help="Puntos porcentuales que se suman al índice. Con tasa variable no se usa la tasa de interés anual."
+        )
+        st.markdown("**Curva del Índice** (cada tasa anual rige desde su mes hasta el ajuste siguiente)")
+        index_curve_table = st.data_editor(
+            st.session_state.index_curve_amort,
+            num_rows="dynamic",
+            key='index_curve_input_amort',
+            use_container_width=True
+        )
+
+    rounding_options = ["Sin redondeo"] + list(ROUNDING_MODES)
+    rounding = st.selectbox(
+        "**Redondeo al Centavo**",
+        options=rounding_options,
+        index=rounding_options.index(st.session_state.rounding_amort),
+        key='rounding_input_amort',
+        disabled=amortization_system != "Francés" or rate_type == "Variable",
+        help="Con redondeo, la cuota y el interés de cada período se redondean al centavo y el saldo se lleva "
+             "exacto en centavos, como en un estado de cuenta. \"Bancario\" redondea los empates al par. "
+             "Disponible para el sistema francés."
+    )
+    if amortization_system != "Francés" or rate_type == "Variable":
+        rounding = "Sin redondeo"
+
+    dates_available = amortization_system == "Francés" and rate_type == "Fija" and rounding == "Sin redondeo"
+    use_dates = st.checkbox(
+        "**Usar fechas de pago reales**",
+        value=st.session_state.dated_amort,
+        key='dated_input_amort',
+        disabled=not dates_available,
+        help="Genera la tabla con fechas desde el desembolso y calcula el interés de cada período por los días "
+             "transcurridos. Disponible para el sistema francés con tasa fija y sin redondeo."
+    ) and dates_available
+
+    start_date = st.session_state.start_date_amort
+    day_count = st.session_state.day_count_amort
+    business_day = st.session_state.business_day_amort
+    holidays_text = st.session_state.holidays_amort
+    if use_dates:
+        start_date = st.date_input(
+            "**Fecha de Desembolso**",
+            value=st.session_state.start_date_amort,
+            key='start_date_input_amort',
+            help="Los pagos caen en el mismo día de cada mes (o el último día, si el mes es más corto)."
+        )
+        col_date1, col_date2 = st.columns(2)
+        with col_date1:
+            day_count = st.selectbox(
+                "**Base de Conteo de Días**",
+                options=list(DAY_COUNTS),
+                index=list(DAY_COUNTS).index(st.session_state.day_count_amort),
+                key='day_count_input_amort',
+                help="30/360: meses de 30 días. ACT/360 y ACT/365: días reales sobre un año de 360 o 365 días."
+            )
+        with col_date2:
+            business_day = st.selectbox(
+                "**Ajuste por Día No Hábil**",
+                options=list(BUSINESS_DAY_CONVENTIONS),
+                index=list(BUSINESS_DAY_CONVENTIONS).index(st.session_state.business_day_amort),
+                key='business_day_input_amort',
+                help="Qué hacer si el pago cae en fin de semana o feriado. \"Modificado\" pasa al día hábil "
+                     "siguiente salvo que cambie de mes, en cuyo caso usa el anterior."
+            )
+        holidays_text = st.text_area(
+            "**Feriados** (una fecha AAAA-MM-DD por línea)",
+            value=st.session_state.holidays_amort,
+            key='holidays_input_amort',
+            help="Días no hábiles además de sábados y domingos."
+        )
+
+    return {
+        "principal": principal,
+        "annual_interest_rate": annual_interest_rate,
+        "loan_term_months": loan_term_months,
+        "payment_frequency": payment_frequency,
+        "system": amortization_system,
+        "step_up_rate": step_up_rate,
+        "rate_type": rate_type,
+        "spread": spread,
+        "index_curve": index_curve_table.dropna().reset_index(drop=True),
+        "rounding": rounding,
+        "use_dates": use_dates,
+        "start_date": start_date,
+        "day_count": day_count,
+        "business_day": business_day,
+        "holidays": [line.strip() for line in holidays_text.splitlines() if line.strip()],
+        "holidays_text": holidays_text,
+    }
 
-# --- Funciones de control de estado ---
-def calculate_amortization():
-    # Guarda los inputs actuales en session_state
-    st.session_state.principal_amort = principal
-    st.session_state.annual_interest_rate_amort = annual_interest_rate
-    st.session_state.loan_term_months_amort = loan_term_months
-    st.session_state.payment_frequency_amort = payment_frequency
 
+def saved_loan():
+    """Datos con los que se generó la última tabla (modo con botón)."""
+    return {
+        "principal": st.session_state.principal_amort,
+        "annual_interest_rate": st.session_state.annual_interest_rate_amort,
+        "loan_term_months": st.session_state.loan_term_months_amort,
+        "payment_frequency": st.session_state.payment_frequency_amort,
+        "system": st.session_state.system_amort,
+        "rate_type": st.session_state.rate_type_amort,
+        "rounding": st.session_state.rounding_amort,
+        "use_dates": st.session_state.dated_amort,
+    }
+
+# --- Funciones de control de estado ---
+def compute_amortization(loan):
+    """Calcula la cuota y la tabla con la caché compartida y las deja en session_state."""
     try:
-        num_payments_total = loan_term_months
-
-        if payment_frequency == "Mensual":
-            num_payments = num_payments_total
-            periodic_interest_rate = (annual_interest_rate / 100) / 12
-        elif payment_frequency == "Bimestral":
-            num_payments = num_payments_total / 2
-            periodic_interest_rate = (annual_interest_rate / 100) / 6
-        elif payment_frequency == "Trimestral":
-            num_payments = num_payments_total / 3
-            periodic_interest_rate = (annual_interest_rate / 100) / 4
-        elif payment_frequency == "Semestral":
-            num_payments = num_payments_total / 6
-            periodic_interest_rate = (annual_interest_rate / 100) / 2
-        elif payment_frequency == "Anual":
-            num_payments = num_payments_total / 12
-            periodic_interest_rate = (annual_interest_rate / 100) / 1
-        
-        num_payments = int(np.ceil(num_payments))
-
-        if num_payments <= 0:
-            st.error("El número de pagos debe ser al menos 1. Ajusta el plazo o la frecuencia.")
-            st.session_state.df_amortization_result = None
-            st.session_state.payment_amount_result = None
-            return
-
-        if periodic_interest_rate == 0:
-            payment_amount = principal / num_payments
+        if loan["use_dates"]:
+            payment_amount, df_amortization = dated_schedule(
+                loan["principal"], loan["annual_interest_rate"], loan["loan_term_months"], loan["payment_frequency"],
+                loan["start_date"], loan["day_count"], loan["business_day"], loan["holidays"]
+            )
+        elif loan["rate_type"] == "Variable":
+            curve = loan["index_curve"]
+            payment_amount, df_amortization = variable_rate_schedule(
+                loan["principal"], loan["spread"], loan["loan_term_months"], loan["payment_frequency"],
+                curve["Mes"].to_numpy(), curve["Tasa (%)"].to_numpy()
+            )
         else:
-            denominator = 1 - (1 + periodic_interest_rate)**(-num_payments)
-            if denominator == 0:
-                st.error("Error en el cálculo de la cuota fija. La tasa de interés o el plazo pueden ser inválidos.")
-                st.session_state.df_amortization_result = None
-                st.session_state.payment_amount_result = None
-                return
-            payment_amount = (principal * periodic_interest_rate) / denominator
-
-        st.session_state.payment_amount_result = payment_amount
-
-        amortization_data = []
-        remaining_principal = principal
-
-        for i in range(1, int(num_payments) + 1):
-            current_period_initial_principal = remaining_principal
-
-            interest_payment = current_period_initial_principal * periodic_interest_rate
-            principal_payment = payment_amount - interest_payment
-
-            if i == num_payments:
-                principal_payment = current_period_initial_principal
-                payment_amount = principal_payment + interest_payment
-                remaining_principal = 0.0
-            else:
-                remaining_principal -= principal_payment
-
-            amortization_data.append({
-                "Período": i,
-                # --- CAMBIO CLAVE AQUÍ: Formatear como entero (sin .2f) ---
-                "Capital Inicial del Período": f"{round(current_period_initial_principal):,}",
-                "Cuota Fija": f"{round(payment_amount):,}",
-                "Intereses": f"{round(interest_payment):,}",
-                "Capital Amortizado": f"{round(principal_payment):,}",
-                "Capital Pendiente": f"{round(remaining_principal):,}"
-            })
-
-        df_amortization = pd.DataFrame(amortization_data)
-        st.session_state.df_amortization_result = df_amortization
-
+            payment_amount, df_amortization = amortization_schedule(
+                loan["principal"], loan["annual_interest_rate"], loan["loan_term_months"], loan["payment_frequency"],
+                rounding=None if loan["rounding"] == "Sin redondeo" else loan["rounding"],
+                system=loan["system"], step_up_rate=loan["step_up_rate"]
+            )
+    except ValueError as e:
+        st.error(str(e))
+        clear_amortization_results()
+        return
     except Exception as e:
         st.error(f"Ocurrió un error al calcular la tabla de amortización. Por favor, revisa los valores ingresados. Detalles: {e}")
-        st.session_state.df_amortization_result = None
-        st.session_state.payment_amount_result = None
+        clear_amortization_results()
+        return
+
+    # La caché devuelve la misma tabla para los mismos datos: la descarga pedida y los pagos extra
+    # solo se descartan si la tabla cambió
+    if df_amortization is not st.session_state.df_amortization_result:
+        st.session_state.export_requested_amort = False
+        st.session_state.prepayment_result_amort = None
+        st.session_state.page_amort = 1
+        if solver_available(loan):
+            st.session_state.payment_solver_amort = float(round(payment_amount, 2))
+    st.session_state.payment_amount_result = payment_amount
+    # La tabla se guarda numérica; el formato se aplica solo al mostrarla o exportarla
+    st.session_state.df_amortization_result = df_amortization
+
+
+def calculate_amortization(loan):
+    # Guarda los inputs actuales en session_state
+    st.session_state.principal_amort = loan["principal"]
+    st.session_state.annual_interest_rate_amort = loan["annual_interest_rate"]
+    st.session_state.loan_term_months_amort = loan["loan_term_months"]
+    st.session_state.payment_frequency_amort = loan["payment_frequency"]
+    st.session_state.rounding_amort = loan["rounding"]
+    st.session_state.system_amort = loan["system"]
+    if loan["system"] == "Escalonado":
+        st.session_state.step_up_rate_amort = loan["step_up_rate"]
+    st.session_state.rate_type_amort = loan["rate_type"]
+    st.session_state.dated_amort = loan["use_dates"]
+    if loan["use_dates"]:
+        st.session_state.start_date_amort = loan["start_date"]
+        st.session_state.day_count_amort = loan["day_count"]
+        st.session_state.business_day_amort = loan["business_day"]
+        st.session_state.holidays_amort = loan["holidays_text"]
+    if loan["rate_type"] == "Variable":
+        st.session_state.spread_amort = loan["spread"]
+        st.session_state.index_curve_amort = loan["index_curve"]
+    compute_amortization(loan)
+
+
+def clear_amortization_results():
+    st.session_state.page_amort = 1
+    st.session_state.df_amortization_result = None
+    st.session_state.payment_amount_result = None
+    st.session_state.export_requested_amort = False
+    st.session_state.prepayment_result_amort = None
 
 
 def reset_amortization():
@@ -162,9 +353,50 @@ def reset_amortization():
     st.session_state.annual_interest_rate_amort = 5.0
     st.session_state.loan_term_months_amort = 60
     st.session_state.payment_frequency_amort = "Mensual"
-    st.session_state.df_amortization_result = None
-    st.session_state.payment_amount_result = None
+    st.session_state.rounding_amort = "Sin redondeo"
+    st.session_state.system_amort = "Francés"
+    st.session_state.step_up_rate_amort = 5.0
+    st.session_state.rate_type_amort = "Fija"
+    st.session_state.spread_amort = 1.5
+    st.session_state.index_curve_amort = pd.DataFrame({"Mes": [0, 12, 24, 36], "Tasa (%)": [4.0, 4.5, 5.25, 4.75]})
+    st.session_state.dated_amort = False
+    st.session_state.start_date_amort = datetime.date.today()
+    st.session_state.day_count_amort = "30/360"
+    st.session_state.business_day_amort = "Sin ajuste"
+    st.session_state.holidays_amort = ""
+    # Los widgets visibles guardan su propio valor (y el editor de la curva, sus ediciones): se descartan para
+    # que vuelvan a tomar los valores por defecto, también al pasar luego al modo en vivo
+    for key in [key for key in st.session_state if key.endswith("_input_amort")]:
+        del st.session_state[key]
+    st.session_state.payment_solver_amort = 1000.0
+    clear_amortization_results()
+
+
+def request_export_amortization():
+    st.session_state.export_requested_amort = True
+
+
+def cancel_export_amortization():
+    # Al cambiar de formato se vuelve a pedir el archivo
+    st.session_state.export_requested_amort = False
+
+
+def go_to_period(page_size):
+    # La página que contiene el período pedido (los períodos van de 1 en 1 desde el primero)
+    st.session_state.page_amort = page_of_row(st.session_state.jump_period_amort - 1, page_size)
+
+
+def reset_page():
+    st.session_state.page_amort = 1
+
 
+def to_export(df, export_format, amount_format):
+    # La caché compartida guarda el archivo según el contenido de la tabla y el formato (y en disco, si está activa)
+    # En Excel solo los montos llevan separador de miles; la tasa y la fracción de año, los decimales de la pantalla
+    column_formats = {col: amount_format for col in SCHEDULE_COLUMNS[1:]}
+    column_formats["Tasa Anual (%)"] = "0.00"
+    column_formats["Fracción de Año"] = "0.000000"
+    return export_table(df, export_format, sheet_name='Amortizacion', column_formats=column_formats)
 
 # --- Estilo para los botones ---
 st.markdown(
@@ -196,52 +428,245 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# --- Botones de Acción (Generar y Limpiar) ---
-col1, col2, col3 = st.columns([1, 1, 1])
 
-with col1:
-    st.button("Generar Tabla", on_click=calculate_amortization)
-
-with col3:
-    st.button("Limpiar Valores", on_click=reset_amortization)
+def schedule_column_config(columns, step):
+    # Separador de miles y decimales según ``step`` (1: enteros, 0.01: centavos), aplicados en el navegador
+    config = {col: st.column_config.NumberColumn(format="localized", step=step) for col in columns}
+    config["Tasa Anual (%)"] = st.column_config.NumberColumn(format="%.2f")
+    config["Fecha de Pago"] = st.column_config.DateColumn(format="YYYY-MM-DD")
+    config["Fracción de Año"] = st.column_config.NumberColumn(format="%.6f")
+    return config
+
+
+# --- Salida de la Cuota Fija y de la Tabla ---
+def show_amortization(loan):
+    """Cuota, tabla, descarga y pagos extra del último resultado, calculado con los datos de ``loan``."""
+    if st.session_state.payment_amount_result is not None:
+        st.markdown("---")
+        # Solo el sistema francés tiene cuota fija; en los demás se muestra la primera cuota
+        fixed_installment = loan["system"] == "Francés" and loan["rate_type"] == "Fija"
+        payment_label = "Cuota Fija Periódica" if fixed_installment else "Primera Cuota"
+        # --- CAMBIO CLAVE AQUÍ: Formatear como entero (sin .2f) ---
+        if loan["rounding"] == "Sin redondeo":
+            st.success(f"**{payment_label}:** $ {round(st.session_state.payment_amount_result):,}")
+        else:
+            st.success(f"**{payment_label}:** $ {st.session_state.payment_amount_result:,.2f}")
+        st.markdown("---")
+
+    # --- Mostrar Resultados de la Tabla (si existen en session_state) ---
+    if st.session_state.df_amortization_result is not None:
+        st.subheader("Detalle de la Tabla de Amortización")
+        df_amortization = st.session_state.df_amortization_result
+        # Con redondeo al centavo se muestran los centavos exactos
+        step = 1 if loan["rounding"] == "Sin redondeo" else 0.01
+        table_view = st.radio(
+            "**Vista**",
+            ["Por período", "Por año"],
+            key='table_view_amort',
+            horizontal=True,
+            help="Por año suma las cuotas, los intereses y el capital amortizado de cada año del préstamo."
+        )
+        # Solo se envían al navegador las filas visibles; la descarga incluye la tabla completa
+        if table_view == "Por año":
+            periods_per_year = 12 // PAYMENT_FREQUENCIES[loan["payment_frequency"]]
+            st.dataframe(
+                yearly_schedule(df_amortization, periods_per_year),
+                column_config=schedule_column_config(YEARLY_COLUMNS[1:], step),
+                hide_index=True
+            )
+        else:
+            col_page1, col_page2, col_page3 = st.columns(3)
+            with col_page1:
+                page_size = st.selectbox("**Filas por página**", PAGE_SIZES, index=1, key='page_size_amort',
+                                         on_change=reset_page)
+            num_pages = page_count(len(df_amortization), page_size)
+            with col_page2:
+                page = st.number_input("**Página**", min_value=1, max_value=num_pages, step=1, key='page_amort')
+            with col_page3:
+                st.number_input("**Ir al período**", min_value=1, max_value=len(df_amortization), value=1, step=1,
+                                key='jump_period_amort', on_change=go_to_period, args=(page_size,))
+            start, stop = page_bounds(len(df_amortization), page_size, page)
+            # El formato lo aplica el navegador: con ``Styler`` armar 600 filas tarda más que calcularlas
+            st.dataframe(
+                df_amortization.iloc[start:stop],
+                column_config=schedule_column_config(SCHEDULE_COLUMNS[1:], step),
+                hide_index=True
+            )
+            st.caption(f"Períodos {start + 1:,} a {stop:,} de {len(df_amortization):,} (página {page} de {num_pages}).")
+
+        # --- Descarga de la tabla (el archivo se arma solo al pedirlo) ---
+        export_format = st.selectbox(
+            "**Formato de descarga**",
+            list(EXPORT_FORMATS),
+            key='export_format_amort',
+            on_change=cancel_export_amortization,
+            help="Parquet y Arrow son más livianos y rápidos de cargar en herramientas de análisis."
+        )
+        extension, mime, _ = EXPORT_FORMATS[export_format]
+        if st.session_state.export_requested_amort:
+            st.download_button(
+                label=f"Descargar Tabla en {export_format}",
+                data=to_export(
+                    st.session_state.df_amortization_result, export_format,
+                    "#,##0" if loan["rounding"] == "Sin redondeo" else "#,##0.00"
+                ),
+                file_name=f"tabla_amortizacion{extension}",
+                mime=mime,
+                help="Descarga la tabla de amortización completa en el formato elegido."
+            )
+        else:
+            st.button("Preparar Descarga", key='prepare_export_amort', on_click=request_export_amortization,
+                      help="Genera el archivo con la tabla de amortización para descargarlo.")
+
+        # --- Pagos extraordinarios (¿qué pasa si pago más?) ---
+        if (loan["system"] == "Francés" and loan["rounding"] == "Sin redondeo" and loan["rate_type"] == "Fija"
+                and not loan["use_dates"]):
+            with st.expander("Simular Pagos Extraordinarios"):
+                prepayment_mode = st.radio(
+                    "**Al hacer un pago extra**",
+                    PREPAYMENT_MODES,
+                    key='prepayment_mode_amort',
+                    horizontal=True,
+                    help="Reducir plazo: se mantiene la cuota y el préstamo termina antes. "
+                         "Reducir cuota: se mantiene el plazo y baja la cuota de los períodos siguientes."
+                )
+                st.markdown("**Pagos únicos**")
+                one_off_table = st.data_editor(
+                    pd.DataFrame({"Período": pd.Series(dtype="int64"), "Monto": pd.Series(dtype="float64")}),
+                    num_rows="dynamic",
+                    key='one_off_extras_amort',
+                    use_container_width=True
+                )
+                col_extra1, col_extra2, col_extra3 = st.columns(3)
+                with col_extra1:
+                    recurring_amount = st.number_input("**Pago recurrente**", min_value=0.0, value=0.0, step=100.0,
+                                                       format="%.2f", key='recurring_extra_amort')
+                with col_extra2:
+                    recurring_every = st.number_input("**Cada (períodos)**", min_value=1, value=1, step=1,
+                                                      key='recurring_every_amort')
+                with col_extra3:
+                    recurring_start = st.number_input("**Desde el período**", min_value=1, value=1, step=1,
+                                                      key='recurring_start_amort')
+
+                num_payments = len(st.session_state.df_amortization_result)
+                one_off_table = one_off_table.dropna()
+                try:
+                    extras = extra_payments(
+                        num_payments, zip(one_off_table["Período"], one_off_table["Monto"]),
+                        recurring_amount, recurring_every, recurring_start
+                    )
+                    terms = (loan["principal"], loan["annual_interest_rate"], loan["loan_term_months"],
+                             loan["payment_frequency"])
+                    prepayment_result = prepayment_schedule(
+                        *terms, extras, prepayment_mode, previous=st.session_state.prepayment_result_amort
+                    )
+                    st.session_state.prepayment_result_amort = prepayment_result
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    summary = prepayment_summary(prepayment_result, *terms)
+                    col_metric1, col_metric2, col_metric3 = st.columns(3)
+                    col_metric1.metric("Pagos", f"{summary['Pagos']:,}", summary['Pagos'] - summary['Pagos sin Extras'],
+                                       delta_color="inverse")
+                    col_metric2.metric("Intereses Totales", f"$ {summary['Intereses']:,.0f}")
+                    col_metric3.metric("Ahorro en Intereses", f"$ {summary['Ahorro en Intereses']:,.0f}")
+                    st.dataframe(
+                        pd.DataFrame(prepayment_result["arrays"], columns=PREPAYMENT_COLUMNS),
+                        column_config=schedule_column_config(PREPAYMENT_COLUMNS[1:], 1)
+                    )
+
+
+# --- Calculadora inversa: capital, tasa o plazo a partir de la cuota ---
+def solver_available(loan):
+    # Los despejes usan la cuota fija del sistema francés con la tasa anual ingresada
+    return loan["system"] == "Francés" and loan["rate_type"] == "Fija"
+
+
+def payment_solver(loan):
+    st.subheader("Calcular a partir de la Cuota")
+    if not solver_available(loan):
+        st.info("El cálculo a partir de la cuota está disponible para el sistema francés con tasa fija.")
+        return
+    st.markdown("Despeja el dato que falta usando la cuota y los demás datos del préstamo ingresados arriba.")
+    unknown = st.radio(
+        "**Dato a calcular**",
+        ["Capital", "Tasa", "Plazo"],
+        key='unknown_solver_amort',
+        horizontal=True,
+        help="Capital: monto máximo para una cuota presupuestada. Tasa: tasa implícita en una cuota cotizada. "
+             "Plazo: pagos necesarios para cancelar el capital con esa cuota."
+    )
+    target_payment = st.number_input(
+        "**Cuota Periódica**",
+        min_value=0.01,
+        key='payment_solver_amort',
+        step=100.0,
+        format="%.2f",
+        help="Cuota del sistema francés con la frecuencia de pago elegida."
+    )
+    if unknown == "Capital":
+        max_principal = solve_principal(target_payment, loan["annual_interest_rate"], loan["loan_term_months"],
+                                        loan["payment_frequency"])[0]
+        st.success(f"**Capital Máximo:** $ {max_principal:,.2f}")
+    elif unknown == "Tasa":
+        implied_rates, rate_status = solve_rate(loan["principal"], target_payment, loan["loan_term_months"],
+                                                loan["payment_frequency"])
+        if rate_status[0] == SOLVED:
+            tea = effective_annual_rates(implied_rates, loan["payment_frequency"])[0]
+            st.success(f"**Tasa Nominal Anual:** {implied_rates[0]:,.4f}%  |  **TEA:** {tea:,.4f}%")
+        else:
+            st.error(f"{STATUS_LABELS[int(rate_status[0])]}: la cuota no alcanza a devolver el capital en ese plazo.")
+    else:
+        term_solution = solve_term(loan["principal"], target_payment, loan["annual_interest_rate"],
+                                   loan["payment_frequency"])
+        if term_solution["status"][0] == SOLVED:
+            st.success(
+                f"**Número de Pagos:** {term_solution['num_payments'][0]:,} ({term_solution['term_months'][0]:,} meses)  "
+                f"|  **Último Pago:** $ {term_solution['last_payment'][0]:,.2f}"
+            )
+        else:
+            st.error(f"{STATUS_LABELS[int(term_solution['status'][0])]}: la cuota no cubre los intereses del período.")
+
+# --- Calculadora: datos, botones y resultados ---
+def amortization_panel(live):
+    """Datos del préstamo y resultados. En modo en vivo se ejecuta como fragmento y recalcula sin botón."""
+    start = time.perf_counter()
+    loan = loan_inputs()
+    st.divider()
+
+    if live:
+        # Cada cambio recalcula con la caché compartida; los datos ya vistos no se vuelven a calcular
+        compute_amortization(loan)
+        result_loan = loan
+    else:
+        # --- Botones de Acción (Generar y Limpiar) ---
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            st.button("Generar Tabla", on_click=calculate_amortization, args=(loan,))
+
+        with col3:
+            st.button("Limpiar Valores", on_click=reset_amortization)
+        result_loan = saved_loan()
+
+    show_amortization(result_loan)
+    if live:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"Modo en vivo: recalculado en {elapsed_ms:.1f} ms (presupuesto: {LIVE_BUDGET_MS} ms).")
 
-# --- Salida de la Cuota Fija ---
-if st.session_state.payment_amount_result is not None:
-    st.markdown("---")
-    # --- CAMBIO CLAVE AQUÍ: Formatear como entero (sin .2f) ---
-    st.success(f"**Cuota Fija Periódica:** $ {round(st.session_state.payment_amount_result):,}")
     st.markdown("---")
+    payment_solver(loan)
 
-# --- Mostrar Resultados de la Tabla (si existen en session_state) ---
-if st.session_state.df_amortization_result is not None:
-    st.subheader("Detalle de la Tabla de Amortización")
-    st.dataframe(st.session_state.df_amortization_result)
-
-    # --- Botón para descargar Excel ---
-    @st.cache_data
-    def to_excel(df):
-        output = BytesIO()
-        df_for_excel = df.copy()
-        for col in ["Capital Inicial del Período", "Cuota Fija", "Intereses", "Capital Amortizado", "Capital Pendiente"]:
-            if col in df_for_excel.columns:
-                # Remove any formatting (like commas) and convert back to numeric
-                # Since they are strings now like "1,234", we need to remove comma before converting to float/int
-                df_for_excel[col] = df_for_excel[col].str.replace(',', '').astype(float) # Keep as float for excel
-        
-        writer = pd.ExcelWriter(output, engine='xlsxwriter')
-        df_for_excel.to_excel(writer, index=False, sheet_name='Amortizacion')
-        writer.close()
-        processed_data = output.getvalue()
-        return processed_data
-
-    excel_data = to_excel(st.session_state.df_amortization_result)
-    st.download_button(
-        label="Descargar Tabla en Excel",
-        data=excel_data,
-        file_name="tabla_amortizacion.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        help="Descarga la tabla de amortización completa como un archivo de Excel."
-    )
+
+live_mode = st.toggle(
+    "**Modo en vivo**",
+    key='live_mode_amort',
+    on_change=clear_amortization_results,
+    help="Recalcula la tabla al confirmar cada dato (Enter o al salir del campo), sin pulsar \"Generar Tabla\". "
+         "Solo se vuelve a ejecutar la calculadora, no toda la página."
+)
+# En modo en vivo los cambios vuelven a ejecutar solo el fragmento: el estilo y la barra lateral quedan como están
+(st.fragment(amortization_panel) if live_mode else amortization_panel)(live_mode)
 
 st.markdown("---")
 
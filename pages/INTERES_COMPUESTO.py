@@ -1,7 +1,16 @@
+import os
+import time
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-from io import BytesIO
+
+from finanzas.cache import compound_interest_projection, export_table
+from finanzas.exportacion import EXPORT_FORMATS
+from finanzas.interes_compuesto import COMPOUND_COLUMNS
+from finanzas.simulacion import DISTRIBUTIONS, monte_carlo_projection
+
+# Tiempo máximo del recálculo en modo en vivo (ver benchmarks/bench_modo_en_vivo.py)
+LIVE_BUDGET_MS = 50
 
 st.set_page_config(page_title="Calculadora de Interés Compuesto", page_icon="images/finance.png", layout="centered")
 
@@ -39,171 +48,124 @@ if 'total_invested_result' not in st.session_state:
     st.session_state.total_invested_result = None
 if 'total_interest_result' not in st.session_state:
     st.session_state.total_interest_result = None
+# El archivo de descarga se genera solo cuando el usuario lo pide
+if 'export_requested_ic' not in st.session_state:
+    st.session_state.export_requested_ic = False
+
+
+def investment_inputs():
+    """Dibuja los datos de la inversión y devuelve sus valores."""
+    initial_investment = st.number_input(
+        "**Monto de Inversión Inicial**",
+        min_value=0.0,
+        max_value=100000000.0,
+        value=st.session_state.initial_investment,
+        key='initial_investment_input',
+        step=100.0,
+        format="%.2f",
+        help="El capital inicial que se invierte."
+    )
 
+    annual_contribution = st.number_input(
+        "**Aporte Periódico (Anual)**",
+        min_value=0.0,
+        max_value=1000000.0,
+        value=st.session_state.annual_contribution,
+        key='annual_contribution_input',
+        step=10.0,
+        format="%.2f",
+        help="Monto que se añade a la inversión cada año."
+    )
 
-initial_investment = st.number_input(
-    "**Monto de Inversión Inicial**",
-    min_value=0.0,
-    max_value=100000000.0,
-    value=st.session_state.initial_investment,
-    key='initial_investment_input',
-    step=100.0,
-    format="%.2f",
-    help="El capital inicial que se invierte."
-)
+    annual_interest_rate = st.number_input(
+        "**Tasa de Interés Anual (%)**",
+        min_value=0.1,
+        max_value=100.0,
+        value=st.session_state.annual_interest_rate_ic,
+        key='annual_interest_input_ic',
+        step=0.1,
+        format="%.2f",
+        help="La tasa de rendimiento anual esperada de la inversión."
+    )
 
-annual_contribution = st.number_input(
-    "**Aporte Periódico (Anual)**",
-    min_value=0.0,
-    max_value=1000000.0,
-    value=st.session_state.annual_contribution,
-    key='annual_contribution_input',
-    step=10.0,
-    format="%.2f",
-    help="Monto que se añade a la inversión cada año."
-)
+    investment_term_years = st.number_input(
+        "**Plazo de la Inversión (años)**",
+        min_value=1,
+        max_value=100,
+        value=st.session_state.investment_term_years,
+        key='investment_term_input',
+        step=1,
+        help="El número total de años que durará la inversión."
+    )
 
-annual_interest_rate = st.number_input(
-    "**Tasa de Interés Anual (%)**",
-    min_value=0.1,
-    max_value=100.0,
-    value=st.session_state.annual_interest_rate_ic,
-    key='annual_interest_input_ic',
-    step=0.1,
-    format="%.2f",
-    help="La tasa de rendimiento anual esperada de la inversión."
-)
+    compounding_frequency = st.selectbox(
+        "**Frecuencia de Capitalización**",
+        options=["Anual", "Semestral", "Trimestral", "Mensual", "Diario"],
+        index=["Anual", "Semestral", "Trimestral", "Mensual", "Diario"].index(st.session_state.compounding_frequency_ic),
+        key='compounding_freq_ic',
+        help="La frecuencia con la que los intereses se suman al capital."
+    )
 
-investment_term_years = st.number_input(
-    "**Plazo de la Inversión (años)**",
-    min_value=1,
-    max_value=100,
-    value=st.session_state.investment_term_years,
-    key='investment_term_input',
-    step=1,
-    help="El número total de años que durará la inversión."
-)
+    contribution_frequency = st.selectbox(
+        "**Frecuencia del Aporte**",
+        options=["Anual", "Semestral", "Trimestral", "Mensual", "Ninguno"],
+        index=["Anual", "Semestral", "Trimestral", "Mensual", "Ninguno"].index(st.session_state.contribution_frequency),
+        key='contribution_freq_ic',
+        help="La frecuencia con la que se realizan los aportes adicionales. 'Anual' significa el monto total del 'Aporte Periódico (Anual)'."
+    )
 
-compounding_frequency = st.selectbox(
-    "**Frecuencia de Capitalización**",
-    options=["Anual", "Semestral", "Trimestral", "Mensual", "Diario"],
-    index=["Anual", "Semestral", "Trimestral", "Mensual", "Diario"].index(st.session_state.compounding_frequency_ic),
-    key='compounding_freq_ic',
-    help="La frecuencia con la que los intereses se suman al capital."
-)
 
-contribution_frequency = st.selectbox(
-    "**Frecuencia del Aporte**",
-    options=["Anual", "Semestral", "Trimestral", "Mensual", "Ninguno"],
-    index=["Anual", "Semestral", "Trimestral", "Mensual", "Ninguno"].index(st.session_state.contribution_frequency),
-    key='contribution_freq_ic',
-    help="La frecuencia con la que se realizan los aportes adicionales. 'Anual' significa el monto total del 'Aporte Periódico (Anual)'."
-)
+    return {
+        "initial_investment": initial_investment,
+        "annual_contribution": annual_contribution,
+        "annual_interest_rate": annual_interest_rate,
+        "investment_term_years": investment_term_years,
+        "compounding_frequency": compounding_frequency,
+        "contribution_frequency": contribution_frequency,
+    }
 
-st.divider()
 
 # --- Funciones de cálculo ---
 
-def calculate_compound_interest():
-    # Guarda los inputs actuales en session_state
-    st.session_state.initial_investment = initial_investment
-    st.session_state.annual_contribution = annual_contribution
-    st.session_state.annual_interest_rate_ic = annual_interest_rate
-    st.session_state.investment_term_years = investment_term_years
-    st.session_state.compounding_frequency_ic = compounding_frequency
-    st.session_state.contribution_frequency = contribution_frequency
-
+def compute_compound_interest(investment):
+    """Calcula la proyección con la caché compartida y la deja en session_state."""
     try:
-        rate_decimal = annual_interest_rate / 100
-
-        # Determinar periodos de capitalización por año (m)
-        if compounding_frequency == "Anual":
-            m = 1
-        elif compounding_frequency == "Semestral":
-            m = 2
-        elif compounding_frequency == "Trimestral":
-            m = 4
-        elif compounding_frequency == "Mensual":
-            m = 12
-        elif compounding_frequency == "Diario":
-            m = 365
-        else: # Default a Mensual si hay un valor inesperado
-            m = 12
-        
-        # Tasa de interés periódica
-        periodic_rate = rate_decimal / m
-        
-        # Determinar frecuencia de aportes
-        if contribution_frequency == "Anual":
-            contribution_multiplier = 1
-        elif contribution_frequency == "Semestral":
-            contribution_multiplier = 2
-        elif contribution_frequency == "Trimestral":
-            contribution_multiplier = 4
-        elif contribution_frequency == "Mensual":
-            contribution_multiplier = 12
-        elif contribution_frequency == "Ninguno":
-            contribution_multiplier = 0 # No hay aportes periódicos
-
-        # Calcular el aporte periódico real si no es anual
-        # annual_contribution es el monto TOTAL anual. Si se hace mensual, se divide.
-        periodic_contribution_amount = 0
-        if contribution_multiplier > 0:
-            periodic_contribution_amount = annual_contribution / contribution_multiplier
-
-
-        data = []
-        current_balance = initial_investment
-        total_contributed = initial_investment # Suma de la inversión inicial y los aportes periódicos
-        
-        # Convertir el plazo total a número de periodos de capitalización
-        total_compounding_periods = investment_term_years * m
-
-        # Ajustar el total de aportes adicionales
-        total_additional_contributions = 0
-
-
-        for year in range(1, investment_term_years + 1):
-            balance_start_of_year = current_balance
-            interests_this_year = 0
-            contributions_this_year = 0
-
-            for period_in_year in range(1, m + 1): # Bucle para cada período de capitalización dentro del año
-                # Calcular interés del período
-                interest_for_period = current_balance * periodic_rate
-                interests_this_year += interest_for_period
-                current_balance += interest_for_period
-
-                # Añadir aportes periódicos si aplica
-                # Sólo añade si el periodo actual es un multiplo de la frecuencia de aporte
-                if contribution_multiplier > 0 and (period_in_year % (m / contribution_multiplier) == 0):
-                    current_balance += periodic_contribution_amount
-                    contributions_this_year += periodic_contribution_amount
-                    total_additional_contributions += periodic_contribution_amount
-
-            total_contributed += contributions_this_year # Suma los aportes del año al total
-            
-            data.append({
-                "Año": year,
-                "Saldo Inicial del Año": f"{round(balance_start_of_year):,}",
-                "Aportes del Año": f"{round(contributions_this_year):,}",
-                "Intereses Ganados en el Año": f"{round(interests_this_year):,}",
-                "Saldo Final del Año": f"{round(current_balance):,}"
-            })
-
-        df_compound = pd.DataFrame(data)
-        st.session_state.df_compound_result = df_compound
-        st.session_state.final_value_result = current_balance
-        st.session_state.total_invested_result = initial_investment + total_additional_contributions
-        st.session_state.total_interest_result = current_balance - (initial_investment + total_additional_contributions)
-
-
+        df_compound, summary = compound_interest_projection(
+            investment["initial_investment"], investment["annual_contribution"], investment["annual_interest_rate"],
+            investment["investment_term_years"], investment["compounding_frequency"],
+            investment["contribution_frequency"]
+        )
     except Exception as e:
         st.error(f"Ocurrió un error al calcular el interés compuesto. Por favor, revisa los valores ingresados. Detalles: {e}")
-        st.session_state.df_compound_result = None
-        st.session_state.final_value_result = None
-        st.session_state.total_invested_result = None
-        st.session_state.total_interest_result = None
+        clear_compound_results()
+        return
+
+    # La caché devuelve la misma tabla para los mismos datos: la descarga pedida solo se descarta si cambió
+    if df_compound is not st.session_state.df_compound_result:
+        st.session_state.export_requested_ic = False
+    st.session_state.df_compound_result = df_compound
+    st.session_state.final_value_result = summary["final_value"]
+    st.session_state.total_invested_result = summary["total_invested"]
+    st.session_state.total_interest_result = summary["total_interest"]
+
+
+def calculate_compound_interest(investment):
+    # Guarda los inputs actuales en session_state
+    st.session_state.initial_investment = investment["initial_investment"]
+    st.session_state.annual_contribution = investment["annual_contribution"]
+    st.session_state.annual_interest_rate_ic = investment["annual_interest_rate"]
+    st.session_state.investment_term_years = investment["investment_term_years"]
+    st.session_state.compounding_frequency_ic = investment["compounding_frequency"]
+    st.session_state.contribution_frequency = investment["contribution_frequency"]
+    compute_compound_interest(investment)
+
+
+def clear_compound_results():
+    st.session_state.df_compound_result = None
+    st.session_state.final_value_result = None
+    st.session_state.total_invested_result = None
+    st.session_state.total_interest_result = None
+    st.session_state.export_requested_ic = False
 
 
 def reset_compound():
@@ -213,10 +175,23 @@ def reset_compound():
     st.session_state.investment_term_years = 10
     st.session_state.compounding_frequency_ic = "Mensual"
     st.session_state.contribution_frequency = "Mensual"
-    st.session_state.df_compound_result = None
-    st.session_state.final_value_result = None
-    st.session_state.total_invested_result = None
-    st.session_state.total_interest_result = None
+    clear_compound_results()
+    st.session_state.mc_result_ic = None
+
+
+def request_export_compound():
+    st.session_state.export_requested_ic = True
+
+
+def cancel_export_compound():
+    # Al cambiar de formato se vuelve a pedir el archivo
+    st.session_state.export_requested_ic = False
+
+
+def to_export_compound(df, export_format):
+    # La caché compartida guarda el archivo según el contenido de la tabla y el formato (y en disco, si está activa)
+    return export_table(df, export_format, sheet_name='Interes_Compuesto',
+                        column_formats={col: "#,##0" for col in COMPOUND_COLUMNS[1:]})
 
 
 # --- Estilo para los botones ---
@@ -249,52 +224,169 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# --- Botones de Acción (Generar y Limpiar) ---
-col1, col2, col3 = st.columns([1, 1, 1])
-
-with col1:
-    st.button("Calcular Proyección", on_click=calculate_compound_interest)
-
-with col3:
-    st.button("Limpiar Valores", on_click=reset_compound)
-
 # --- Salida de los Resultados ---
-if st.session_state.final_value_result is not None:
-    st.markdown("---")
-    st.success(f"**Valor Futuro de la Inversión:** $ {round(st.session_state.final_value_result):,}")
-    st.info(f"**Capital Total Aportado:** $ {round(st.session_state.total_invested_result):,}")
-    st.info(f"**Intereses Totales Ganados:** $ {round(st.session_state.total_interest_result):,}")
-    st.markdown("---")
-
-# --- Mostrar Resultados de la Tabla (si existen en session_state) ---
-if st.session_state.df_compound_result is not None:
-    st.subheader("Detalle del Crecimiento Anual")
-    st.dataframe(st.session_state.df_compound_result, height=300) # Altura fija para la tabla
-
-    # --- Botón para descargar Excel ---
-    @st.cache_data
-    def to_excel_compound(df):
-        output = BytesIO()
-        df_for_excel = df.copy()
-        # Convertir columnas numéricas a float antes de exportar
-        for col in ["Saldo Inicial del Año", "Aportes del Año", "Intereses Ganados en el Año", "Saldo Final del Año"]:
-            if col in df_for_excel.columns:
-                df_for_excel[col] = df_for_excel[col].str.replace(',', '').astype(float)
-        
-        writer = pd.ExcelWriter(output, engine='xlsxwriter')
-        df_for_excel.to_excel(writer, index=False, sheet_name='Interes_Compuesto')
-        writer.close()
-        processed_data = output.getvalue()
-        return processed_data
-
-    excel_data_compound = to_excel_compound(st.session_state.df_compound_result)
-    st.download_button(
-        label="Descargar Proyección en Excel",
-        data=excel_data_compound,
-        file_name="proyeccion_interes_compuesto.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        help="Descarga la tabla de proyección de interés compuesto como un archivo de Excel."
+def show_compound():
+    """Valor final, tabla anual y descarga de la última proyección."""
+    if st.session_state.final_value_result is not None:
+        st.markdown("---")
+        st.success(f"**Valor Futuro de la Inversión:** $ {round(st.session_state.final_value_result):,}")
+        st.info(f"**Capital Total Aportado:** $ {round(st.session_state.total_invested_result):,}")
+        st.info(f"**Intereses Totales Ganados:** $ {round(st.session_state.total_interest_result):,}")
+        st.markdown("---")
+
+    # --- Mostrar Resultados de la Tabla (si existen en session_state) ---
+    if st.session_state.df_compound_result is not None:
+        st.subheader("Detalle del Crecimiento Anual")
+        st.dataframe(
+            st.session_state.df_compound_result,
+            # Separador de miles y sin decimales, aplicado en el navegador
+            column_config={col: st.column_config.NumberColumn(format="localized", step=1) for col in COMPOUND_COLUMNS[1:]},
+            height=300 # Altura fija para la tabla
+        )
+
+        # --- Descarga de la tabla (el archivo se arma solo al pedirlo) ---
+        export_format_ic = st.selectbox(
+            "**Formato de descarga**",
+            list(EXPORT_FORMATS),
+            key='export_format_ic',
+            on_change=cancel_export_compound,
+            help="Parquet y Arrow son más livianos y rápidos de cargar en herramientas de análisis."
+        )
+        extension_ic, mime_ic, _ = EXPORT_FORMATS[export_format_ic]
+        if st.session_state.export_requested_ic:
+            st.download_button(
+                label=f"Descargar Proyección en {export_format_ic}",
+                data=to_export_compound(st.session_state.df_compound_result, export_format_ic),
+                file_name=f"proyeccion_interes_compuesto{extension_ic}",
+                mime=mime_ic,
+                help="Descarga la tabla de proyección de interés compuesto en el formato elegido."
+            )
+        else:
+            st.button("Preparar Descarga", key='prepare_export_ic', on_click=request_export_compound,
+                      help="Genera el archivo con la proyección para descargarlo.")
+
+
+# --- Calculadora: datos, botones y resultados ---
+def compound_panel(live):
+    """Datos de la inversión y resultados. En modo en vivo se ejecuta como fragmento y recalcula sin botón."""
+    start = time.perf_counter()
+    investment = investment_inputs()
+    st.divider()
+
+    if live:
+        # Cada cambio recalcula con la caché compartida; los datos ya vistos no se vuelven a calcular
+        compute_compound_interest(investment)
+    else:
+        # --- Botones de Acción (Generar y Limpiar) ---
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            st.button("Calcular Proyección", on_click=calculate_compound_interest, args=(investment,))
+
+        with col3:
+            st.button("Limpiar Valores", on_click=reset_compound)
+
+    show_compound()
+    if live:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"Modo en vivo: recalculado en {elapsed_ms:.1f} ms (presupuesto: {LIVE_BUDGET_MS} ms).")
+    return investment
+
+
+live_mode = st.toggle(
+    "**Modo en vivo**",
+    key='live_mode_ic',
+    on_change=clear_compound_results,
+    help="Recalcula la proyección al confirmar cada dato (Enter o al salir del campo), sin pulsar "
+         "\"Calcular Proyección\". Solo se vuelve a ejecutar la calculadora, no toda la página."
+)
+# En modo en vivo los cambios vuelven a ejecutar solo el fragmento: el estilo y la barra lateral quedan como están.
+# Los datos devueltos en la ejecución completa alimentan la simulación Monte Carlo.
+investment = (st.fragment(compound_panel) if live_mode else compound_panel)(live_mode)
+
+# --- Simulación Monte Carlo ---
+if 'mc_result_ic' not in st.session_state:
+    st.session_state.mc_result_ic = None
+
+with st.expander("Simulación Monte Carlo (rentabilidad variable)"):
+    st.markdown(
+        "En lugar de una tasa fija, cada año se sortea una rentabilidad alrededor de la "
+        "**Tasa de Interés Anual** ingresada. Se muestran los percentiles del saldo por año."
+    )
+    mc_distribution = st.selectbox(
+        "**Distribución de la rentabilidad anual**",
+        options=DISTRIBUTIONS,
+        key='mc_distribution_ic',
+        help="Normal y Lognormal usan la tasa anual como media; Histórica remuestrea una serie que subas."
+    )
+    mc_volatility = st.number_input(
+        "**Volatilidad Anual (%)**",
+        min_value=0.0,
+        max_value=100.0,
+        value=15.0,
+        step=0.5,
+        format="%.2f",
+        key='mc_volatility_ic',
+        help="Desviación estándar de la rentabilidad anual.",
+        disabled=mc_distribution == "Histórica"
     )
+    mc_returns_file = None
+    if mc_distribution == "Histórica":
+        mc_returns_file = st.file_uploader(
+            "**Serie de rentabilidades anuales (%)**",
+            type=["csv"],
+            key='mc_returns_file_ic',
+            help="Un CSV cuya primera columna numérica contiene rentabilidades anuales en porcentaje."
+        )
+    mc_paths = st.number_input(
+        "**Número de Trayectorias**",
+        min_value=1000,
+        max_value=1000000,
+        value=10000,
+        step=1000,
+        key='mc_paths_ic',
+        help="Más trayectorias dan bandas más estables a cambio de más tiempo de cálculo."
+    )
+    mc_workers = st.number_input(
+        "**Procesos en Paralelo**",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=1,
+        step=1,
+        key='mc_workers_ic',
+        help="Reparte las trayectorias entre varios procesos; útil para simulaciones muy grandes."
+    )
+
+    if st.button("Simular Escenarios", key='mc_run_ic'):
+        try:
+            historical_returns = None
+            if mc_distribution == "Histórica":
+                if mc_returns_file is None:
+                    raise ValueError("Sube un archivo con la serie de rentabilidades anuales.")
+                series = pd.read_csv(mc_returns_file).select_dtypes("number")
+                if series.empty:
+                    raise ValueError("El archivo no contiene una columna numérica.")
+                historical_returns = series.iloc[:, 0].dropna().to_numpy()
+            st.session_state.mc_result_ic = monte_carlo_projection(
+                investment["initial_investment"], investment["annual_contribution"], investment["annual_interest_rate"],
+                investment["investment_term_years"], investment["compounding_frequency"],
+                investment["contribution_frequency"],
+                volatility=mc_volatility, distribution=mc_distribution, n_paths=int(mc_paths),
+                historical_returns=historical_returns, workers=int(mc_workers)
+            )
+        except Exception as e:
+            st.error(f"Ocurrió un error en la simulación. Detalles: {e}")
+            st.session_state.mc_result_ic = None
+
+    if st.session_state.mc_result_ic is not None:
+        mc_result = st.session_state.mc_result_ic
+        bands = mc_result["percentiles"]
+        st.line_chart(bands.set_index("Año"))
+        st.dataframe(bands.style.format("{:,.0f}", subset=bands.columns[1:]), height=300)
+        st.caption(
+            f"Saldo final promedio: $ {round(mc_result['mean_final_value']):,} · "
+            f"{mc_result['paths_per_second']:,.0f} trayectorias/s ({mc_result['elapsed']:.2f} s)"
+        )
 
 st.markdown("---")
 
@@ -1,6 +1,20 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import numpy as np
+
+from finanzas.cache import export_table
+from finanzas.exportacion import EXPORT_FORMATS
+from finanzas.tasas import (
+    FREQUENCY_OPTIONS,
+    effective_annual_to_effective_periodic,
+    effective_annual_to_nominal,
+    effective_periodic_to_effective_annual,
+    nominal_to_effective_annual,
+)
+
+# Tiempo máximo del recálculo en modo en vivo (ver benchmarks/bench_modo_en_vivo.py)
+LIVE_BUDGET_MS = 50
 
 st.set_page_config(page_title="Calculadora de Tasas de Interés", page_icon="images/finance.png", layout="centered")
 
@@ -11,232 +25,217 @@ st.markdown("""
 
 st.divider()
 
-# --- Funciones de cálculo de tasas ---
-
-def nominal_to_effective_annual(nominal_rate, compounding_frequency):
-    """Convierte una tasa nominal a Tasa Efectiva Anual (TEA)."""
-    if compounding_frequency == "Anual":
-        periods_per_year = 1
-    elif compounding_frequency == "Semestral":
-        periods_per_year = 2
-    elif compounding_frequency == "Cuatrimestral": # Agregamos cuatrimestral
-        periods_per_year = 3
-    elif compounding_frequency == "Trimestral":
-        periods_per_year = 4
-    elif compounding_frequency == "Bimestral":
-        periods_per_year = 6
-    elif compounding_frequency == "Mensual":
-        periods_per_year = 12
-    elif compounding_frequency == "Quincenal": # Agregamos quincenal
-        periods_per_year = 24
-    elif compounding_frequency == "Diario": # Agregamos diario
-        periods_per_year = 365
-
-    if periods_per_year == 0:
-        return np.nan # Evitar división por cero
-
-    periodic_rate = nominal_rate / periods_per_year
-    tea = (1 + periodic_rate)**periods_per_year - 1
-    return tea
-
-def effective_annual_to_nominal(tea, compounding_frequency):
-    """Convierte Tasa Efectiva Anual (TEA) a tasa nominal."""
-    if compounding_frequency == "Anual":
-        periods_per_year = 1
-    elif compounding_frequency == "Semestral":
-        periods_per_year = 2
-    elif compounding_frequency == "Cuatrimestral":
-        periods_per_year = 3
-    elif compounding_frequency == "Trimestral":
-        periods_per_year = 4
-    elif compounding_frequency == "Bimestral":
-        periods_per_year = 6
-    elif compounding_frequency == "Mensual":
-        periods_per_year = 12
-    elif compounding_frequency == "Quincenal":
-        periods_per_year = 24
-    elif compounding_frequency == "Diario":
-        periods_per_year = 365
-
-    if periods_per_year == 0:
-        return np.nan # Evitar división por cero
-
-    nominal_rate = periods_per_year * ((1 + tea)**(1/periods_per_year) - 1)
-    return nominal_rate
-
-def effective_periodic_to_effective_annual(effective_periodic_rate, periodic_frequency):
-    """Convierte una tasa efectiva periódica a Tasa Efectiva Anual (TEA)."""
-    if periodic_frequency == "Anual":
-        periods_per_year = 1
-    elif periodic_frequency == "Semestral":
-        periods_per_year = 2
-    elif periodic_frequency == "Cuatrimestral":
-        periods_per_year = 3
-    elif periodic_frequency == "Trimestral":
-        periods_per_year = 4
-    elif periodic_frequency == "Bimestral":
-        periods_per_year = 6
-    elif periodic_frequency == "Mensual":
-        periods_per_year = 12
-    elif periodic_frequency == "Quincenal":
-        periods_per_year = 24
-    elif periodic_frequency == "Diario":
-        periods_per_year = 365
-
-    tea = (1 + effective_periodic_rate)**periods_per_year - 1
-    return tea
-
-def effective_annual_to_effective_periodic(tea, periodic_frequency):
-    """Convierte Tasa Efectiva Anual (TEA) a tasa efectiva periódica."""
-    if periodic_frequency == "Anual":
-        periods_per_year = 1
-    elif periodic_frequency == "Semestral":
-        periods_per_year = 2
-    elif periodic_frequency == "Cuatrimestral":
-        periods_per_year = 3
-    elif periodic_frequency == "Trimestral":
-        periods_per_year = 4
-    elif periodic_frequency == "Bimestral":
-        periods_per_year = 6
-    elif periodic_frequency == "Mensual":
-        periods_per_year = 12
-    elif periodic_frequency == "Quincenal":
-        periods_per_year = 24
-    elif periodic_frequency == "Diario":
-        periods_per_year = 365
-    
-    if periods_per_year == 0:
-        return np.nan # Evitar división por cero
-
-    effective_periodic_rate = (1 + tea)**(1/periods_per_year) - 1
-    return effective_periodic_rate
-
 # --- Opciones de Frecuencia ---
-frequency_options_compounding = ["Anual", "Semestral", "Cuatrimestral", "Trimestral", "Bimestral", "Mensual", "Quincenal", "Diario"]
-frequency_options_periodic = ["Anual", "Semestral", "Cuatrimestral", "Trimestral", "Bimestral", "Mensual", "Quincenal", "Diario"]
+frequency_options_compounding = FREQUENCY_OPTIONS
+frequency_options_periodic = FREQUENCY_OPTIONS
 
 
-st.header("Convertidor de Tasas")
+# El archivo de descarga se genera solo cuando el usuario lo pide
+if 'export_requested_tasas' not in st.session_state:
+    st.session_state.export_requested_tasas = False
 
-# --- Selectores de conversión ---
-conversion_type = st.radio(
-    "**Selecciona el tipo de conversión:**",
-    ["Nominal a Efectiva Anual (TEA)", "Efectiva Anual (TEA) a Nominal",
-     "Efectiva Periódica a Efectiva Anual (TEA)", "Efectiva Anual (TEA) a Efectiva Periódica"]
-)
 
-# --- Controles para Nominal a Efectiva Anual ---
-if conversion_type == "Nominal a Efectiva Anual (TEA)":
-    st.subheader("Nominal a Efectiva Anual (TEA)")
-    nominal_rate_input_n2e = st.number_input(
-        "**Tasa Nominal Anual (%)**",
-        min_value=0.0,
-        max_value=500.0,
-        value=5.0,
-        step=0.1,
-        format="%.2f",
-        help="La tasa nominal anual a convertir."
-    )
-    compounding_frequency_n2e = st.selectbox(
-        "**Frecuencia de Capitalización de la Tasa Nominal**",
-        options=frequency_options_compounding,
-        index=5, # Mensual
-        key='compounding_freq_n2e',
-        help="La periodicidad con la que se capitaliza la tasa nominal."
+def request_export_rates():
+    st.session_state.export_requested_tasas = True
+
+
+def cancel_export_rates():
+    # Al cambiar la tasa o el formato se vuelve a pedir el archivo
+    st.session_state.export_requested_tasas = False
+
+
+# --- Convertidor y tabla de equivalencias ---
+def rates_panel(live):
+    """Conversiones y tabla de equivalencias. En modo en vivo se ejecuta como fragmento y convierte sin botón."""
+    start = time.perf_counter()
+    st.header("Convertidor de Tasas")
+
+    # --- Selectores de conversión ---
+    conversion_type = st.radio(
+        "**Selecciona el tipo de conversión:**",
+        ["Nominal a Efectiva Anual (TEA)", "Efectiva Anual (TEA) a Nominal",
+         "Efectiva Periódica a Efectiva Anual (TEA)", "Efectiva Anual (TEA) a Efectiva Periódica"]
     )
 
-    if st.button("Calcular TEA"):
-        try:
-            nominal_rate_decimal = nominal_rate_input_n2e / 100
-            tea_calculated = nominal_to_effective_annual(nominal_rate_decimal, compounding_frequency_n2e)
-            st.success(f"**Tasa Efectiva Anual (TEA):** {tea_calculated * 100:,.4f}%")
-        except Exception as e:
-            st.error(f"Error al calcular: {e}")
-
-# --- Controles para Efectiva Anual a Nominal ---
-elif conversion_type == "Efectiva Anual (TEA) a Nominal":
-    st.subheader("Efectiva Anual (TEA) a Nominal")
-    tea_input_e2n = st.number_input(
+    # --- Controles para Nominal a Efectiva Anual ---
+    if conversion_type == "Nominal a Efectiva Anual (TEA)":
+        st.subheader("Nominal a Efectiva Anual (TEA)")
+        nominal_rate_input_n2e = st.number_input(
+            "**Tasa Nominal Anual (%)**",
+            min_value=0.0,
+            max_value=500.0,
+            value=5.0,
+            step=0.1,
+            format="%.2f",
+            help="La tasa nominal anual a convertir."
+        )
+        compounding_frequency_n2e = st.selectbox(
+            "**Frecuencia de Capitalización de la Tasa Nominal**",
+            options=frequency_options_compounding,
+            index=5, # Mensual
+            key='compounding_freq_n2e',
+            help="La periodicidad con la que se capitaliza la tasa nominal."
+        )
+
+        if live or st.button("Calcular TEA"):
+            try:
+                nominal_rate_decimal = nominal_rate_input_n2e / 100
+                tea_calculated = nominal_to_effective_annual(nominal_rate_decimal, compounding_frequency_n2e)
+                st.success(f"**Tasa Efectiva Anual (TEA):** {tea_calculated * 100:,.4f}%")
+            except Exception as e:
+                st.error(f"Error al calcular: {e}")
+
+    # --- Controles para Efectiva Anual a Nominal ---
+    elif conversion_type == "Efectiva Anual (TEA) a Nominal":
+        st.subheader("Efectiva Anual (TEA) a Nominal")
+        tea_input_e2n = st.number_input(
+            "**Tasa Efectiva Anual (TEA) (%)**",
+            min_value=0.0,
+            max_value=500.0,
+            value=5.0,
+            step=0.1,
+            format="%.2f",
+            help="La Tasa Efectiva Anual (TEA) a convertir."
+        )
+        compounding_frequency_e2n = st.selectbox(
+            "**Frecuencia de Capitalización para la Tasa Nominal Resultante**",
+            options=frequency_options_compounding,
+            index=5, # Mensual
+            key='compounding_freq_e2n',
+            help="La periodicidad deseada para la tasa nominal resultante."
+        )
+
+        if live or st.button("Calcular Tasa Nominal"):
+            try:
+                tea_decimal = tea_input_e2n / 100
+                nominal_calculated = effective_annual_to_nominal(tea_decimal, compounding_frequency_e2n)
+                st.success(f"**Tasa Nominal Anual ({compounding_frequency_e2n}):** {nominal_calculated * 100:,.4f}%")
+            except Exception as e:
+                st.error(f"Error al calcular: {e}")
+
+    # --- Controles para Efectiva Periódica a Efectiva Anual ---
+    elif conversion_type == "Efectiva Periódica a Efectiva Anual (TEA)":
+        st.subheader("Efectiva Periódica a Efectiva Anual (TEA)")
+        effective_periodic_rate_input_p2e = st.number_input(
+            "**Tasa Efectiva Periódica (%)**",
+            min_value=0.0,
+            max_value=500.0,
+            value=0.4, # Ejemplo: 0.4% mensual
+            step=0.01,
+            format="%.2f",
+            help="La tasa efectiva para un período dado."
+        )
+        periodic_frequency_p2e = st.selectbox(
+            "**Frecuencia de la Tasa Periódica**",
+            options=frequency_options_periodic,
+            index=5, # Mensual
+            key='periodic_freq_p2e',
+            help="La periodicidad de la tasa efectiva ingresada (ej. si es mensual, se capitaliza 12 veces al año)."
+        )
+
+        if live or st.button("Calcular TEA desde Periódica"):
+            try:
+                effective_periodic_rate_decimal = effective_periodic_rate_input_p2e / 100
+                tea_calculated_from_periodic = effective_periodic_to_effective_annual(effective_periodic_rate_decimal, periodic_frequency_p2e)
+                st.success(f"**Tasa Efectiva Anual (TEA):** {tea_calculated_from_periodic * 100:,.4f}%")
+            except Exception as e:
+                st.error(f"Error al calcular: {e}")
+
+    # --- Controles para Efectiva Anual a Efectiva Periódica ---
+    elif conversion_type == "Efectiva Anual (TEA) a Efectiva Periódica":
+        st.subheader("Efectiva Anual (TEA) a Efectiva Periódica")
+        tea_input_e2p = st.number_input(
+            "**Tasa Efectiva Anual (TEA) (%)**",
+            min_value=0.0,
+            max_value=500.0,
+            value=5.0,
+            step=0.1,
+            format="%.2f",
+            help="La Tasa Efectiva Anual (TEA) a convertir."
+        )
+        periodic_frequency_e2p = st.selectbox(
+            "**Frecuencia de la Tasa Periódica Resultante**",
+            options=frequency_options_periodic,
+            index=5, # Mensual
+            key='periodic_freq_e2p',
+            help="La periodicidad deseada para la tasa efectiva resultante."
+        )
+
+        if live or st.button("Calcular Tasa Efectiva Periódica"):
+            try:
+                tea_decimal = tea_input_e2p / 100
+                effective_periodic_calculated = effective_annual_to_effective_periodic(tea_decimal, periodic_frequency_e2p)
+                st.success(f"**Tasa Efectiva Periódica ({periodic_frequency_e2p}):** {effective_periodic_calculated * 100:,.4f}%")
+            except Exception as e:
+                st.error(f"Error al calcular: {e}")
+
+
+    # --- Tabla de equivalencias para todas las frecuencias ---
+    st.markdown("---")
+    st.header("Tabla de Equivalencias")
+    st.markdown("Tasas equivalentes a una misma TEA en cada frecuencia, listas para descargar.")
+
+    tea_input_table = st.number_input(
         "**Tasa Efectiva Anual (TEA) (%)**",
         min_value=0.0,
         max_value=500.0,
-        value=5.0,
+        value=12.0,
         step=0.1,
         format="%.2f",
-        help="La Tasa Efectiva Anual (TEA) a convertir."
+        key='tea_table_tasas',
+        on_change=cancel_export_rates,
+        help="La TEA de referencia para calcular las tasas equivalentes."
     )
-    compounding_frequency_e2n = st.selectbox(
-        "**Frecuencia de Capitalización para la Tasa Nominal Resultante**",
-        options=frequency_options_compounding,
-        index=5, # Mensual
-        key='compounding_freq_e2n',
-        help="La periodicidad deseada para la tasa nominal resultante."
+    # Todas las frecuencias se convierten de una vez
+    equivalences = pd.DataFrame({
+        "Frecuencia": FREQUENCY_OPTIONS,
+        "Tasa Efectiva Periódica (%)": effective_annual_to_effective_periodic(tea_input_table / 100, FREQUENCY_OPTIONS) * 100,
+        "Tasa Nominal Anual (%)": effective_annual_to_nominal(tea_input_table / 100, FREQUENCY_OPTIONS) * 100,
+    })
+    st.dataframe(
+        equivalences,
+        # Cuatro decimales, aplicados en el navegador
+        column_config={
+            col: st.column_config.NumberColumn(format="%.4f")
+            for col in ["Tasa Efectiva Periódica (%)", "Tasa Nominal Anual (%)"]
+        },
+        hide_index=True
     )
 
-    if st.button("Calcular Tasa Nominal"):
-        try:
-            tea_decimal = tea_input_e2n / 100
-            nominal_calculated = effective_annual_to_nominal(tea_decimal, compounding_frequency_e2n)
-            st.success(f"**Tasa Nominal Anual ({compounding_frequency_e2n}):** {nominal_calculated * 100:,.4f}%")
-        except Exception as e:
-            st.error(f"Error al calcular: {e}")
-
-# --- Controles para Efectiva Periódica a Efectiva Anual ---
-elif conversion_type == "Efectiva Periódica a Efectiva Anual (TEA)":
-    st.subheader("Efectiva Periódica a Efectiva Anual (TEA)")
-    effective_periodic_rate_input_p2e = st.number_input(
-        "**Tasa Efectiva Periódica (%)**",
-        min_value=0.0,
-        max_value=500.0,
-        value=0.4, # Ejemplo: 0.4% mensual
-        step=0.01,
-        format="%.2f",
-        help="La tasa efectiva para un período dado."
-    )
-    periodic_frequency_p2e = st.selectbox(
-        "**Frecuencia de la Tasa Periódica**",
-        options=frequency_options_periodic,
-        index=5, # Mensual
-        key='periodic_freq_p2e',
-        help="La periodicidad de la tasa efectiva ingresada (ej. si es mensual, se capitaliza 12 veces al año)."
+    export_format_rates = st.selectbox(
+        "**Formato de descarga**",
+        list(EXPORT_FORMATS),
+        key='export_format_tasas',
+        on_change=cancel_export_rates
     )
+    extension_rates, mime_rates, _ = EXPORT_FORMATS[export_format_rates]
+    if st.session_state.export_requested_tasas:
+        st.download_button(
+            label=f"Descargar Equivalencias en {export_format_rates}",
+            # La caché compartida guarda el archivo según el contenido de la tabla y el formato
+            data=export_table(equivalences, export_format_rates, sheet_name='Equivalencias',
+                              column_formats={col: "0.0000" for col in equivalences.columns[1:]}),
+            file_name=f"equivalencias_tasas{extension_rates}",
+            mime=mime_rates,
+            help="Descarga la tabla de tasas equivalentes en el formato elegido."
+        )
+    else:
+        st.button("Preparar Descarga", key='prepare_export_tasas', on_click=request_export_rates,
+                  help="Genera el archivo con la tabla de equivalencias para descargarlo.")
 
-    if st.button("Calcular TEA desde Periódica"):
-        try:
-            effective_periodic_rate_decimal = effective_periodic_rate_input_p2e / 100
-            tea_calculated_from_periodic = effective_periodic_to_effective_annual(effective_periodic_rate_decimal, periodic_frequency_p2e)
-            st.success(f"**Tasa Efectiva Anual (TEA):** {tea_calculated_from_periodic * 100:,.4f}%")
-        except Exception as e:
-            st.error(f"Error al calcular: {e}")
-
-# --- Controles para Efectiva Anual a Efectiva Periódica ---
-elif conversion_type == "Efectiva Anual (TEA) a Efectiva Periódica":
-    st.subheader("Efectiva Anual (TEA) a Efectiva Periódica")
-    tea_input_e2p = st.number_input(
-        "**Tasa Efectiva Anual (TEA) (%)**",
-        min_value=0.0,
-        max_value=500.0,
-        value=5.0,
-        step=0.1,
-        format="%.2f",
-        help="La Tasa Efectiva Anual (TEA) a convertir."
-    )
-    periodic_frequency_e2p = st.selectbox(
-        "**Frecuencia de la Tasa Periódica Resultante**",
-        options=frequency_options_periodic,
-        index=5, # Mensual
-        key='periodic_freq_e2p',
-        help="La periodicidad deseada para la tasa efectiva resultante."
-    )
+    if live:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"Modo en vivo: recalculado en {elapsed_ms:.1f} ms (presupuesto: {LIVE_BUDGET_MS} ms).")
 
-    if st.button("Calcular Tasa Efectiva Periódica"):
-        try:
-            tea_decimal = tea_input_e2p / 100
-            effective_periodic_calculated = effective_annual_to_effective_periodic(tea_decimal, periodic_frequency_e2p)
-            st.success(f"**Tasa Efectiva Periódica ({periodic_frequency_e2p}):** {effective_periodic_calculated * 100:,.4f}%")
-        except Exception as e:
-            st.error(f"Error al calcular: {e}")
 
+live_mode = st.toggle(
+    "**Modo en vivo**",
+    key='live_mode_tasas',
+    help="Muestra cada conversión al confirmar el dato, sin pulsar el botón de cálculo. "
+         "Solo se vuelve a ejecutar la calculadora, no toda la página."
+)
+# En modo en vivo los cambios vuelven a ejecutar solo el fragmento, no la barra lateral
+(st.fragment(rates_panel) if live_mode else rates_panel)(live_mode)
 
 st.markdown("---")
 
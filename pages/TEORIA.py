@@ -110,6 +110,42 @@ st.latex(r"""
     CapitalPendiente_t = CapitalPendiente_{t-1} - CapitalAmortizado_t
 """)
 
+st.subheader("2.5. Otros Sistemas de Amortización")
+st.markdown("""
+    En todos los sistemas los intereses de cada período se calculan sobre el capital pendiente,
+    como en 2.2; lo que cambia es cómo se reparte la devolución del capital ($C$) en los $n$ pagos:
+
+    * **Alemán:** el capital amortizado es constante y la cuota decrece con los intereses.
+""")
+st.latex(r"""
+    CapitalAmortizado_t = \frac{C}{n} \qquad Cuota_t = \frac{C}{n} + CapitalPendiente_{t-1} \cdot i
+""")
+st.markdown("""
+    * **Americano:** cada cuota paga solo intereses ($C \\cdot i$) y el capital se devuelve completo en el último pago.
+    * **Escalonado:** la cuota sube un porcentaje $g$ al cumplirse cada año ($m$ pagos); la primera cuota es la que
+      iguala el valor actual de todas las cuotas al capital.
+""")
+st.latex(r"""
+    Cuota_t = Cuota_1 \cdot (1 + g)^{\lfloor (t-1)/m \rfloor}
+    \qquad C = \sum_{t=1}^{n} \frac{Cuota_t}{(1 + i)^t}
+""")
+
+st.subheader("2.6. Fechas de Pago y Conteo de Días")
+st.markdown("""
+    Con fechas reales, el interés de cada período se calcula por la fracción de año $f_t$ transcurrida entre el
+    pago anterior y el actual, según la base de conteo de días:
+
+    * **30/360:** todos los meses cuentan 30 días y el año 360, así que cada mes es exactamente $1/12$.
+    * **ACT/360:** días reales sobre un año de 360 días.
+    * **ACT/365:** días reales sobre un año de 365 días.
+
+    Si un pago cae en fin de semana o feriado se mueve al día hábil siguiente (o al anterior, si la convención
+    "modificada" haría que cambie de mes). La cuota se mantiene y el último pago liquida la diferencia.
+""")
+st.latex(r"""
+    Intereses_t = CapitalPendiente_{t-1} \cdot TNA \cdot f_t
+""")
+
 st.divider()
 
 # --- Sección de Tasas de Interés ---
@@ -186,6 +222,7 @@ Donde las variables son las mismas que en la fórmula anterior.
 | Mensual               |         12         |
 | Quincenal             |         24         |
 | Diario                |        365         |
+| Diario 360            |        360         |
 
 Es fundamental comprender estas equivalencias para tomar decisiones financieras informadas, ya sea al comparar rendimientos de inversiones o al analizar el costo real de un crédito.
 """)
@@ -1,5 +1,16 @@
+import time
+
 import streamlit as st
-import numpy_financial as npf
+import pandas as pd
+
+from finanzas.cache import export_table, irr
+from finanzas.exportacion import EXPORT_FORMATS
+from finanzas.lectura import read_cash_flows
+from finanzas.paginacion import PAGE_SIZES, page_count, table_page
+from finanzas.tir import evaluate_projects, npv_batch, npv_sensitivity
+
+# Tiempo máximo del recálculo en modo en vivo (ver benchmarks/bench_modo_en_vivo.py)
+LIVE_BUDGET_MS = 50
 
 st.set_page_config(page_title="Calculadora TIR y VAN", page_icon="images/finance.png", layout="centered")
 
@@ -18,118 +29,144 @@ st.header("Datos de la Inversión")
 # Inicializamos los valores por defecto si no existen en session_state
 if 'initial_investment_tir' not in st.session_state:
     st.session_state.initial_investment_tir = -10000.0
-if 'cf1_tir' not in st.session_state:
-    st.session_state.cf1_tir = 3000.0
-if 'cf2_tir' not in st.session_state:
-    st.session_state.cf2_tir = 4000.0
-if 'cf3_tir' not in st.session_state:
-    st.session_state.cf3_tir = 5000.0
-if 'cf4_tir' not in st.session_state:
-    st.session_state.cf4_tir = 6000.0
+if 'cash_flows_tir' not in st.session_state:
+    st.session_state.cash_flows_tir = [3000.0, 4000.0, 5000.0, 6000.0]
 if 'discount_rate_tir' not in st.session_state:
     st.session_state.discount_rate_tir = 10.0
+# Los archivos de descarga se generan solo cuando el usuario los pide
+if 'export_requested_profile_tir' not in st.session_state:
+    st.session_state.export_requested_profile_tir = False
+if 'export_requested_bulk_tir' not in st.session_state:
+    st.session_state.export_requested_bulk_tir = False
 
-# Inversión Inicial
-initial_investment = st.number_input(
-    "**Inversión Inicial** (valor negativo, ej: -10000)",
-    min_value=-10000000000.0,
-    max_value=0.0,
-    value=st.session_state.initial_investment_tir, # Usar valor de session_state
-    key='initial_investment_input_tir', # Clave única
-    step=1000.0,
-    format="%.2f",
-    help="El desembolso inicial del proyecto. Debe ser un valor negativo."
-)
 
-st.subheader("Flujos de Caja Futuros")
+def tir_inputs():
+    """Dibuja los datos del proyecto y devuelve sus valores."""
+    # Inversión Inicial
+    initial_investment = st.number_input(
+        "**Inversión Inicial** (valor negativo, ej: -10000)",
+        min_value=-10000000000.0,
+        max_value=0.0,
+        value=st.session_state.initial_investment_tir, # Usar valor de session_state
+        key='initial_investment_input_tir', # Clave única
+        step=1000.0,
+        format="%.2f",
+        help="El desembolso inicial del proyecto. Debe ser un valor negativo."
+    )
 
-# Flujos de Caja individuales
-cash_flow_1 = st.number_input(
-    "**Flujo de Caja Año 1**",
-    value=st.session_state.cf1_tir,
-    key='cf1_input_tir',
-    step=100.0,
-    format="%.2f",
-    help="Ganancia o pérdida del proyecto en el Año 1."
-)
-cash_flow_2 = st.number_input(
-    "**Flujo de Caja Año 2**",
-    value=st.session_state.cf2_tir,
-    key='cf2_input_tir',
-    step=100.0,
-    format="%.2f",
-    help="Ganancia o pérdida del proyecto en el Año 2."
-)
-cash_flow_3 = st.number_input(
-    "**Flujo de Caja Año 3**",
-    value=st.session_state.cf3_tir,
-    key='cf3_input_tir',
-    step=100.0,
-    format="%.2f",
-    help="Ganancia o pérdida del proyecto en el Año 3."
-)
-cash_flow_4 = st.number_input(
-    "**Flujo de Caja Año 4**",
-    value=st.session_state.cf4_tir,
-    key='cf4_input_tir',
-    step=100.0,
-    format="%.2f",
-    help="Ganancia o pérdida del proyecto en el Año 4."
-)
+    st.subheader("Flujos de Caja Futuros")
 
-st.subheader("Tasa de Descuento")
-discount_rate_input_percentage = st.slider(
-    "**Tasa de Descuento Anual (%)**",
-    min_value=0.0,
-    max_value=50.0,
-    value=st.session_state.discount_rate_tir,
-    key='discount_rate_input_tir',
-    step=0.1,
-    format="%.1f %%",
-    help="La tasa de interés o rentabilidad mínima que esperas del proyecto."
-)
-discount_rate_for_calculation = discount_rate_input_percentage / 100
+    # Flujos de Caja de longitud variable: se pueden agregar o quitar filas
+    edited_cash_flows = st.data_editor(
+        pd.DataFrame({
+            "Año": range(1, len(st.session_state.cash_flows_tir) + 1),
+            "Flujo de Caja": st.session_state.cash_flows_tir,
+        }),
+        num_rows="dynamic",
+        hide_index=True,
+        column_config={
+            "Año": st.column_config.NumberColumn("Año", disabled=True, help="Se numera automáticamente."),
+            "Flujo de Caja": st.column_config.NumberColumn(
+                "Flujo de Caja", format="%.2f", required=True, help="Ganancia o pérdida del proyecto en ese año."
+            ),
+        },
+        key='cash_flows_editor_tir'
+    )
+    future_cash_flows = edited_cash_flows["Flujo de Caja"].dropna().astype(float).tolist()
+
+    st.subheader("Tasa de Descuento")
+    discount_rate_input_percentage = st.slider(
+        "**Tasa de Descuento Anual (%)**",
+        min_value=0.0,
+        max_value=50.0,
+        value=st.session_state.discount_rate_tir,
+        key='discount_rate_input_tir',
+        step=0.1,
+        format="%.1f %%",
+        help="La tasa de interés o rentabilidad mínima que esperas del proyecto."
+    )
+
+    return {
+        "initial_investment": initial_investment,
+        "future_cash_flows": future_cash_flows,
+        "discount_rate": discount_rate_input_percentage,
+    }
 
-st.divider()
 
 # --- Funciones de control de estado ---
-def calculate_tir_van():
-    st.session_state.initial_investment_tir = initial_investment
-    st.session_state.cf1_tir = cash_flow_1
-    st.session_state.cf2_tir = cash_flow_2
-    st.session_state.cf3_tir = cash_flow_3
-    st.session_state.cf4_tir = cash_flow_4
-    st.session_state.discount_rate_tir = discount_rate_input_percentage
-
-    if initial_investment > 0:
+def compute_tir_van(project):
+    """Calcula la TIR y el VAN (TIR con la caché compartida) y los deja en session_state."""
+    if project["initial_investment"] > 0:
         st.error("La Inversión Inicial debe ser un valor negativo (desembolso).")
-        if 'tir_result' in st.session_state: del st.session_state.tir_result
-        if 'van_result' in st.session_state: del st.session_state.van_result
-    else:
-        cash_flows = [initial_investment, cash_flow_1, cash_flow_2, cash_flow_3, cash_flow_4]
-        try:
-            tir = npf.irr(cash_flows) * 100
-            van = npf.npv(discount_rate_for_calculation, cash_flows)
-            st.session_state.tir_result = tir
-            st.session_state.van_result = van
-            st.session_state.tir_comparison_rate = discount_rate_input_percentage
+        clear_tir_van_results()
+        return
 
-        except Exception as e:
-            st.error(f"Ocurrió un error al calcular la TIR o el VAN. Asegúrate de que los flujos de caja son válidos (por ejemplo, debe haber al menos un flujo positivo después de la inversión inicial negativa para calcular la TIR). Detalles del error: {e}")
-            if 'tir_result' in st.session_state: del st.session_state.tir_result
-            if 'van_result' in st.session_state: del st.session_state.van_result
+    cash_flows = [project["initial_investment"]] + project["future_cash_flows"]
+    try:
+        tir = irr(cash_flows) * 100
+        van = float(npv_batch(project["discount_rate"] / 100, cash_flows)[0])
+    except Exception as e:
+        st.error(f"Ocurrió un error al calcular la TIR o el VAN. Asegúrate de que los flujos de caja son válidos (por ejemplo, debe haber al menos un flujo positivo después de la inversión inicial negativa para calcular la TIR). Detalles del error: {e}")
+        clear_tir_van_results()
+        return
 
-def reset_tir_van():
-    st.session_state.initial_investment_tir = -10000.0
-    st.session_state.cf1_tir = 3000.0
-    st.session_state.cf2_tir = 4000.0
-    st.session_state.cf3_tir = 5000.0
-    st.session_state.cf4_tir = 6000.0
-    st.session_state.discount_rate_tir = 10.0
+    # El perfil pedido para descargar solo se descarta si cambiaron los flujos
+    if cash_flows != st.session_state.get('tir_cash_flows_result'):
+        st.session_state.export_requested_profile_tir = False
+    st.session_state.tir_result = tir
+    st.session_state.van_result = van
+    st.session_state.tir_cash_flows_result = cash_flows
+    st.session_state.tir_comparison_rate = project["discount_rate"]
+
+
+def calculate_tir_van(project):
+    st.session_state.initial_investment_tir = project["initial_investment"]
+    # Los flujos editados pasan a ser la base del editor, que se reinicia sin cambios pendientes
+    st.session_state.cash_flows_tir = project["future_cash_flows"]
+    if 'cash_flows_editor_tir' in st.session_state:
+        del st.session_state.cash_flows_editor_tir
+    st.session_state.discount_rate_tir = project["discount_rate"]
+    compute_tir_van(project)
+
+
+def clear_tir_van_results():
     if 'tir_result' in st.session_state:
         del st.session_state.tir_result
     if 'van_result' in st.session_state:
         del st.session_state.van_result
+    if 'tir_cash_flows_result' in st.session_state:
+        del st.session_state.tir_cash_flows_result
+    st.session_state.export_requested_profile_tir = False
+
+
+def reset_tir_van():
+    st.session_state.initial_investment_tir = -10000.0
+    st.session_state.cash_flows_tir = [3000.0, 4000.0, 5000.0, 6000.0]
+    if 'cash_flows_editor_tir' in st.session_state:
+        del st.session_state.cash_flows_editor_tir
+    st.session_state.discount_rate_tir = 10.0
+    clear_tir_van_results()
+
+
+def request_export(flag):
+    st.session_state[flag] = True
+
+
+def cancel_export(flag):
+    # Al cambiar de formato se vuelve a pedir el archivo
+    st.session_state[flag] = False
+
+
+def to_export_tir(df, export_format, sheet_name):
+    # La caché compartida guarda el archivo según el contenido de la tabla y el formato
+    # En Excel las tasas se muestran con dos decimales y los VAN con separador de miles y centavos
+    column_formats = {}
+    for col in df.columns:
+        if col.endswith("(%)"):
+            column_formats[col] = "0.00"
+        elif col.startswith("VAN"):
+            column_formats[col] = "#,##0.00"
+    return export_table(df, export_format, sheet_name=sheet_name, column_formats=column_formats)
 
 # --- Estilo para los botones ---
 st.markdown(
@@ -161,37 +198,227 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# --- Botones de Acción (Calcular y Limpiar) ---
-# Reorganizados en una sola fila con tres columnas para centrar mejor
-col1, col2, col3 = st.columns([1, 1, 1]) # Ajusta las proporciones si es necesario
+# --- Mostrar Resultados (si existen en session_state) ---
+def show_tir_van():
+    """Métricas, interpretación, perfil del VAN y descarga del último cálculo."""
+    if 'tir_result' in st.session_state and 'van_result' in st.session_state:
+        st.success("Cálculos Realizados con Éxito:")
+        st.metric(label="**Tasa Interna de Retorno (TIR)**", value=f"{st.session_state.tir_result:.2f} %")
+        st.metric(label="**Valor Actual Neto (VAN)**", value=f"{st.session_state.van_result:.2f}")
 
-with col1:
-    # Botón de cálculo
-    st.button("Calcular TIR y VAN", on_click=calculate_tir_van)
+        st.markdown("---")
+        st.subheader("Interpretación de Resultados:")
+        if st.session_state.van_result > 0:
+            st.info(f"**El VAN ({st.session_state.van_result:.2f}) es positivo.** El proyecto es financieramente atractivo y debería aceptarse, ya que se espera que genere ganancias por encima de la tasa de descuento.")
+        elif st.session_state.van_result < 0:
+            st.warning(f"**El VAN ({st.session_state.van_result:.2f}) es negativo.** El proyecto no es rentable a la tasa de descuento dada y debería rechazarse.")
+        else:
+            st.info(f"**El VAN es cero.** El proyecto es indiferente, ya que solo cubriría la tasa de descuento esperada.")
 
-with col3: # Colocamos el botón de limpiar en la tercera columna
-    # Botón "Limpiar"
-    st.button("Limpiar Valores", on_click=reset_tir_van)
+        if st.session_state.tir_result > st.session_state.tir_comparison_rate:
+            st.info(f"**La TIR ({st.session_state.tir_result:.2f}%) es mayor que la tasa de descuento ({st.session_state.tir_comparison_rate:.1f}%).** Esto refuerza que el proyecto es viable y rentable.")
+        else:
+            st.warning(f"**La TIR ({st.session_state.tir_result:.2f}%) es menor o igual que la tasa de descuento ({st.session_state.tir_comparison_rate:.1f}%).** El proyecto podría no ser rentable o apenas cubriría el costo de oportunidad.")
 
-# --- Mostrar Resultados (si existen en session_state) ---
-if 'tir_result' in st.session_state and 'van_result' in st.session_state:
-    st.success("Cálculos Realizados con Éxito:")
-    st.metric(label="**Tasa Interna de Retorno (TIR)**", value=f"{st.session_state.tir_result:.2f} %")
-    st.metric(label="**Valor Actual Neto (VAN)**", value=f"{st.session_state.van_result:.2f}")
-
-    st.markdown("---")
-    st.subheader("Interpretación de Resultados:")
-    if st.session_state.van_result > 0:
-        st.info(f"**El VAN ({st.session_state.van_result:.2f}) es positivo.** El proyecto es financieramente atractivo y debería aceptarse, ya que se espera que genere ganancias por encima de la tasa de descuento.")
-    elif st.session_state.van_result < 0:
-        st.warning(f"**El VAN ({st.session_state.van_result:.2f}) es negativo.** El proyecto no es rentable a la tasa de descuento dada y debería rechazarse.")
+        # --- Perfil del VAN y sensibilidad ---
+        st.markdown("---")
+        st.subheader("Perfil del VAN")
+        shock = st.slider(
+            "**Variación de los flujos futuros (%)**",
+            min_value=0,
+            max_value=50,
+            value=10,
+            step=5,
+            key='npv_shock_tir',
+            help="Dibuja además el VAN con los flujos futuros aumentados y reducidos en este porcentaje."
+        )
+        # La grilla cubre la tasa del slider (0-50%) y se extiende si la TIR queda por encima
+        stop_bp = max(5_000, int(st.session_state.tir_result * 100) // 500 * 500 + 500)
+        shocks = [-shock / 100, 0.0, shock / 100] if shock else [0.0]
+        rates, profile = npv_sensitivity(st.session_state.tir_cash_flows_result, shocks, stop_bp=stop_bp, step_bp=5)
+        profile_df = pd.concat(
+            [pd.DataFrame({"Tasa de Descuento (%)": rates * 100, "VAN": values, "Escenario": f"Flujos {s * 100:+.0f}%" if s else "Base"})
+             for s, values in zip(shocks, profile)],
+            ignore_index=True
+        )
+        # Especificación Vega-Lite directa: armar y validar el gráfico con Altair tarda más que todo el cálculo
+        st.vega_lite_chart(
+            profile_df,
+            {
+                "layer": [
+                    {
+                        "mark": "line",
+                        "encoding": {
+                            "x": {"field": "Tasa de Descuento (%)", "type": "quantitative"},
+                            "y": {"field": "VAN", "type": "quantitative"},
+                            "color": {"field": "Escenario", "type": "nominal", "sort": None},
+                        },
+                    },
+                    {"mark": {"type": "rule", "color": "gray"}, "encoding": {"y": {"datum": 0}}},
+                    {
+                        "mark": {"type": "rule", "color": "red", "strokeDash": [4, 4]},
+                        "encoding": {
+                            "x": {"datum": st.session_state.tir_result},
+                            "tooltip": {"value": f"TIR: {st.session_state.tir_result:.2f}%"},
+                        },
+                    },
+                ]
+            },
+            use_container_width=True
+        )
+        st.caption(f"La línea roja marca la TIR ({st.session_state.tir_result:.2f}%), donde el VAN del escenario base cruza cero.")
+
+        # --- Descarga del perfil (una columna de VAN por escenario) ---
+        export_format_profile = st.selectbox(
+            "**Formato de descarga del perfil**",
+            list(EXPORT_FORMATS),
+            key='export_format_profile_tir',
+            on_change=cancel_export,
+            args=('export_requested_profile_tir',)
+        )
+        extension_profile, mime_profile, _ = EXPORT_FORMATS[export_format_profile]
+        if st.session_state.export_requested_profile_tir:
+            profile_table = pd.DataFrame({"Tasa de Descuento (%)": rates * 100})
+            for s, values in zip(shocks, profile):
+                profile_table[f"VAN Flujos {s * 100:+.0f}%" if s else "VAN Base"] = values
+            st.download_button(
+                label=f"Descargar Perfil en {export_format_profile}",
+                data=to_export_tir(profile_table, export_format_profile, 'Perfil_VAN'),
+                file_name=f"perfil_van{extension_profile}",
+                mime=mime_profile,
+                help="Descarga el VAN de cada escenario para cada tasa de descuento del gráfico."
+            )
+        else:
+            st.button("Preparar Descarga", key='prepare_export_profile_tir', on_click=request_export,
+                      args=('export_requested_profile_tir',), help="Genera el archivo con el perfil del VAN para descargarlo.")
+
+
+# --- Calculadora: datos, botones y resultados ---
+def tir_van_panel(live):
+    """Datos del proyecto y resultados. En modo en vivo se ejecuta como fragmento y recalcula sin botón."""
+    start = time.perf_counter()
+    project = tir_inputs()
+    st.divider()
+
+    if live:
+        # Cada cambio recalcula; la TIR de flujos ya vistos sale de la caché compartida
+        compute_tir_van(project)
     else:
-        st.info(f"**El VAN es cero.** El proyecto es indiferente, ya que solo cubriría la tasa de descuento esperada.")
+        # --- Botones de Acción (Calcular y Limpiar) ---
+        # Reorganizados en una sola fila con tres columnas para centrar mejor
+        col1, col2, col3 = st.columns([1, 1, 1]) # Ajusta las proporciones si es necesario
+
+        with col1:
+            # Botón de cálculo
+            st.button("Calcular TIR y VAN", on_click=calculate_tir_van, args=(project,))
+
+        with col3: # Colocamos el botón de limpiar en la tercera columna
+            # Botón "Limpiar"
+            st.button("Limpiar Valores", on_click=reset_tir_van)
 
-    if st.session_state.tir_result > st.session_state.tir_comparison_rate:
-        st.info(f"**La TIR ({st.session_state.tir_result:.2f}%) es mayor que la tasa de descuento ({st.session_state.tir_comparison_rate:.1f}%).** Esto refuerza que el proyecto es viable y rentable.")
+    show_tir_van()
+    if live:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.caption(f"Modo en vivo: recalculado en {elapsed_ms:.1f} ms (presupuesto: {LIVE_BUDGET_MS} ms).")
+    return project
+
+
+live_mode = st.toggle(
+    "**Modo en vivo**",
+    key='live_mode_tir',
+    on_change=clear_tir_van_results,
+    help="Recalcula la TIR y el VAN al confirmar cada dato, sin pulsar \"Calcular TIR y VAN\". "
+         "Solo se vuelve a ejecutar la calculadora, no toda la página."
+)
+# En modo en vivo los cambios vuelven a ejecutar solo el fragmento: el estilo y la barra lateral quedan como están.
+# La tasa de descuento devuelta en la ejecución completa se usa en la evaluación masiva.
+project = (st.fragment(tir_van_panel) if live_mode else tir_van_panel)(live_mode)
+
+# --- Evaluación masiva de proyectos desde archivo ---
+st.markdown("---")
+st.subheader("Evaluación Masiva de Proyectos")
+
+if 'bulk_result_tir' not in st.session_state:
+    st.session_state.bulk_result_tir = None
+# Página visible de los resultados: solo esas filas se envían al navegador
+if 'page_bulk_tir' not in st.session_state:
+    st.session_state.page_bulk_tir = 1
+
+
+def reset_bulk_page():
+    st.session_state.page_bulk_tir = 1
+
+
+uploaded_projects = st.file_uploader(
+    "**Archivo de flujos de caja (CSV o Parquet)**",
+    type=["csv", "parquet"],
+    key='bulk_file_tir',
+    help=(
+        "Formato ancho: un proyecto por fila (columna 'proyecto' opcional y luego los flujos, empezando por la inversión inicial). "
+        "Formato largo: columnas 'proyecto', 'periodo' y 'flujo'."
+    )
+)
+
+if st.button("Evaluar Proyectos", key='bulk_run_tir'):
+    if uploaded_projects is None:
+        st.error("Sube un archivo con los flujos de caja de los proyectos.")
+    else:
+        try:
+            project_ids, project_flows = read_cash_flows(uploaded_projects, uploaded_projects.name)
+            st.session_state.bulk_result_tir = evaluate_projects(project_flows, project["discount_rate"] / 100, project_ids)
+            st.session_state.bulk_rate_tir = project["discount_rate"]
+            st.session_state.export_requested_bulk_tir = False
+            st.session_state.page_bulk_tir = 1
+        except Exception as e:
+            st.error(f"Ocurrió un error al leer o evaluar el archivo. Detalles: {e}")
+            st.session_state.bulk_result_tir = None
+
+if st.session_state.bulk_result_tir is not None:
+    bulk_result = st.session_state.bulk_result_tir
+    st.caption(f"{len(bulk_result):,} proyectos evaluados a una tasa de descuento de {st.session_state.bulk_rate_tir:.1f}%.")
+    col_page1, col_page2 = st.columns(2)
+    with col_page1:
+        page_size_bulk = st.selectbox("**Proyectos por página**", PAGE_SIZES, key='page_size_bulk_tir',
+                                      on_change=reset_bulk_page)
+    num_pages_bulk = page_count(len(bulk_result), page_size_bulk)
+    with col_page2:
+        page_bulk = st.number_input("**Página**", min_value=1, max_value=num_pages_bulk, step=1, key='page_bulk_tir',
+                                    help=f"{num_pages_bulk:,} páginas.")
+    # Con miles de proyectos, formatear y enviar todas las filas en cada ejecución es lo que más tarda
+    st.dataframe(
+        table_page(bulk_result, page_bulk, page_size_bulk),
+        column_config={
+            "TIR (%)": st.column_config.NumberColumn(format="%.2f"),
+            "VAN": st.column_config.NumberColumn(format="localized", step=0.01),
+        },
+        height=300
+    )
+    export_format_bulk = st.selectbox(
+        "**Formato de descarga**",
+        list(EXPORT_FORMATS),
+        key='export_format_bulk_tir',
+        on_change=cancel_export,
+        args=('export_requested_bulk_tir',),
+        help="Parquet y Arrow son más livianos y rápidos de cargar en herramientas de análisis."
+    )
+    extension_bulk, mime_bulk, _ = EXPORT_FORMATS[export_format_bulk]
+    if st.session_state.export_requested_bulk_tir:
+        # Los proyectos sin TIR quedan con la celda vacía; un error al armar el archivo no debe tirar la página
+        try:
+            bulk_export = to_export_tir(bulk_result, export_format_bulk, 'Evaluacion')
+        except Exception as e:
+            st.error(f"Ocurrió un error al generar el archivo de descarga. Detalles: {e}")
+        else:
+            st.download_button(
+                label=f"Descargar Resultados en {export_format_bulk}",
+                data=bulk_export,
+                file_name=f"evaluacion_proyectos{extension_bulk}",
+                mime=mime_bulk,
+                help="Descarga la TIR, el VAN y el estado de cada proyecto."
+            )
     else:
-        st.warning(f"**La TIR ({st.session_state.tir_result:.2f}%) es menor o igual que la tasa de descuento ({st.session_state.tir_comparison_rate:.1f}%).** El proyecto podría no ser rentable o apenas cubriría el costo de oportunidad.")
+        st.button("Preparar Descarga", key='prepare_export_bulk_tir', on_click=request_export,
+                  args=('export_requested_bulk_tir',), help="Genera el archivo con los resultados para descargarlo.")
 
 st.markdown("---") # Un separador antes del botón de regreso
 